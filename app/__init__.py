@@ -12,9 +12,10 @@ from app.helpers.formatters import (
     format_vote_type,
     na_if_none,
 )
+from app.lib.replicas import RoutingSession, replica_binds
 from settings import settings
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 
 def create_app():
@@ -26,11 +27,27 @@ def create_app():
         "",
     )
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = settings.engine_options()
+    # Read replicas are binds without models, only RoutingSession uses them
+    app.config["SQLALCHEMY_BINDS"] = replica_binds(settings)
     db.init_app(app)
 
     # Create database tables if they don't exist
     with app.app_context():
-        db.create_all()
+        from app.lib.engine import tune_engines
+
+        tune_engines(db.engines.values(), settings)
+        db.create_all(bind_key=None)  # Replicas are created by replication
+
+        if settings.database_replica_urls:
+            from app.lib.replicas import ReplicaRouter
+
+            ReplicaRouter.from_settings(db.engines, settings).init_app(app)
+
+        if settings.instrumentation:
+            from app.lib.instrumentation import Instrumentation
+
+            Instrumentation().init_app(app, db.engines.values())
 
     # Register template filters and globals
     app.jinja_env.filters["na"] = na_if_none
@@ -70,6 +87,29 @@ def create_app():
         if hasattr(module, "bp"):
             app.register_blueprint(module.bp)
 
+    # Answer conditional requests with 304 before the response cache and views
+    if settings.conditional_requests:
+        from app.lib.conditional import ConditionalRequests
+
+        ConditionalRequests().init_app(app)
+
+    # Negotiated Content-Encoding, precompressed CSV exports
+    if settings.compression:
+        from app.lib.content_encoding import Compression
+
+        Compression.from_settings(settings).init_app(app)
+
+    # Cache whole responses until the next import
+    if settings.response_cache != "none":
+        from app.lib.response_cache import ResponseCache
+
+        ResponseCache.from_settings(settings).init_app(app)
+
+    # Introspect every model once, now that all of them are imported
+    from app.lib.serializers import register_serializers
+
+    register_serializers(db.Model)
+
     # Static file serving
     @app.route("/static/<path:filename>")
     def static_files(filename):
@@ -81,3 +121,26 @@ def create_app():
         return redirect(url_for("legislators.list_legislators"))
 
     return app
+
+
+def create_asgi_app():
+    """ASGI application of the async serving mode (``settings.async_mode``)
+
+    The Flask app runs on an async engine of ``settings.database_url``, see
+    ``AsyncApp``. Serve it with an ASGI server, e.g.
+    ``uvicorn --factory app:create_asgi_app``.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app.lib.asgi import AsyncApp, async_url
+    from app.lib.engine import tune_engines
+
+    app = create_app()
+    engine = create_async_engine(
+        async_url(settings.database_url),
+        **settings.engine_options(),
+    )
+    tune_engines([engine.sync_engine], settings)
+    if "instrumentation" in app.extensions:
+        app.extensions["instrumentation"].instrument(engine.sync_engine)
+    return AsyncApp(app, engine)
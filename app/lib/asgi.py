@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import sys
+from io import BytesIO
+from typing import TYPE_CHECKING, Any
+
+from flask import Flask, request, request_started
+from sqlalchemy.engine import make_url
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable, Iterator
+
+    from sqlalchemy.ext.asyncio import AsyncEngine
+    from sqlalchemy.orm import Session
+
+    Receive = Callable[[], Awaitable[dict[str, Any]]]
+    Send = Callable[[dict[str, Any]], Awaitable[None]]
+
+# WSGI environ key of the session a request runs on
+SESSION_KEY = "quorum.session"
+
+# Async drivers of the backends whose default driver is blocking
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def async_url(url: str) -> str:
+    """The URL of a database with an asyncio driver
+
+    URLs naming a driver are kept, so ``postgresql+psycopg`` stays on
+    psycopg 3, which serves both modes.
+    """
+    parsed = make_url(url)
+    if "+" in parsed.drivername or parsed.drivername not in ASYNC_DRIVERS:
+        return url
+    return parsed.set(
+        drivername=f"{parsed.drivername}+{ASYNC_DRIVERS[parsed.drivername]}",
+    ).render_as_string(hide_password=False)
+
+
+def wsgi_environ(scope: dict[str, Any], body: bytes) -> dict[str, Any]:
+    """WSGI environ of an ASGI HTTP request (PEP 3333 from the ASGI spec)"""
+    server = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": scope.get("root_path", "").encode().decode("latin-1"),
+        "PATH_INFO": scope["path"].encode().decode("latin-1"),
+        "QUERY_STRING": scope["query_string"].decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    if scope.get("client"):
+        environ["REMOTE_ADDR"] = scope["client"][0]
+
+    for raw_name, raw_value in scope["headers"]:
+        name = raw_name.decode("latin-1").upper().replace("-", "_")
+        value = raw_value.decode("latin-1")
+        if name not in {"CONTENT_TYPE", "CONTENT_LENGTH"}:
+            name = f"HTTP_{name}"
+        # Repeated headers are joined, as a WSGI server would
+        environ[name] = f"{environ[name]},{value}" if name in environ else value
+    return environ
+
+
+def _use_request_session(_sender: Flask, **_extra: Any) -> None:
+    """Run the request's queries on the session of ``AsyncApp``"""
+    session = request.environ.get(SESSION_KEY)
+    if session is not None:
+        from app import db
+
+        db.session.registry.set(session)
+
+
+def _next_chunk(_session: Session, chunks: Iterator[bytes]) -> bytes | None:
+    return next(chunks, None)
+
+
+def _close(_session: Session, body: Iterable[bytes]) -> None:
+    if hasattr(body, "close"):
+        body.close()
+
+
+class AsyncApp:
+    """ASGI application running the Flask app on an async SQLAlchemy engine
+
+    Each request gets an ``AsyncSession`` and the Flask app is called through
+    ``AsyncSession.run_sync``: views, templates and serializers run unchanged
+    on its synchronous facade (``db.session`` is bound to it when the request
+    starts), while every statement they execute awaits the async driver. A
+    worker thus keeps serving other requests while one waits on the database,
+    instead of blocking a thread per request. Streamed bodies (CSV exports)
+    are iterated one chunk per ``run_sync``, so they keep streaming.
+
+    The CPU work of a request still runs on the event loop, which makes this
+    mode a fit for the I/O-bound read endpoints, not for imports.
+    """
+
+    def __init__(self, app: Flask, engine: AsyncEngine) -> None:
+        from sqlalchemy.ext.asyncio import async_sessionmaker
+
+        self.app = app
+        self.engine = engine
+        self.sessions = async_sessionmaker(engine, expire_on_commit=False)
+        request_started.connect(_use_request_session, app)
+
+    async def __call__(
+        self,
+        scope: dict[str, Any],
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            msg = f"Unsupported ASGI scope type {scope['type']!r}"
+            raise NotImplementedError(msg)
+
+        environ = wsgi_environ(scope, await self._read_body(receive))
+        async with self.sessions() as session:
+            status, headers, body = await session.run_sync(self._dispatch, environ)
+            try:
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": status,
+                        "headers": [
+                            (name.lower().encode("latin-1"), value.encode("latin-1"))
+                            for name, value in headers
+                        ],
+                    },
+                )
+                chunks = iter(body)
+                while True:
+                    chunk = await session.run_sync(_next_chunk, chunks)
+                    if chunk is None:
+                        break
+                    message = {"type": "http.response.body", "more_body": True}
+                    await send({**message, "body": chunk})
+                await send({"type": "http.response.body", "body": b""})
+            finally:
+                # Ends the request: teardown closes the session's connection
+                await session.run_sync(_close, body)
+
+    def _dispatch(
+        self,
+        session: Session,
+        environ: dict[str, Any],
+    ) -> tuple[int, list[tuple[str, str]], Iterable[bytes]]:
+        environ[SESSION_KEY] = session
+        started: list[Any] = []
+
+        def start_response(
+            status: str,
+            headers: list[tuple[str, str]],
+            _exc_info: Any = None,
+        ) -> None:
+            started[:] = [int(status.split(" ", 1)[0]), headers]
+
+        body = self.app.wsgi_app(environ, start_response)
+        return started[0], started[1], body
+
+    @staticmethod
+    async def _read_body(receive: Receive) -> bytes:
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body", False):
+                return body
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.engine.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import timezone
+from typing import TYPE_CHECKING
+from urllib.parse import urlencode
+
+from flask import Flask, Response, g, request
+
+from settings import settings
+
+if TYPE_CHECKING:
+    from app.services.data_versions import DataStamp
+
+# Methods answered from validators, HEAD being served by the GET views
+CONDITIONAL_METHODS = ("GET", "HEAD")
+
+
+def data_stamp() -> DataStamp:
+    """Data version of the current request, read once and kept on ``g``"""
+    stamp = g.get("data_stamp")
+    if stamp is None:
+        from app import db
+        from app.services.data_versions import DataVersions
+
+        stamp = g.data_stamp = DataVersions(db.session).stamp()
+    return stamp
+
+
+def forget_data_stamp(_error: BaseException | None = None) -> None:
+    """Teardown dropping the stamp, app contexts may outlive a request"""
+    g.pop("data_stamp", None)
+
+
+def representation() -> str:
+    """What a response of the current request depends on, besides the data
+
+    Endpoint, path, sorted query arguments and negotiated format, plus the
+    application version so that a deploy changing templates or fields does
+    not reuse validators or cached bodies of the previous one.
+    """
+    from app.lib.multi_response import negotiated_format
+
+    args = urlencode(sorted(request.args.items(multi=True)))
+    return (
+        f"{settings.app_version}|{request.endpoint}|{request.path}?{args}"
+        f"|{negotiated_format()}"
+    )
+
+
+class ConditionalRequests:
+    """``ETag`` and ``Last-Modified`` of the read endpoints, and 304 responses
+
+    Responses only change when an import bumps the data version (see
+    ``DataVersions``), so validators are derived from it instead of the body:
+    the strong ``ETag`` hashes the version with ``representation()`` and
+    ``Last-Modified`` is the time of the bump. A request whose
+    ``If-None-Match`` (or, without it, ``If-Modified-Since``) still matches is
+    answered with 304 before the view runs, at the cost of the version lookup.
+    """
+
+    def init_app(self, app: Flask) -> None:
+        app.before_request(self._check)
+        app.after_request(self._add_validators)
+        app.teardown_request(forget_data_stamp)
+        app.extensions["conditional_requests"] = self
+
+    @staticmethod
+    def applies() -> bool:
+        return request.method in CONDITIONAL_METHODS and request.blueprint is not None
+
+    @staticmethod
+    def etag(stamp: DataStamp) -> str:
+        """Strong entity tag of the current request at a data version
+
+        Compressed and identity bodies differ, so the coding is part of it.
+        """
+        from app.lib.content_encoding import negotiated_encoding
+
+        key = f"{stamp.version}|{representation()}|{negotiated_encoding()}"
+        return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+    def _check(self) -> Response | None:
+        if not self.applies():
+            return None
+
+        stamp = data_stamp()
+        etag = self.etag(stamp)
+        if request.if_none_match:
+            # If-Modified-Since is ignored when If-None-Match is sent
+            not_modified = request.if_none_match.contains(etag)
+        else:
+            not_modified = _not_modified_since(stamp)
+        if not not_modified:
+            g.conditional_etag = etag
+            return None
+
+        return self._validate(Response(status=304), etag, stamp)
+
+    def _add_validators(self, response: Response) -> Response:
+        etag = g.pop("conditional_etag", None)
+        if etag is not None and response.status_code == 200:
+            self._validate(response, etag, data_stamp())
+        return response
+
+    @staticmethod
+    def _validate(response: Response, etag: str, stamp: DataStamp) -> Response:
+        response.set_etag(etag)
+        if stamp.updated_at is not None:
+            response.last_modified = stamp.updated_at.replace(tzinfo=timezone.utc)
+        # The format may be negotiated from Accept on the same URL
+        response.vary.add("Accept")
+        return response
+
+
+def _not_modified_since(stamp: DataStamp) -> bool:
+    since = request.if_modified_since
+    if since is None or stamp.updated_at is None:
+        return False
+    # HTTP dates have a resolution of one second
+    modified = stamp.updated_at.replace(tzinfo=timezone.utc, microsecond=0)
+    return modified <= since
@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import tempfile
+import zlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+from flask import Flask, Response, current_app, has_request_context, request
+from werkzeug.wsgi import FileWrapper
+
+from app.lib.conditional import data_stamp, forget_data_stamp
+from app.lib.instrumentation import timed
+from app.lib.response_cache import CACHED_HEADERS, prune_directory
+from settings import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from settings import Settings
+
+    # A streaming compressor: compress(chunk) and finish() both return bytes
+    Compressor = tuple[Callable[[bytes], bytes], Callable[[], bytes]]
+
+try:  # Optional codecs, zstd is in the standard library from Python 3.14
+    from compression import zstd
+except ImportError:  # pragma: no cover - depends on the environment
+    try:
+        import zstandard as zstd
+    except ImportError:
+        zstd = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+# Levels fast enough to compress exports while they are streamed
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+
+# Response types worth compressing, others (images...) already are
+COMPRESSIBLE_TYPES = ("text/", "application/json", "image/svg+xml")
+
+# Bytes read per chunk when sending a precompressed export
+READ_SIZE = 64 * 1024
+
+
+def _gzip() -> Compressor:
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress, compressor.flush
+
+
+def _brotli() -> Compressor:
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    return compressor.process, compressor.finish
+
+
+def _zstd() -> Compressor:
+    compressor = zstd.ZstdCompressor(level=ZSTD_LEVEL)
+    if zstd.__name__ == "zstandard":
+        compressor = compressor.compressobj()
+    return compressor.compress, compressor.flush
+
+
+# Content codings in order of preference when the client accepts several
+CODECS: dict[str, Callable[[], Compressor]] = {
+    name: factory
+    for name, factory, module in (
+        ("zstd", _zstd, zstd),
+        ("br", _brotli, brotli),
+        ("gzip", _gzip, zlib),
+    )
+    if module is not None
+}
+
+
+def compress(body: bytes, coding: str) -> bytes:
+    """Compress a whole body with one of ``CODECS``"""
+    compress_chunk, finish = CODECS[coding]()
+    return compress_chunk(body) + finish()
+
+
+def compress_stream(chunks: Iterable[bytes], coding: str) -> Iterator[bytes]:
+    """Compress chunks as they come, skipping the empty outputs of buffering"""
+    compress_chunk, finish = CODECS[coding]()
+    for chunk in chunks:
+        compressed = compress_chunk(chunk)
+        if compressed:
+            yield compressed
+    yield finish()
+
+
+def negotiated_encoding() -> str | None:
+    """Content coding of the current response, None when sent as is"""
+    compression = current_app.extensions.get("compression")
+    if compression is None or not has_request_context():
+        return None
+    return compression.negotiate()
+
+
+class PrecompressedExports:
+    """Compressed full-table CSV exports kept on disk for the current data version
+
+    Full-table exports are the largest and most often repeated responses: a
+    streamed export is written to a temporary file while it is sent, and
+    renamed into place once complete. Until the next import, requests for
+    the same export and coding are sent from the file without querying the
+    database. Only unfiltered, unpaged exports of list endpoints are kept,
+    so the files are named after the endpoint (one per table), the app
+    version, the coding and the data version. Each file is a JSON line with
+    the response headers followed by the compressed body. Files of previous
+    versions of an export are deleted when a newer one is complete, and the
+    least recently used ones beyond ``max_bytes``.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def applies() -> bool:
+        """Whether the current request exports a whole table
+
+        Any other query parameter than ``format`` (paging, filters or junk)
+        would multiply the files, those exports are only streamed.
+        """
+        return (
+            request.method == "GET"
+            and request.blueprint is not None
+            and not request.view_args
+            and set(request.args) <= {"format"}
+        )
+
+    @staticmethod
+    def name(coding: str) -> str:
+        """File name prefix of the current request's export in a coding"""
+        return f"{request.endpoint}.{settings.app_version}.{coding}"
+
+    def _path(self, name: str, version: int) -> Path:
+        return self.directory / f"{name}-{version}"
+
+    def get(self, name: str, version: int) -> Response | None:
+        try:
+            file = open(self._path(name, version), "rb")  # noqa: SIM115
+        except OSError:
+            return None
+        try:
+            headers = json.loads(file.readline())
+            length = os.fstat(file.fileno()).st_size - file.tell()
+            os.utime(file.fileno())  # Recently used, see prune
+        except (OSError, ValueError):
+            file.close()
+            return None
+        response = Response(
+            FileWrapper(file, READ_SIZE),
+            headers=headers,
+            direct_passthrough=True,
+        )
+        response.content_length = length
+        return response
+
+    def store(
+        self,
+        name: str,
+        version: int,
+        headers: list[tuple[str, str]],
+        chunks: Iterable[bytes],
+    ) -> Iterator[bytes]:
+        """Pass chunks through, keeping them once all of them were sent"""
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        complete = False
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(json.dumps(headers).encode() + b"\n")
+                for chunk in chunks:
+                    file.write(chunk)
+                    yield chunk
+            Path(temp_path).replace(self._path(name, version))
+            complete = True
+        finally:
+            if not complete:  # Client gone or query failed
+                with contextlib.suppress(OSError):
+                    os.unlink(temp_path)
+        self._remove_older(name, version)
+        prune_directory(self.directory, self.max_bytes)
+
+    def _remove_older(self, name: str, version: int) -> None:
+        for path in self.directory.glob(f"{name}-*"):
+            suffix = path.name.rsplit("-", 1)[-1]
+            if suffix.isdigit() and int(suffix) < version:
+                with contextlib.suppress(OSError):
+                    path.unlink()
+
+
+class Compression:
+    """Negotiated ``Content-Encoding`` of responses: zstd, br or gzip
+
+    Codecs are used when available (``CODECS``): gzip always, brotli with
+    the ``brotli`` or ``brotlicffi`` package and zstd from Python 3.14 or the
+    ``zstandard`` package. The client's ``Accept-Encoding`` qualities decide,
+    ties going to the first of ``CODECS``. Bodies of text and JSON responses
+    are compressed from ``min_bytes``; streamed CSV exports are compressed
+    chunk by chunk whatever their size and, with ``exports``, kept
+    precompressed (see ``PrecompressedExports``).
+    """
+
+    def __init__(
+        self,
+        min_bytes: int = 1024,
+        exports: PrecompressedExports | None = None,
+    ) -> None:
+        self.min_bytes = min_bytes
+        self.exports = exports
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> Compression:
+        exports = None
+        if settings.precompressed_exports:
+            exports = PrecompressedExports(
+                settings.precompressed_exports_dir,
+                settings.precompressed_exports_max_mb * 1024 * 1024,
+            )
+        return cls(settings.compression_min_bytes, exports)
+
+    def init_app(self, app: Flask) -> None:
+        app.before_request(self._send_precompressed)
+        app.after_request(self._compress)
+        app.teardown_request(forget_data_stamp)
+        app.extensions["compression"] = self
+
+    @staticmethod
+    def negotiate() -> str | None:
+        """Preferred coding of the client among ``CODECS``, if any"""
+        return request.accept_encodings.best_match(CODECS)
+
+    def _send_precompressed(self) -> Response | None:
+        if self.exports is None or not self.exports.applies():
+            return None
+
+        from app.lib.multi_response import negotiated_format
+
+        coding = self.negotiate()
+        if coding is None or negotiated_format() != "csv":
+            return None
+        response = self.exports.get(self.exports.name(coding), data_stamp().version)
+        if response is not None:
+            response.headers["X-Precompressed"] = "HIT"
+            response.vary.add("Accept-Encoding")
+        return response
+
+    def _compress(self, response: Response) -> Response:
+        if not self._compressible(response):
+            return response
+        response.vary.add("Accept-Encoding")
+        coding = self.negotiate()
+        if coding is None:
+            return response
+
+        if response.is_streamed:
+            original = response.response
+            chunks = compress_stream(response.iter_encoded(), coding)
+            if (
+                self.exports is not None
+                and response.mimetype == "text/csv"
+                and self.exports.applies()
+            ):
+                headers = [
+                    (name, response.headers[name])
+                    for name in CACHED_HEADERS
+                    if name in response.headers
+                ]
+                headers.append(("Content-Encoding", coding))
+                chunks = self.exports.store(
+                    self.exports.name(coding),
+                    data_stamp().version,
+                    headers,
+                    chunks,
+                )
+            response.response = chunks
+            response.headers.pop("Content-Length", None)
+            if hasattr(original, "close"):
+                response.call_on_close(original.close)
+        else:
+            body = response.get_data()
+            if len(body) < self.min_bytes:
+                return response
+            with timed("serialize"):
+                response.set_data(compress(body, coding))
+
+        response.headers["Content-Encoding"] = coding
+        return response
+
+    @staticmethod
+    def _compressible(response: Any) -> bool:
+        return (
+            response.status_code == 200
+            and not response.direct_passthrough
+            and "Content-Encoding" not in response.headers
+            and response.mimetype is not None
+            and response.mimetype.startswith(COMPRESSIBLE_TYPES)
+        )
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import re
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import event
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from sqlalchemy.engine import Engine
+
+    from settings import Settings
+
+MiB = 1024 * 1024
+
+# SQLite pragmas set on every new connection, per profile (Settings.db_profile).
+# Both use WAL so that readers never wait for an import and the import never
+# waits for readers; negative cache sizes are in KiB.
+SQLITE_PROFILES: dict[str, dict[str, Any]] = {
+    # Web processes: many concurrent readers of a file that changes rarely
+    "serving": {
+        "journal_mode": "wal",
+        "synchronous": "normal",  # Durable in WAL mode but at checkpoints
+        "mmap_size": 256 * MiB,
+        "cache_size": -64 * 1024,
+        "temp_store": "memory",
+        "busy_timeout": 5000,
+    },
+    # Bulk imports: one writer and a larger cache for index maintenance. They
+    # write to the live database, so commits are only synced at checkpoints
+    # (safe in WAL mode), never skipped: synchronous = off can corrupt the
+    # file on a power loss, only opt in for throwaway files via sqlite_pragmas
+    "import": {
+        "journal_mode": "wal",
+        "synchronous": "normal",
+        "mmap_size": 256 * MiB,
+        "cache_size": -256 * 1024,
+        "temp_store": "memory",
+        "busy_timeout": 30000,
+    },
+}
+
+# Pragma names and values are interpolated, so only words and numbers pass
+PRAGMA_TOKEN = re.compile(r"-?\w+")
+
+
+def sqlite_pragmas(profile: str, overrides: dict[str, Any] | None = None) -> dict:
+    """Pragmas of a profile with some of them overridden"""
+    if profile not in SQLITE_PROFILES:
+        msg = f"Unknown database profile {profile!r}, expected one of {list(SQLITE_PROFILES)}"
+        raise ValueError(msg)
+
+    pragmas = {**SQLITE_PROFILES[profile], **(overrides or {})}
+    for name, value in pragmas.items():
+        if not (PRAGMA_TOKEN.fullmatch(name) and PRAGMA_TOKEN.fullmatch(str(value))):
+            msg = f"Invalid SQLite pragma {name} = {value!r}"
+            raise ValueError(msg)
+    return pragmas
+
+
+def _set_pragmas(pragmas: dict[str, Any], dbapi_connection: Any, _record: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
+def tune_engines(engines: Iterable[Engine], settings: Settings) -> None:
+    """Set the profile's pragmas on each new connection of the SQLite engines
+
+    Engines of other databases are tuned through ``Settings.engine_options``
+    when they are created. Must run before the engines first connect.
+    """
+    pragmas = sqlite_pragmas(settings.db_profile, settings.sqlite_pragmas)
+    for engine in engines:
+        if engine.dialect.name == "sqlite":
+            event.listen(engine, "connect", partial(_set_pragmas, pragmas))
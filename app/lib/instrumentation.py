@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+from flask import (
+    Flask,
+    Response,
+    before_render_template,
+    g,
+    has_app_context,
+    request,
+    template_rendered,
+)
+from sqlalchemy import event
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the request duration histogram, in seconds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Upper bounds of the SQL statements per request histogram
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class RequestMetrics:
+    """Where the time of one request went, kept on ``g.request_metrics``"""
+
+    __slots__ = (
+        "db_time",
+        "queries",
+        "serialize_time",
+        "started",
+        "status",
+        "template_started",
+        "template_time",
+    )
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_started: float | None = None
+        self.serialize_time = 0.0
+        # Set once a response is made, unhandled errors stay 500
+        self.status = 500
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        """``Server-Timing`` header value, durations in milliseconds"""
+        return (
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries", '
+            f"tpl;dur={self.template_time * 1000:.2f}, "
+            f"ser;dur={self.serialize_time * 1000:.2f}, "
+            f"total;dur={self.elapsed * 1000:.2f}"
+        )
+
+
+def current_metrics() -> RequestMetrics | None:
+    """Metrics of the request being handled, None when not instrumented"""
+    return g.get("request_metrics") if has_app_context() else None
+
+
+@contextmanager
+def timed(kind: str) -> Iterator[None]:
+    """Add the duration of a block to the ``<kind>_time`` of the request
+
+    Example::
+
+        with timed("serialize"):
+            body = dumps(data)
+    """
+    metrics = current_metrics()
+    if metrics is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        attribute = f"{kind}_time"
+        setattr(
+            metrics,
+            attribute,
+            getattr(metrics, attribute) + time.perf_counter() - started,
+        )
+
+
+class _Histogram:
+    """Cumulative bucket counts, sum and count of observed values"""
+
+    __slots__ = ("buckets", "count", "counts", "total")
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # The last one is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def lines(self, name: str, labels: str) -> Iterator[str]:
+        cumulative = 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f"{name}_sum{{{labels}}} {self.total}"
+        yield f"{name}_count{{{labels}}} {self.count}"
+
+
+def _labels(**labels: Any) -> str:
+    """Prometheus label set, values escaped"""
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """Request metrics aggregated per endpoint, in Prometheus text format
+
+    Metrics are kept per process; with several workers each one exposes its
+    own, as Prometheus expects of targets scraped individually.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._requests: dict[tuple[str, str, int], int] = {}
+        self._durations: dict[str, _Histogram] = {}
+        self._queries: dict[str, _Histogram] = {}
+        self._seconds: dict[tuple[str, str], float] = {}
+
+    def observe(self, endpoint: str, method: str, metrics: RequestMetrics) -> None:
+        elapsed = metrics.elapsed
+        with self._lock:
+            key = (endpoint, method, metrics.status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            self._durations.setdefault(endpoint, _Histogram(DURATION_BUCKETS)).observe(
+                elapsed,
+            )
+            self._queries.setdefault(endpoint, _Histogram(QUERY_BUCKETS)).observe(
+                metrics.queries,
+            )
+            for kind, seconds in (
+                ("db", metrics.db_time),
+                ("template", metrics.template_time),
+                ("serialize", metrics.serialize_time),
+            ):
+                self._seconds[endpoint, kind] = (
+                    self._seconds.get((endpoint, kind), 0.0) + seconds
+                )
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        with self._lock:
+            lines = [
+                "# HELP quorum_http_requests_total Requests handled.",
+                "# TYPE quorum_http_requests_total counter",
+            ]
+            lines.extend(
+                f"quorum_http_requests_total{{{_labels(endpoint=endpoint, method=method, status=status)}}} {count}"
+                for (endpoint, method, status), count in sorted(self._requests.items())
+            )
+            lines += [
+                "# HELP quorum_http_request_duration_seconds Time to handle a request.",
+                "# TYPE quorum_http_request_duration_seconds histogram",
+            ]
+            for endpoint, histogram in sorted(self._durations.items()):
+                lines.extend(
+                    histogram.lines(
+                        "quorum_http_request_duration_seconds",
+                        _labels(endpoint=endpoint),
+                    ),
+                )
+            lines += [
+                "# HELP quorum_db_queries_per_request SQL statements run per request.",
+                "# TYPE quorum_db_queries_per_request histogram",
+            ]
+            for endpoint, histogram in sorted(self._queries.items()):
+                lines.extend(
+                    histogram.lines(
+                        "quorum_db_queries_per_request",
+                        _labels(endpoint=endpoint),
+                    ),
+                )
+            lines += [
+                "# HELP quorum_request_phase_seconds_total Time spent per request phase.",
+                "# TYPE quorum_request_phase_seconds_total counter",
+            ]
+            lines.extend(
+                f"quorum_request_phase_seconds_total{{{_labels(endpoint=endpoint, phase=kind)}}} {seconds}"
+                for (endpoint, kind), seconds in sorted(self._seconds.items())
+            )
+        return "\n".join(lines) + "\n"
+
+
+def _before_cursor_execute(
+    _conn: Any,
+    _cursor: Any,
+    _statement: str,
+    _parameters: Any,
+    context: Any,
+    _executemany: bool,
+) -> None:
+    # Kept on the execution context, discarded with it when the statement
+    # fails: after_cursor_execute never fires then
+    context.query_started = time.perf_counter()
+
+
+def _after_cursor_execute(
+    _conn: Any,
+    _cursor: Any,
+    _statement: str,
+    _parameters: Any,
+    context: Any,
+    _executemany: bool,
+) -> None:
+    metrics = current_metrics()
+    if metrics is not None:
+        metrics.queries += 1
+        metrics.db_time += time.perf_counter() - context.query_started
+
+
+class Instrumentation:
+    """Per-request SQL, template and serialization timings
+
+    Every request gets a ``RequestMetrics`` fed by SQLAlchemy cursor events,
+    Flask template signals and ``timed`` blocks. They are reported in the
+    ``Server-Timing`` header, as one JSON log line per request on the
+    ``app.lib.instrumentation`` logger and aggregated per endpoint at
+    ``/metrics`` for Prometheus. Streamed responses (CSV exports) are measured
+    up to their first chunk, the rest is sent after the request is recorded.
+    """
+
+    def __init__(self) -> None:
+        self.registry = MetricsRegistry()
+
+    def init_app(self, app: Flask, engines: Iterable[Engine]) -> None:
+        for engine in engines:
+            self.instrument(engine)
+
+        app.before_request(self._start)
+        app.after_request(self._add_header)
+        app.teardown_request(self._finish)
+        before_render_template.connect(self._template_started, app)
+        template_rendered.connect(self._template_finished, app)
+        app.add_url_rule("/metrics", "metrics", self.metrics_view)
+        app.extensions["instrumentation"] = self
+
+    @staticmethod
+    def instrument(engine: Engine) -> None:
+        """Count and time the statements of an engine created after ``init_app``"""
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    def metrics_view(self) -> Response:
+        return Response(
+            self.registry.render(),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+    @staticmethod
+    def _start() -> None:
+        g.request_metrics = RequestMetrics()
+
+    @staticmethod
+    def _add_header(response: Response) -> Response:
+        metrics = current_metrics()
+        if metrics is not None:
+            metrics.status = response.status_code
+            response.headers["Server-Timing"] = metrics.server_timing()
+        return response
+
+    def _finish(self, _error: BaseException | None = None) -> None:
+        metrics = g.pop("request_metrics", None)
+        if metrics is None:
+            return
+
+        endpoint = request.endpoint or "unknown"
+        self.registry.observe(endpoint, request.method, metrics)
+        logger.info(
+            json.dumps(
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "endpoint": endpoint,
+                    "status": metrics.status,
+                    "duration_ms": round(metrics.elapsed * 1000, 2),
+                    "queries": metrics.queries,
+                    "db_ms": round(metrics.db_time * 1000, 2),
+                    "template_ms": round(metrics.template_time * 1000, 2),
+                    "serialize_ms": round(metrics.serialize_time * 1000, 2),
+                },
+            ),
+        )
+
+    @staticmethod
+    def _template_started(*_args: Any, **_kwargs: Any) -> None:
+        metrics = current_metrics()
+        if metrics is not None:
+            metrics.template_started = time.perf_counter()
+
+    @staticmethod
+    def _template_finished(*_args: Any, **_kwargs: Any) -> None:
+        metrics = current_metrics()
+        if metrics is not None and metrics.template_started is not None:
+            metrics.template_time += time.perf_counter() - metrics.template_started
+            metrics.template_started = None
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from functools import wraps
+from typing import TYPE_CHECKING, Any
+
+from flask import g
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def loader_plan(**plans: list[Any]) -> Callable:
+    """Declare the relationship loading strategy of a view per output format.
+
+    Example::
+
+        @bp.route("/votes")
+        @loader_plan(html=[joinedload(Vote.bill)], json=[joinedload(Vote.bill)])
+        def list_votes(): ...
+
+    The options of the negotiated format are applied by ``MultiResponse`` to
+    the queries handed to ``render`` (formats without a plan, typically CSV,
+    load no relationships at all).
+    """
+
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            g.loader_plan = plans
+            return view(*args, **kwargs)
+
+        wrapper.loader_plan = plans
+        return wrapper
+
+    return decorator
+
+
+def loader_options(format_type: str) -> list[Any]:
+    """Loader options declared by the current view for a format."""
+    return list(g.get("loader_plan", {}).get(format_type, []))
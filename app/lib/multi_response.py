@@ -4,11 +4,31 @@ import csv
 from io import StringIO
 from typing import Any
 
-from flask import Response, jsonify, render_template, request
+from flask import (
+    Response,
+    make_response,
+    render_template,
+    request,
+    stream_with_context,
+)
+from sqlalchemy.orm import Query
+
+from app.lib.instrumentation import timed
+from app.lib.loader_plan import loader_options
+from app.lib.pagination import KeysetPage
+from app.lib.serializers import dumps
 
 
 class MultiResponse:
-    """Simple multi-format response handler."""
+    """Simple multi-format response handler.
+
+    Context values may be lists/instances, unexecuted queries or keyset pages;
+    queries are executed by the renderer so that each format can fetch rows its
+    own way.
+    """
+
+    # Rows fetched per round trip and written per chunk when streaming CSV
+    CSV_CHUNK_SIZE = 1000
 
     @staticmethod
     def _get_format() -> str:
@@ -39,30 +59,92 @@ class MultiResponse:
         context: dict[str, Any],
         template: str | None = None,
         filename: str | None = None,
+        include: dict[str, list[str]] | None = None,
     ) -> Response:
-        """Render response in the appropriate format."""
-        format_type = MultiResponse._get_format()
+        """Render response in the appropriate format.
 
-        if format_type == "json":
-            return MultiResponse._render_json(context)
+        ``include`` maps context keys to the computed properties serialized in
+        JSON responses; keys not listed get every property of their model.
+        """
+        format_type = MultiResponse._get_format()
+        context = MultiResponse._apply_loader_plan(context, format_type)
+        page = next(
+            (value for value in context.values() if isinstance(value, KeysetPage)),
+            None,
+        )
 
         if format_type == "csv":
-            return MultiResponse._render_csv(context, filename)
+            response = MultiResponse._render_csv(context, filename)
+            if page is None or not page.explicit:
+                return response
+        else:
+            context = MultiResponse._materialize(context)
+
+            if format_type == "json":
+                response = MultiResponse._render_json(context, include)
+            else:
+                response = make_response(render_template(template, **context))
+
+        if page is not None and page.next_url:
+            response.headers["Link"] = f'<{page.next_url}>; rel="next"'
+        return response
+
+    @staticmethod
+    def prepare(query: Query) -> Query:
+        """Apply the view's loader plan for the negotiated format to a query.
 
-        # html
-        return render_template(template, **context)
+        For queries executed by the view itself, e.g. ``prepare(q).get_or_404(id)``.
+        """
+        return query.options(*loader_options(MultiResponse._get_format()))
 
     @staticmethod
-    def _render_json(context: dict[str, Any]) -> Response:
-        """Render JSON response using BaseModel serialization."""
+    def _apply_loader_plan(
+        context: dict[str, Any],
+        format_type: str,
+    ) -> dict[str, Any]:
+        """Apply the view's loader options for the format to context queries."""
+        options = loader_options(format_type)
+        if not options:
+            return context
+
+        for key, value in context.items():
+            if isinstance(value, KeysetPage):
+                value.base_query = value.base_query.options(*options)
+            elif isinstance(value, Query):
+                context[key] = value.options(*options)
+        return context
+
+    @staticmethod
+    def _materialize(context: dict[str, Any]) -> dict[str, Any]:
+        """Execute any query in the context into a list of instances.
+
+        A keyset page is replaced by its items and exposed as ``pagination``.
+        """
+        materialized = {}
+        for key, value in context.items():
+            if isinstance(value, KeysetPage):
+                materialized[key] = value.items
+                materialized["pagination"] = value
+            elif isinstance(value, Query):
+                materialized[key] = value.all()
+            else:
+                materialized[key] = value
+        return materialized
+
+    @staticmethod
+    def _render_json(
+        context: dict[str, Any],
+        include: dict[str, list[str]] | None = None,
+    ) -> Response:
+        """Render JSON response using the precompiled model serializers."""
         from app.models.base import BaseModel
 
         # Use BaseModel's helper method for consistent serialization
-        serialized_context = BaseModel.serialize_for_json(context)
+        with timed("serialize"):
+            serialized_context = BaseModel.serialize_for_json(context, include)
+            body = dumps(serialized_context)
 
-        response = jsonify(serialized_context)
-        response.headers["Content-Type"] = "application/json"
-        return response
+        return Response(body, mimetype="application/json")
 
     @staticmethod
     def _render_csv(context: dict[str, Any], filename: str | None = None) -> Response:
@@ -71,6 +153,17 @@ class MultiResponse:
         data = None
         key = None
         for k, v in context.items():
+            if isinstance(v, KeysetPage):  # Full export unless explicitly paged
+                return MultiResponse._stream_csv(
+                    v.base_query,
+                    MultiResponse._filename(k, filename),
+                    page=v,
+                )
+            if isinstance(v, Query):  # Queries are streamed
+                return MultiResponse._stream_csv(
+                    v,
+                    MultiResponse._filename(k, filename),
+                )
             if isinstance(v, list) and v:  # First non-empty list
                 data = v
                 key = k
@@ -79,6 +172,15 @@ class MultiResponse:
         if not data:
             return Response("No data to export", status=400, mimetype="text/plain")
 
+        with timed("serialize"):
+            return MultiResponse._write_csv(
+                data,
+                MultiResponse._filename(key, filename),
+            )
+
+    @staticmethod
+    def _write_csv(data: list[Any], filename: str) -> Response:
+        """CSV response of a list of models, built in memory."""
         # Generate CSV from model data
         output = StringIO()
         first_item = data[0]
@@ -110,14 +212,67 @@ class MultiResponse:
                 mimetype="text/plain",
             )
 
-        # Set filename
+        return MultiResponse._csv_response(output.getvalue(), filename)
+
+    @staticmethod
+    def _stream_csv(
+        query: Query,
+        filename: str,
+        page: KeysetPage | None = None,
+    ) -> Response:
+        """Stream a query as CSV without going through the ORM.
+
+        The query is turned into a Core ``SELECT`` of the model's CSV columns
+        (see ``csv_select``), executed on the session's connection with a
+        server-side cursor where supported, and plain tuples are written out
+        one batch at a time.
+        """
+        model = query.column_descriptions[0]["entity"]
+        statement = model.csv_select(query)
+        if page is not None:
+            statement = (
+                page.window(statement) if page.explicit else page.ordered(statement)
+            )
+        chunk_size = MultiResponse.CSV_CHUNK_SIZE
+
+        connection = query.session.connection(bind_arguments={"mapper": model})
+        result = connection.execute(
+            statement.execution_options(stream_results=True, max_row_buffer=chunk_size),
+        )
+        headers = list(result.keys())
+        batches = result.partitions(chunk_size)
+        first_batch = next(batches, None)
+        if first_batch is None:
+            return Response("No data to export", status=400, mimetype="text/plain")
+
+        def generate():
+            output = StringIO()
+            writer = csv.writer(output)
+            writer.writerow(headers)
+            writer.writerows(first_batch)
+            yield output.getvalue()
+
+            for batch in batches:
+                output.seek(0)
+                output.truncate(0)
+                writer.writerows(batch)
+                yield output.getvalue()
+
+        return MultiResponse._csv_response(stream_with_context(generate()), filename)
+
+    @staticmethod
+    def _filename(key: str | None, filename: str | None) -> str:
+        """Attachment filename, defaulting to the context key."""
         if not filename:
-            filename = f"{key}.csv" if key else "export.csv"
-        elif not filename.endswith(".csv"):
-            filename += ".csv"
+            return f"{key}.csv" if key else "export.csv"
+        if not filename.endswith(".csv"):
+            return filename + ".csv"
+        return filename
 
+    @staticmethod
+    def _csv_response(body: Any, filename: str) -> Response:
         return Response(
-            output.getvalue(),
+            body,
             mimetype="text/csv",
             headers={"Content-Disposition": f"attachment; filename={filename}"},
         )
@@ -126,3 +281,13 @@ class MultiResponse:
 def render(context, **args) -> Response:
     """Render response in the appropriate format."""
     return MultiResponse.render(context, **args)
+
+
+def prepare(query: Query) -> Query:
+    """Apply the view's loader plan for the negotiated format to a query."""
+    return MultiResponse.prepare(query)
+
+
+def negotiated_format() -> str:
+    """Response format of the current request: html, json or csv."""
+    return MultiResponse._get_format()  # noqa: SLF001
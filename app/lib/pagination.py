@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from functools import cached_property
+from typing import TYPE_CHECKING, Any
+
+from flask import request, url_for
+from sqlalchemy.orm import Query
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class KeysetPage:
+    """A window of a query ordered by primary key, starting after a cursor.
+
+    Pages are addressed with ``?limit=<n>&after=<id>`` so that fetching any
+    page costs an index range scan instead of an ``OFFSET`` over the table.
+    """
+
+    DEFAULT_LIMIT = 100
+    MAX_LIMIT = 1000
+
+    def __init__(
+        self,
+        query: Query,
+        limit: int | None = None,
+        after: int | None = None,
+        prefetch: Callable[[list[Any]], Any] | None = None,
+    ) -> None:
+        self.base_query = query
+        # Called with the items once they are loaded, e.g. to attach aggregates
+        self.prefetch = prefetch
+        # Only explicitly paged requests window CSV exports
+        self.explicit = limit is not None or after is not None
+        self.limit = min(max(limit or self.DEFAULT_LIMIT, 1), self.MAX_LIMIT)
+        self.after = after
+
+    @classmethod
+    def from_request(
+        cls,
+        query: Query,
+        prefetch: Callable[[list[Any]], Any] | None = None,
+    ) -> KeysetPage:
+        """Build a page from the ``limit`` and ``after`` query parameters."""
+        return cls(
+            query,
+            limit=request.args.get("limit", type=int),
+            after=request.args.get("after", type=int),
+            prefetch=prefetch,
+        )
+
+    @property
+    def model(self) -> type:
+        return self.base_query.column_descriptions[0]["entity"]
+
+    def ordered(self, query: Query) -> Query:
+        """Order a query derived from the base query by id, after the cursor."""
+        query = query.order_by(self.model.id)
+        if self.after is not None:
+            query = query.filter(self.model.id > self.after)
+        return query
+
+    def window(self, query: Query) -> Query:
+        """Restrict a query derived from the base query to this page."""
+        return self.ordered(query).limit(self.limit)
+
+    @property
+    def ordered_query(self) -> Query:
+        """The query ordered by id, starting after the cursor, without limit."""
+        return self.ordered(self.base_query)
+
+    @property
+    def query(self) -> Query:
+        """The query restricted to this page."""
+        return self.window(self.base_query)
+
+    @cached_property
+    def _window(self) -> list[Any]:
+        # One extra row tells whether there is a next page
+        return self.ordered_query.limit(self.limit + 1).all()
+
+    @cached_property
+    def items(self) -> list[Any]:
+        items = self._window[: self.limit]
+        if self.prefetch is not None:
+            self.prefetch(items)
+        return items
+
+    @cached_property
+    def next_cursor(self) -> int | None:
+        """Id to pass as ``after`` for the next page, None on the last page."""
+        if "_window" in self.__dict__:
+            if len(self._window) > self.limit:
+                return self.items[-1].id
+            return None
+
+        # Items were not loaded (e.g. streamed), probe the ids only
+        ids = (
+            self.ordered_query.with_entities(self.model.id)
+            .offset(self.limit - 1)
+            .limit(2)
+            .all()
+        )
+        return ids[0][0] if len(ids) == 2 else None
+
+    def url_for_cursor(self, after: int | None) -> str:
+        """URL of the current endpoint for the page starting after ``after``."""
+        args = request.args.to_dict()
+        args.pop("after", None)
+        if after is not None:
+            args["after"] = after
+        return url_for(request.endpoint, **(request.view_args or {}), **args)
+
+    @property
+    def next_url(self) -> str | None:
+        if self.next_cursor is None:
+            return None
+        return self.url_for_cursor(self.next_cursor)
+
+    @property
+    def first_url(self) -> str:
+        return self.url_for_cursor(None)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "after": self.after,
+            "next_cursor": self.next_cursor,
+            "next": self.next_url,
+        }
+
+
+def paginate(
+    query: Query,
+    prefetch: Callable[[list[Any]], Any] | None = None,
+) -> KeysetPage:
+    """Paginate a query with the current request's keyset parameters."""
+    return KeysetPage.from_request(query, prefetch=prefetch)
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any
+
+from flask import Flask, current_app, g, has_app_context, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+from sqlalchemy.orm import Session as PlainSession
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from sqlalchemy.engine import Connection, Engine, Result
+    from sqlalchemy.orm import ORMExecuteState
+
+    from settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class RoutingSession(Session):
+    """``db.session`` sending the reads of some blueprints to a replica
+
+    Statements go to the primary unless the ``ReplicaRouter`` of the app
+    routes the current request and they only read: SELECTs, and connections
+    asked for by mapper such as CSV streaming, while the session has no
+    pending changes. A request keeps the replica it was first given, so its
+    data version (ETag, cache key) and its rows come from the same database,
+    unless the replica fails: the failed read is then retried on the primary,
+    which serves the rest of the request.
+    """
+
+    def connection(self, *args: Any, **kwargs: Any) -> Connection:
+        try:
+            return super().connection(*args, **kwargs)
+        except DBAPIError:
+            if not _fall_back_to_primary():
+                raise
+            return super().connection(*args, **kwargs)
+
+    def get_bind(
+        self,
+        mapper: Any | None = None,
+        clause: Any | None = None,
+        bind: Engine | Connection | None = None,
+        **kwargs: Any,
+    ) -> Engine | Connection:
+        if bind is None and self._reads_only(clause):
+            replica = _replica_of_request()
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_only(self, clause: Any | None) -> bool:
+        if self._flushing or self.new or self.dirty or self.deleted:
+            return False
+        return clause is None or getattr(clause, "is_select", False)
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _retry_on_primary(state: ORMExecuteState) -> Result | None:
+    """Run the reads of a failing replica again on the primary"""
+    if state.bind_arguments.get("bind") is not None:
+        return None
+    if not state.session._reads_only(state.statement):  # noqa: SLF001
+        return None
+    if _replica_of_request() is None:
+        return None
+    try:
+        return state.invoke_statement()
+    except DBAPIError:
+        if not _fall_back_to_primary():
+            raise
+        return state.invoke_statement()
+
+
+def _fall_back_to_primary() -> bool:
+    """Read from the primary for the rest of the request if its replica failed"""
+    replica = _replica_of_request()
+    if replica is None or current_app.extensions["replicas"].is_usable(replica):
+        return False
+    g.replica = None
+    return True
+
+
+def _replica_of_request() -> Engine | None:
+    if not (has_app_context() and has_request_context()):
+        return None
+    router = current_app.extensions.get("replicas")
+    if router is None or request.blueprint not in router.blueprints:
+        return None
+    if "replica" not in g:
+        g.replica = router.choose()
+    return g.replica
+
+
+class ReplicaRouter:
+    """Read replicas of the primary database, checked for failures and lag
+
+    A replica is usable when it answers and has caught up with the data
+    version of the primary (see ``DataVersions``): imports write to the
+    primary only, so a replica behind it would serve the previous import.
+    Each replica is checked at most every ``check_interval`` seconds, and
+    marked unusable at once when one of its connections fails. Requests are
+    spread round robin over the usable replicas, and served by the primary
+    when there is none.
+    """
+
+    def __init__(
+        self,
+        primary: Engine,
+        replicas: list[Engine],
+        blueprints: Iterable[str],
+        check_interval: float = 5.0,
+    ) -> None:
+        self.primary = primary
+        self.replicas = replicas
+        self.blueprints = frozenset(blueprints)
+        self.check_interval = check_interval
+        self._usable: dict[Engine, bool] = {}
+        self._checked_at: dict[Engine, float] = {}
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(
+        cls,
+        engines: dict[str | None, Engine],
+        settings: Settings,
+    ) -> ReplicaRouter:
+        return cls(
+            engines[None],
+            [engines[key] for key in replica_binds(settings)],
+            settings.replica_blueprints,
+            settings.replica_check_seconds,
+        )
+
+    def init_app(self, app: Flask) -> None:
+        for replica in self.replicas:
+            event.listen(replica, "handle_error", self._on_error)
+        app.teardown_request(_forget_replica)
+        app.extensions["replicas"] = self
+
+    def choose(self) -> Engine | None:
+        """A usable replica, None to read from the primary"""
+        usable = [replica for replica in self.replicas if self.is_usable(replica)]
+        if not usable:
+            return None
+        return usable[next(self._turn) % len(usable)]
+
+    def is_usable(self, replica: Engine) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            checked_at = self._checked_at.get(replica)
+            if checked_at is not None and now - checked_at < self.check_interval:
+                return self._usable[replica]
+            # Concurrent requests keep the last status (the primary at first)
+            self._checked_at[replica] = now
+            self._usable.setdefault(replica, False)
+
+        usable = self._check(replica)
+        with self._lock:
+            self._usable[replica] = usable
+        return usable
+
+    def _check(self, replica: Engine) -> bool:
+        try:
+            replica_version = _data_version(replica)
+        except SQLAlchemyError as error:
+            logger.warning("Replica %s is unavailable: %s", _name(replica), error)
+            return False
+        try:
+            primary_version = _data_version(self.primary)
+        except SQLAlchemyError:
+            return True  # A replica is better than no database at all
+
+        if replica_version < primary_version:
+            logger.info(
+                "Replica %s lags behind (data version %s < %s)",
+                _name(replica),
+                replica_version,
+                primary_version,
+            )
+            return False
+        return True
+
+    def _on_error(self, context: Any) -> None:
+        """Stop reading from a replica whose connection failed until rechecked"""
+        if context.is_disconnect or context.connection is None:
+            replica = context.engine
+            with self._lock:
+                self._usable[replica] = False
+                self._checked_at[replica] = time.monotonic()
+            logger.warning(
+                "Replica %s failed, reading from the primary",
+                _name(replica),
+            )
+
+
+def replica_binds(settings: Settings) -> dict[str, str]:
+    """``SQLALCHEMY_BINDS`` entries of the replica URLs"""
+    return {
+        f"replica_{index}": url.replace("+aiosqlite", "")
+        for index, url in enumerate(settings.database_replica_urls, start=1)
+    }
+
+
+def _data_version(engine: Engine) -> int:
+    from app.services.data_versions import DataVersions
+
+    with engine.connect() as connection, PlainSession(bind=connection) as session:
+        return DataVersions(session).current()
+
+
+def _forget_replica(_error: BaseException | None = None) -> None:
+    g.pop("replica", None)
+
+
+def _name(engine: Engine) -> str:
+    return engine.url.render_as_string(hide_password=True)
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from flask import Flask, Response, g, request
+
+from app.lib.conditional import data_stamp, forget_data_stamp, representation
+
+if TYPE_CHECKING:
+    from settings import Settings
+
+# Response headers replayed from the cache, others are left to the new response
+CACHED_HEADERS = ("Content-Type", "Content-Disposition", "Link")
+
+
+class CachedResponse(NamedTuple):
+    """What is kept of a response: status, replayed headers and body"""
+
+    status: int
+    headers: list[tuple[str, str]]
+    body: bytes
+
+
+class MemoryBackend:
+    """Least recently used responses of this process, within a byte budget"""
+
+    def __init__(self, max_bytes: int, max_entries: int = 10000) -> None:
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.size = 0
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous.body)
+            self._entries[key] = entry
+            self.size += len(entry.body)
+            while self.size > self.max_bytes or len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted.body)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+def prune_directory(directory: str | Path, max_bytes: int) -> None:
+    """Delete the least recently used files of a directory beyond a byte budget
+
+    Temporary files being written are neither counted nor deleted.
+    """
+    entries = []
+    with os.scandir(directory) as scan:
+        for item in scan:
+            if item.name.endswith(".tmp"):
+                continue
+            try:
+                stat = item.stat()
+            except OSError:  # Deleted by another worker
+                continue
+            entries.append((stat.st_mtime, stat.st_size, item.path))
+
+    size = sum(entry[1] for entry in entries)
+    for _, file_size, path in sorted(entries):
+        if size <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+        size -= file_size
+
+
+class FileSystemBackend:
+    """Responses stored as files in a directory shared by the workers of a host
+
+    Each entry is one file named after the hash of its key: a JSON line with
+    the key, status and headers followed by the body. Files are written to a
+    temporary name and renamed, so readers never see partial entries. Hits
+    touch the file and, once about a tenth of the budget has been written,
+    the least recently used files are deleted to get back under budget.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._written = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / hashlib.sha256(key.encode()).hexdigest()
+
+    def get(self, key: str) -> CachedResponse | None:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                meta = json.loads(file.readline())
+                body = file.read()
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        if meta.get("key") != key:
+            return None
+        return CachedResponse(meta["status"], [tuple(h) for h in meta["headers"]], body)
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        meta = {"key": key, "status": entry.status, "headers": entry.headers}
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(json.dumps(meta).encode() + b"\n")
+                file.write(entry.body)
+            Path(temp_path).replace(self._path(key))
+        except OSError:
+            os.unlink(temp_path)
+            raise
+
+        with self._lock:
+            self._written += len(entry.body)
+            if self._written < self.max_bytes // 10:
+                return
+            self._written = 0
+        self.prune()
+
+    def prune(self) -> None:
+        """Delete the least recently used entries beyond the byte budget"""
+        prune_directory(self.directory, self.max_bytes)
+
+    def clear(self) -> None:
+        with os.scandir(self.directory) as scan:
+            for item in scan:
+                try:
+                    os.unlink(item.path)
+                except OSError:
+                    continue
+
+
+class ResponseCache:
+    """Whole responses of the read endpoints, reused until the data changes
+
+    Successful, non-streamed ``GET`` responses of the blueprints are cached
+    under their endpoint, path, query arguments, negotiated format, the
+    application version and the current data version (see ``DataVersions``). Imports bump the version,
+    so entries of previous versions are never read again and age out of the
+    backend. Responses carry ``X-Cache: HIT`` or ``MISS``.
+    """
+
+    BACKENDS = ("none", "memory", "filesystem")
+
+    def __init__(
+        self,
+        backend: MemoryBackend | FileSystemBackend,
+        max_entry_bytes: int | None = None,
+    ) -> None:
+        self.backend = backend
+        # Larger responses, e.g. big CSV pages, would evict many small ones
+        self.max_entry_bytes = max_entry_bytes or backend.max_bytes // 8
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> ResponseCache:
+        max_bytes = settings.response_cache_max_mb * 1024 * 1024
+        if settings.response_cache == "filesystem":
+            return cls(FileSystemBackend(settings.response_cache_dir, max_bytes))
+        if settings.response_cache == "memory":
+            return cls(MemoryBackend(max_bytes))
+        msg = (
+            f"Unknown response cache {settings.response_cache!r}, "
+            f"expected one of {cls.BACKENDS}"
+        )
+        raise ValueError(msg)
+
+    def init_app(self, app: Flask) -> None:
+        app.before_request(self._lookup)
+        app.after_request(self._store)
+        app.teardown_request(forget_data_stamp)
+        app.extensions["response_cache"] = self
+
+    @staticmethod
+    def key() -> str | None:
+        """Cache key of the current request, None if it is not cacheable"""
+        if request.method != "GET" or request.blueprint is None:
+            return None
+        return f"{data_stamp().version}|{representation()}"
+
+    def _lookup(self) -> Response | None:
+        key = self.key()
+        if key is None:
+            return None
+
+        entry = self.backend.get(key)
+        if entry is None:
+            g.response_cache_key = key
+            return None
+
+        response = Response(entry.body, status=entry.status, headers=entry.headers)
+        response.headers["X-Cache"] = "HIT"
+        return response
+
+    def _store(self, response: Response) -> Response:
+        key = g.pop("response_cache_key", None)
+        if key is None:
+            return response
+
+        response.headers["X-Cache"] = "MISS"
+        if (
+            response.status_code == 200
+            and not response.is_streamed
+            and response.content_length is not None
+            and response.content_length <= self.max_entry_bytes
+        ):
+            headers = [
+                (name, value)
+                for name, value in response.headers.items()
+                if name in CACHED_HEADERS
+            ]
+            self.backend.set(
+                key,
+                CachedResponse(response.status_code, headers, response.get_data()),
+            )
+        return response
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import inspect
+import json
+from datetime import date
+from decimal import Decimal
+from operator import attrgetter
+from typing import Any
+
+from werkzeug.http import http_date
+
+try:  # Optional fast encoder
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+class ModelSerializer:
+    """Precompiled JSON extractor for one model class.
+
+    The columns and public properties of the class are introspected once;
+    serializing an instance is then a fixed sequence of attribute reads.
+    """
+
+    def __init__(self, model_class: type) -> None:
+        self.model_class = model_class
+        self.columns = [column.name for column in model_class.__table__.columns]
+        self.properties = [
+            name
+            for name in dir(model_class)
+            if not name.startswith("_")
+            # Static lookup: descriptors such as ``Model.query`` need an app context
+            and isinstance(inspect.getattr_static(model_class, name), property)
+        ]
+        self._get_columns = attrgetter(*self.columns)
+
+    def serialize(self, instance: Any, include: list[str] | None = None) -> dict:
+        """Serialize an instance with all, or only the included, properties."""
+        values = self._get_columns(instance)
+        if len(self.columns) == 1:
+            values = (values,)
+        result = dict(zip(self.columns, values))
+
+        properties = self.properties if include is None else self._included(include)
+        for name in properties:
+            try:
+                value = getattr(instance, name)
+            except Exception:
+                # Skip properties that can't be computed (e.g., due to missing relationships)
+                continue
+            # Handle datetime objects and other non-serializable types
+            result[name] = value.isoformat() if hasattr(value, "isoformat") else value
+
+        return result
+
+    def _included(self, include: list[str]) -> list[str]:
+        unknown = set(include) - set(self.properties)
+        if unknown:
+            msg = (
+                f"Unknown properties for {self.model_class.__name__}: {sorted(unknown)}"
+            )
+            raise ValueError(msg)
+        return include
+
+
+_registry: dict[type, ModelSerializer] = {}
+
+
+def serializer_for(model_class: type) -> ModelSerializer:
+    """The serializer of a model class, built on first use."""
+    serializer = _registry.get(model_class)
+    if serializer is None:
+        serializer = _registry[model_class] = ModelSerializer(model_class)
+    return serializer
+
+
+def register_serializers(base: type) -> None:
+    """Build the serializers of every model mapped on a declarative base."""
+    for mapper in base.registry.mappers:
+        serializer_for(mapper.class_)
+
+
+def _default(value: Any) -> Any:
+    """Encode the types Flask's JSON provider supports natively."""
+    if isinstance(value, date):
+        return http_date(value)
+    if isinstance(value, Decimal):
+        return str(value)
+    msg = f"Object of type {type(value).__name__} is not JSON serializable"
+    raise TypeError(msg)
+
+
+def dumps(value: Any) -> bytes:
+    """Encode a value as compact JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(
+            value,
+            default=_default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+    return json.dumps(value, default=_default, separators=(",", ":")).encode()
@@ -1,6 +1,19 @@
 from .bill import Bill
+from .bill_vote_tally import BillVoteTally
+from .data_version import DataVersion
+from .import_checkpoint import ImportCheckpoint
+from .import_file import ImportFile
 from .legislator import Legislator
 from .vote import Vote
 from .vote_result import VoteResult
 
-__all__ = ["Bill", "Legislator", "Vote", "VoteResult"]
+__all__ = [
+    "Bill",
+    "BillVoteTally",
+    "DataVersion",
+    "ImportCheckpoint",
+    "ImportFile",
+    "Legislator",
+    "Vote",
+    "VoteResult",
+]
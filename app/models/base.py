@@ -1,6 +1,9 @@
-from sqlalchemy import func
+from functools import lru_cache
+
+from sqlalchemy import func, select
 
 from app import db
+from app.lib.serializers import serializer_for
 
 
 class BaseModel(db.Model):
@@ -9,58 +12,64 @@ class BaseModel(db.Model):
     created_at = db.Column(db.DateTime, default=func.now(), nullable=False)
     updated_at = db.Column(db.DateTime, default=func.now(), onupdate=func.now())
 
-    def to_json(self):
-        """Convert model instance to JSON representation including computed properties."""
-        # Start with table columns
-        result = {
-            column.name: getattr(self, column.name) for column in self.__table__.columns
-        }
-
-        # Add computed properties from the class
-        for attr_name in dir(self.__class__):
-            if not attr_name.startswith("_"):
-                attr = getattr(self.__class__, attr_name)
-                if isinstance(attr, property):
-                    try:
-                        prop_value = getattr(self, attr_name)
-                        # Handle datetime objects and other non-serializable types
-                        if hasattr(prop_value, "isoformat"):
-                            result[attr_name] = prop_value.isoformat()
-                        else:
-                            result[attr_name] = prop_value
-                    except Exception:
-                        # Skip properties that can't be computed (e.g., due to missing relationships)
-                        continue
+    def to_json(self, include=None):
+        """Convert model instance to JSON representation including computed properties.
 
-        return result
+        ``include`` restricts the computed properties to the given names.
+        """
+        return serializer_for(self.__class__).serialize(self, include)
 
     @staticmethod
-    def serialize_for_json(obj):
-        """Helper method to serialize any object or collection for JSON."""
+    def serialize_for_json(obj, include=None):  # noqa: PLR0911
+        """Helper method to serialize any object or collection for JSON.
+
+        ``include`` maps context keys to the computed properties to serialize.
+        """
         if obj is None:
             return None
         if isinstance(obj, list):
-            return [BaseModel.serialize_for_json(item) for item in obj]
+            if obj and isinstance(obj[0], BaseModel):
+                serializer = serializer_for(obj[0].__class__)
+                return [serializer.serialize(item, include) for item in obj]
+            return [BaseModel.serialize_for_json(item, include) for item in obj]
+        if isinstance(obj, BaseModel):
+            return obj.to_json(include)
         if hasattr(obj, "to_json"):
             return obj.to_json()
         if isinstance(obj, dict):
-            return {k: BaseModel.serialize_for_json(v) for k, v in obj.items()}
+            include = include or {}
+            return {
+                k: BaseModel.serialize_for_json(v, include.get(k))
+                for k, v in obj.items()
+            }
         return obj
 
     @classmethod
+    @lru_cache(maxsize=None)
+    def csv_columns(cls):
+        """Table columns for model export with logical ordering, computed once per class."""
+        columns = list(cls.__table__.columns)
+        # Ensure id comes first, then other columns in a logical order
+        columns.sort(key=lambda column: column.name != "id")
+        return tuple(columns)
+
+    @classmethod
+    @lru_cache(maxsize=None)
     def csv_headers(cls):
         """CSV headers for model export with logical ordering."""
-        columns = [column.name for column in cls.__table__.columns]
-        # Ensure id comes first, then other columns in a logical order
-        if "id" in columns:
-            columns.remove("id")
-            columns.insert(0, "id")
-        return columns
+        return tuple(column.name for column in cls.csv_columns())
+
+    @classmethod
+    def csv_select(cls, query):
+        """Core SELECT of the CSV columns with the query's filters, yielding plain tuples."""
+        statement = select(*cls.csv_columns())
+        if query.whereclause is not None:
+            statement = statement.where(query.whereclause)
+        return statement
 
     def to_csv(self):
         """Convert model instance to CSV row format."""
-        headers = self.csv_headers()
-        return [getattr(self, column_name) for column_name in headers]
+        return [getattr(self, column_name) for column_name in self.csv_headers()]
 
     def __repr__(self) -> str:
         return f"<{self.__class__.__name__} {self.id}>"
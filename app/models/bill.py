@@ -5,13 +5,19 @@ from app.models.base import BaseModel
 class Bill(BaseModel):
     __tablename__ = "bills"
     title = db.Column(db.String, nullable=False)
-    sponsor_id = db.Column(db.Integer, db.ForeignKey("legislators.id"))
+    sponsor_id = db.Column(db.Integer, db.ForeignKey("legislators.id"), index=True)
 
     # belongs to
     sponsor = db.relationship("Legislator", back_populates="sponsored_bills")
 
     # Has many
     votes = db.relationship("Vote", back_populates="bill")
+    vote_tallies = db.relationship("BillVoteTally", back_populates="bill")
+
+    @property
+    def sponsor_name(self):
+        """Name of the legislator sponsoring the bill"""
+        return self.sponsor.name if self.sponsor else None
 
     @property
     def votes_count(self):
@@ -20,15 +26,25 @@ class Bill(BaseModel):
 
     @property
     def is_supported(self):
-        """Check if the bill is supported by the sponsor"""
-        return any(vote.is_supported for vote in self.votes)
+        """Check if any vote on the bill had more yeas than nays"""
+        return any(tally.is_supported for tally in self.vote_tallies)
 
     @property
     def is_opposed(self):
-        """Check if the bill is opposed by the sponsor"""
-        return any(vote.is_opposed for vote in self.votes)
+        """Check if any vote on the bill had more nays than yeas"""
+        return any(tally.is_opposed for tally in self.vote_tallies)
+
+    @property
+    def yea_count(self):
+        """Count of yea vote results on the bill"""
+        return sum(tally.yea_count for tally in self.vote_tallies)
+
+    @property
+    def nay_count(self):
+        """Count of nay vote results on the bill"""
+        return sum(tally.nay_count for tally in self.vote_tallies)
 
     @property
     def vote_results_count(self):
         """Count of vote results associated with the bill"""
-        return sum(len(vote.vote_results) for vote in self.votes)
+        return sum(tally.total_count for tally in self.vote_tallies)
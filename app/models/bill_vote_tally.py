@@ -0,0 +1,27 @@
+from app import db
+from app.models.base import BaseModel
+
+
+class BillVoteTally(BaseModel):
+    """Denormalized yea/nay/total counts of a vote, maintained by the importers"""
+
+    __tablename__ = "bill_vote_tallies"
+    vote_id = db.Column(db.Integer, db.ForeignKey("votes.id"), unique=True)
+    bill_id = db.Column(db.Integer, db.ForeignKey("bills.id"), index=True)
+    yea_count = db.Column(db.Integer, nullable=False, default=0)
+    nay_count = db.Column(db.Integer, nullable=False, default=0)
+    total_count = db.Column(db.Integer, nullable=False, default=0)
+
+    # belongs to
+    vote = db.relationship("Vote", back_populates="tally")
+    bill = db.relationship("Bill", back_populates="vote_tallies")
+
+    @property
+    def is_supported(self):
+        """Check if the vote passed with more yeas than nays"""
+        return self.yea_count > self.nay_count
+
+    @property
+    def is_opposed(self):
+        """Check if the vote failed with more nays than yeas"""
+        return self.nay_count > self.yea_count
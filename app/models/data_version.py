@@ -0,0 +1,13 @@
+from app import db
+from app.models.base import BaseModel
+
+
+class DataVersion(BaseModel):
+    """Generation of the imported data, a single row bumped by every import
+
+    Cached responses are keyed by ``version``, so an import invalidates them
+    for every process at once, see ``DataVersions``.
+    """
+
+    __tablename__ = "data_versions"
+    version = db.Column(db.BigInteger, nullable=False, default=0)
@@ -0,0 +1,15 @@
+from app import db
+from app.models.base import BaseModel
+
+
+class ImportCheckpoint(BaseModel):
+    """Position of the last committed batch of an unfinished import, to resume from"""
+
+    __tablename__ = "import_checkpoints"
+    __table_args__ = (db.UniqueConstraint("importer", "file_path"),)
+    importer = db.Column(db.String, nullable=False)
+    file_path = db.Column(db.String, nullable=False)
+    checksum = db.Column(db.String(64), nullable=False)
+    # Data rows read so far (excluding the header) and the byte offset after them
+    row_number = db.Column(db.Integer, nullable=False, default=0)
+    file_offset = db.Column(db.BigInteger, nullable=False, default=0)
@@ -0,0 +1,13 @@
+from app import db
+from app.models.base import BaseModel
+
+
+class ImportFile(BaseModel):
+    """Last successful import of a CSV file by an importer, for incremental imports"""
+
+    __tablename__ = "import_files"
+    __table_args__ = (db.UniqueConstraint("importer", "file_path"),)
+    importer = db.Column(db.String, nullable=False)
+    file_path = db.Column(db.String, nullable=False)
+    checksum = db.Column(db.String(64), nullable=False)
+    row_count = db.Column(db.Integer, nullable=False, default=0)
@@ -9,17 +9,38 @@ class Legislator(BaseModel):
     sponsored_bills = db.relationship("Bill", back_populates="sponsor")
     vote_results = db.relationship("VoteResult", back_populates="legislator")
 
+    # LegislatorStats set by LegislatorStats.attach for listed legislators
+    precomputed_stats = None
+
+    def _stats(self):
+        """Aggregated counts, queried on demand unless precomputed"""
+        if self.precomputed_stats is not None:
+            return self.precomputed_stats
+
+        from app.services.stats import LegislatorStats
+
+        return LegislatorStats.for_legislators([self.id]).get(
+            self.id,
+        ) or LegislatorStats(self.id)
+
     @property
     def sponsored_bills_count(self):
         """Count of bills sponsored by the legislator"""
-        return len(self.sponsored_bills)
+        return self._stats().sponsored_bills_count
 
     @property
     def supported_bills_count(self):
         """Count of bills supported by the legislator (vote_type=1)"""
-        return sum(1 for vote_result in self.vote_results if vote_result.vote_type == 1)
+        return self._stats().supported_bills_count
 
     @property
     def opposed_bills_count(self):
         """Count of bills opposed by the legislator (vote_type=2)"""
-        return sum(1 for vote_result in self.vote_results if vote_result.vote_type == 2)
+        return self._stats().opposed_bills_count
+
+    @classmethod
+    def csv_select(cls, query):
+        """Export legislators together with their aggregated counts"""
+        from app.services.stats import LegislatorStats
+
+        return LegislatorStats.annotate(super().csv_select(query))
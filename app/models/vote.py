@@ -4,14 +4,15 @@ from app.models.base import BaseModel
 
 class Vote(BaseModel):
     __tablename__ = "votes"
-    bill_id = db.Column(db.Integer, db.ForeignKey("bills.id"))
+    bill_id = db.Column(db.Integer, db.ForeignKey("bills.id"), index=True)
     bill = db.relationship("Bill", back_populates="votes")
     vote_results = db.relationship("VoteResult", back_populates="vote")
+    tally = db.relationship("BillVoteTally", back_populates="vote", uselist=False)
 
     @property
     def vote_results_count(self):
         """Count of vote results associated with the vote"""
-        return len(self.vote_results)
+        return self.tally.total_count if self.tally else 0
 
     @property
     def bill_title(self):
@@ -1,3 +1,5 @@
+from sqlalchemy import case, func
+
 from app import db
 from app.constants.vote_type import VoteType
 from app.models.base import BaseModel
@@ -5,6 +7,16 @@ from app.models.base import BaseModel
 
 class VoteResult(BaseModel):
     __tablename__ = "vote_results"
+    # Lookups by vote or legislator use the leading column, and the per-vote
+    # tallies and per-legislator counts read vote_type from the index alone
+    __table_args__ = (
+        db.Index("ix_vote_results_vote_id_vote_type", "vote_id", "vote_type"),
+        db.Index(
+            "ix_vote_results_legislator_id_vote_type",
+            "legislator_id",
+            "vote_type",
+        ),
+    )
     vote_id = db.Column(db.Integer, db.ForeignKey("votes.id"))
     legislator_id = db.Column(db.Integer, db.ForeignKey("legislators.id"))
     _vote_type = db.Column("vote_type", db.Integer)  # 1=Yea, 2=Nay
@@ -45,3 +57,10 @@ class VoteResult(BaseModel):
             return VoteType.label(self.vote_type)
         except Exception:
             return None
+
+
+# SQL over the raw column (VoteResult.vote_type is a validating Python
+# property): the yeas and nays among the vote results of a GROUP BY
+VOTE_TYPE = VoteResult.__table__.c.vote_type
+YEA_COUNT = func.sum(case((VOTE_TYPE == VoteType.YEA, 1), else_=0))
+NAY_COUNT = func.sum(case((VOTE_TYPE == VoteType.NAY, 1), else_=0))
@@ -1,21 +1,45 @@
 from flask import Blueprint, Response
+from sqlalchemy.orm import joinedload, selectinload
 
-from app.lib.multi_response import render
+from app.lib.loader_plan import loader_plan
+from app.lib.multi_response import prepare, render
+from app.lib.pagination import paginate
 from app.models.bill import Bill
+from app.models.vote import Vote
 
 bp = Blueprint("bills", __name__)
 
 
 @bp.route("/bills")
 @bp.route("/bills/")
+@loader_plan(
+    html=[joinedload(Bill.sponsor), selectinload(Bill.votes)],
+    json=[joinedload(Bill.sponsor), selectinload(Bill.votes)],
+)
 def list_bills() -> Response:
-    bills = Bill.query.all()
-    return render({"bills": bills}, template="bills/index.html", filename="bills.csv")
+    bills = paginate(Bill.query)
+    return render(
+        {"bills": bills},
+        template="bills/index.html",
+        filename="bills.csv",
+        include={"bills": ["sponsor_name", "votes_count"]},
+    )
 
 
 @bp.route("/bills/<int:bill_id>")
+@loader_plan(
+    html=[
+        joinedload(Bill.sponsor),
+        selectinload(Bill.votes).selectinload(Vote.vote_results),
+    ],
+    json=[
+        joinedload(Bill.sponsor),
+        selectinload(Bill.votes),
+        selectinload(Bill.vote_tallies),
+    ],
+)
 def show_bill(bill_id: int) -> Response:
-    bill = Bill.query.get_or_404(bill_id)
+    bill = prepare(Bill.query).get_or_404(bill_id)
     return render(
         {"bill": bill},
         template="bills/show.html",
@@ -1,7 +1,13 @@
 from flask import Blueprint, Response
+from sqlalchemy.orm import selectinload
 
-from app.lib.multi_response import render
+from app.lib.loader_plan import loader_plan
+from app.lib.multi_response import prepare, render
+from app.lib.pagination import paginate
 from app.models.legislator import Legislator
+from app.models.vote import Vote
+from app.models.vote_result import VoteResult
+from app.services.stats import LegislatorStats
 
 bp = Blueprint("legislators", __name__)
 
@@ -9,17 +15,33 @@ bp = Blueprint("legislators", __name__)
 @bp.route("/legislators")
 @bp.route("/legislators/")
 def list_legislators() -> Response:
-    legislators = Legislator.query.all()
+    legislators = paginate(Legislator.query, prefetch=LegislatorStats.attach)
     return render(
         {"legislators": legislators},
         template="legislators/index.html",
         filename="legislators.csv",
+        include={
+            "legislators": [
+                "sponsored_bills_count",
+                "supported_bills_count",
+                "opposed_bills_count",
+            ],
+        },
     )
 
 
 @bp.route("/legislators/<int:legislator_id>")
+@loader_plan(
+    html=[
+        selectinload(Legislator.sponsored_bills),
+        selectinload(Legislator.vote_results)
+        .joinedload(VoteResult.vote)
+        .joinedload(Vote.bill),
+    ],
+)
 def show_legislator(legislator_id: int) -> Response:
-    legislator = Legislator.query.get_or_404(legislator_id)
+    legislator = prepare(Legislator.query).get_or_404(legislator_id)
+    LegislatorStats.attach([legislator])
     return render(
         {"legislator": legislator},
         template="legislators/show.html",
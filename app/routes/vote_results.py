@@ -1,6 +1,10 @@
 from flask import Blueprint, Response
+from sqlalchemy.orm import joinedload
 
-from app.lib.multi_response import render
+from app.lib.loader_plan import loader_plan
+from app.lib.multi_response import prepare, render
+from app.lib.pagination import paginate
+from app.models.vote import Vote
 from app.models.vote_result import VoteResult
 
 bp = Blueprint("vote_results", __name__)
@@ -8,18 +12,31 @@ bp = Blueprint("vote_results", __name__)
 
 @bp.route("/vote_results")
 @bp.route("/vote_results/")
+@loader_plan(
+    html=[
+        joinedload(VoteResult.legislator),
+        joinedload(VoteResult.vote).joinedload(Vote.bill),
+    ],
+)
 def list_vote_results() -> Response:
-    vote_results = VoteResult.query.all()
+    vote_results = paginate(VoteResult.query)
     return render(
         {"vote_results": vote_results},
         template="vote_results/index.html",
         filename="vote_results.csv",
+        include={"vote_results": ["vote_type_label"]},
     )
 
 
 @bp.route("/vote_results/<int:vote_result_id>")
+@loader_plan(
+    html=[
+        joinedload(VoteResult.legislator),
+        joinedload(VoteResult.vote).joinedload(Vote.bill),
+    ],
+)
 def show_vote_result(vote_result_id: int) -> Response:
-    vote_result = VoteResult.query.get_or_404(vote_result_id)
+    vote_result = prepare(VoteResult.query).get_or_404(vote_result_id)
     return render(
         {"vote_result": vote_result},
         template="vote_results/show.html",
@@ -1,21 +1,41 @@
 from flask import Blueprint, Response
+from sqlalchemy.orm import joinedload, selectinload
 
-from app.lib.multi_response import render
+from app.lib.loader_plan import loader_plan
+from app.lib.multi_response import prepare, render
+from app.lib.pagination import paginate
 from app.models.vote import Vote
+from app.models.vote_result import VoteResult
 
 bp = Blueprint("votes", __name__)
 
 
 @bp.route("/votes")
 @bp.route("/votes/")
+@loader_plan(
+    html=[joinedload(Vote.bill), joinedload(Vote.tally)],
+    json=[joinedload(Vote.bill), joinedload(Vote.tally)],
+)
 def list_votes() -> Response:
-    votes = Vote.query.all()
-    return render({"votes": votes}, template="votes/index.html", filename="votes.csv")
+    votes = paginate(Vote.query)
+    return render(
+        {"votes": votes},
+        template="votes/index.html",
+        filename="votes.csv",
+        include={"votes": ["bill_title", "vote_results_count"]},
+    )
 
 
 @bp.route("/votes/<int:vote_id>")
+@loader_plan(
+    html=[
+        joinedload(Vote.bill),
+        selectinload(Vote.vote_results).joinedload(VoteResult.legislator),
+    ],
+    json=[joinedload(Vote.bill), joinedload(Vote.tally)],
+)
 def show_vote(vote_id: int) -> Response:
-    vote = Vote.query.get_or_404(vote_id)
+    vote = prepare(Vote.query).get_or_404(vote_id)
     return render(
         {"vote": vote},
         template="votes/show.html",
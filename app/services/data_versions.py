@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, NamedTuple
+
+from sqlalchemy import func, select, update
+
+from app.models.data_version import DataVersion
+
+if TYPE_CHECKING:
+    from datetime import datetime
+
+    from sqlalchemy.orm import Session
+
+
+class DataStamp(NamedTuple):
+    """Version of the data and the time of its last bump (UTC), if any"""
+
+    version: int
+    updated_at: datetime | None
+
+
+class DataVersions:
+    """Reads and bumps the ``data_versions`` generation counter
+
+    The counter only ever increases: it is incremented in the transaction
+    that writes imported rows, and starts from the current time in
+    milliseconds, so that recreating the table does not reuse old versions.
+    """
+
+    ROW_ID = 1
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    def current(self) -> int:
+        """Current version, 0 before the first import"""
+        return self.stamp().version
+
+    def stamp(self) -> DataStamp:
+        """Current version and when it was bumped, in one query"""
+        row = self.session.execute(
+            select(DataVersion.version, DataVersion.updated_at).where(
+                DataVersion.id == self.ROW_ID,
+            ),
+        ).first()
+        if row is None:
+            return DataStamp(0, None)
+        return DataStamp(row.version, row.updated_at)
+
+    def bump(self) -> None:
+        """Increment the version, committed with the caller's transaction"""
+        result = self.session.execute(
+            update(DataVersion)
+            .where(DataVersion.id == self.ROW_ID)
+            .values(version=DataVersion.version + 1, updated_at=func.now()),
+        )
+        if result.rowcount == 0:
+            self.session.add(
+                DataVersion(id=self.ROW_ID, version=time.time_ns() // 1_000_000),
+            )
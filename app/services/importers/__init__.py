@@ -1,15 +1,27 @@
-from .base_batch_importer import BaseBatchImporter
+from .base_batch_importer import (
+    BaseBatchImporter,
+    ImportFileError,
+    ParsedBatch,
+    ResumePoint,
+)
 from .bill_importer import BillImporter
 from .import_result import ImportResult
 from .legislator_importer import LegislatorImporter
+from .pipeline import ImportPipeline
+from .reference import Reference
 from .vote_importer import VoteImporter
 from .vote_result_importer import VoteResultImporter
 
 __all__ = [
     "BaseBatchImporter",
     "BillImporter",
+    "ImportFileError",
+    "ImportPipeline",
     "ImportResult",
     "LegislatorImporter",
+    "ParsedBatch",
+    "Reference",
+    "ResumePoint",
     "VoteImporter",
     "VoteResultImporter",
 ]
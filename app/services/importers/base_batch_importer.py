@@ -2,20 +2,114 @@ from __future__ import annotations
 
 import csv
 import os
-from typing import TYPE_CHECKING, Any
+from itertools import islice
+from typing import TYPE_CHECKING, Any, BinaryIO, NamedTuple
 
+from sqlalchemy import select
 from sqlalchemy.dialects.postgresql import insert as postgresql_insert
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
+from app.services.data_versions import DataVersions
+
+from .bulk_loader import BulkLoader
+from .error_sink import ErrorSink
+from .id_tracker import IdTracker
 from .import_result import ImportResult
+from .manifest import ImportManifest, file_checksum
+from .reference import Reference, check_references
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    import pandas as pd
+    from sqlalchemy import Table
     from sqlalchemy.orm import Session
 
 
+class ImportFileError(Exception):
+    """The file as a whole cannot be imported, e.g. missing or wrong headers"""
+
+
+class ParsedBatch(NamedTuple):
+    """Transformed rows of a file, ready to be checked and written"""
+
+    rows: list[dict[str, Any]]
+    # (row number, transform error) for each row
+    row_info: list[tuple[int, str | None]]
+    # (row number, error) of the rows rejected before the batch
+    errors: list[tuple[int, str]]
+    # Data rows read and byte offset in the file once the batch is complete
+    row_number: int = 0
+    offset: int = 0
+
+
+class ResumePoint(NamedTuple):
+    """Where to continue reading a file, see ``ImportCheckpoint``"""
+
+    row_number: int
+    offset: int
+
+
+class _OffsetLines:
+    """Lines of a binary file, decoded, counting the bytes consumed so far
+
+    ``csv`` readers pull one line at a time, so after a row is returned
+    ``offset`` is the position right after that row.
+    """
+
+    def __init__(self, file: BinaryIO) -> None:
+        self.file = file
+        self.offset = 0
+
+    def seek(self, offset: int) -> None:
+        self.file.seek(offset)
+        self.offset = offset
+
+    def __iter__(self) -> _OffsetLines:
+        return self
+
+    def __next__(self) -> str:
+        line = self.file.readline()
+        if not line:
+            raise StopIteration
+        self.offset += len(line)
+        return line.decode("utf-8")
+
+
+def _start_at(
+    lines: _OffsetLines,
+    reader: csv.DictReader,
+    start: ResumePoint | None,
+) -> int:
+    """Position a reader at a resume point, returning its row number"""
+    if start is None:
+        return 0
+    if start.offset:
+        lines.seek(start.offset)
+    else:  # Checkpoint of the pandas engine, which only knows row numbers
+        for _ in islice(reader, start.row_number):
+            pass
+    return start.row_number
+
+
 class BaseBatchImporter:
     """Base class for batch importers with upsert capabilities"""
 
+    # Foreign keys validated once per batch, e.g. Reference("vote_id", Vote)
+    references: list[Reference] = []
+
+    MODES = ("upsert", "bulk", "incremental")
+
+    # How files are parsed: "python" row by row, "pandas" in vectorized chunks
+    ENGINES = ("python", "pandas")
+    engine = "python"
+
+    # Memory budget of the ids tracked to detect duplicates in a file, in bytes
+    id_memory_limit = 64 * 1024 * 1024
+    # Errors kept in ImportResult.errors, all of them are written to error_log
+    max_errors = 1000
+    error_log: str | None = None
+
     def __init__(
         self,
         session: Session,
@@ -25,36 +119,230 @@ class BaseBatchImporter:
         self.session = session
         self.model_class = model_class
         self.batch_size = batch_size
+        self._checksums: dict[str, str] = {}
+
+    def import_from_file(
+        self,
+        file_path: str,
+        mode: str = "upsert",
+        *,
+        commit_every: int | None = None,
+        resume: bool = False,
+    ) -> ImportResult:
+        """Import data from CSV file using batch upsert (or bulk load)"""
+        start = self.resume_point(file_path) if resume else None
+        return self.import_batches(
+            self.parse_file(file_path, start),
+            mode,
+            file_path,
+            commit_every=commit_every,
+            resumed=start is not None,
+        )
 
-    def import_from_file(self, file_path: str) -> ImportResult:
-        """Import data from CSV file using batch upsert"""
-        errors = []
+    def import_batches(
+        self,
+        batches: Iterable[ParsedBatch],
+        mode: str = "upsert",
+        file_path: str | None = None,
+        *,
+        commit_every: int | None = None,
+        resumed: bool = False,
+    ) -> ImportResult:
+        """Write batches produced by ``parse_file`` and commit
+
+        ``mode="upsert"`` upserts every batch as it comes. ``mode="bulk"`` is
+        meant for initial loads and full refreshes: batches are staged and
+        merged into the table with a single statement, see ``BulkLoader``.
+        ``mode="incremental"`` skips the file if its checksum matches its last
+        import, and otherwise only writes the rows whose content changed.
+
+        With ``commit_every=n``, the import commits every ``n`` batches
+        together with a checkpoint of its position in the file, so that a
+        failed import keeps its committed batches and can be resumed (see
+        ``resume_point``). Otherwise everything is committed at the end.
+        ``resumed`` batches start at such a checkpoint, so the errors of the
+        rows before it are kept in ``error_log``.
+        """
+        checkpoints = bool(commit_every) and file_path is not None
+        self._check_mode(mode, checkpoints=checkpoints)
+
+        errors = ErrorSink(self.max_errors, self.error_log, append=resumed)
         imported_count = 0
+        committed_count = 0
+        loader = BulkLoader(self) if mode == "bulk" else None
+        incremental = mode == "incremental"
+        changes = dict.fromkeys(("inserted", "updated", "unchanged"), 0)
+
+        try:
+            if incremental and file_path is not None:
+                skipped = self.skip_unchanged(file_path)
+                if skipped is not None:
+                    return skipped
+
+            if loader is not None:
+                loader.begin()
+
+            for number, parsed in enumerate(batches, start=1):
+                imported_count += self._flush_batch(
+                    parsed.rows,
+                    parsed.row_info,
+                    parsed.errors,
+                    errors,
+                    loader=loader,
+                    changes=changes if incremental else None,
+                )
+                if checkpoints and number % commit_every == 0:
+                    self._save_checkpoint(file_path, parsed)
+                    self._commit(changed=imported_count > committed_count)
+                    committed_count = imported_count
+
+            if loader is not None and loader.staging is not None:
+                loader.merge()
+                self.after_bulk_load(loader.staging)
+                loader.drop()
+
+            success = imported_count > 0 or errors.count == 0
+            if file_path is not None:
+                # A file whose valid rows are all in the table already counts
+                # as imported, even with invalid rows, so it is skipped next time
+                self._update_manifest(
+                    file_path,
+                    record=incremental and (success or changes["unchanged"] > 0),
+                    row_count=sum(changes.values()),
+                )
 
+            self._commit(changed=imported_count > committed_count)
+            return ImportResult(
+                success,
+                imported_count,
+                errors.sample,
+                error_count=errors.count,
+                error_log=errors.log_path if errors.count else None,
+                inserted_count=changes["inserted"],
+                updated_count=changes["updated"],
+                unchanged_count=changes["unchanged"],
+            )
+
+        except ImportFileError as e:
+            return ImportResult(False, 0, [str(e)])
+        except Exception as e:
+            self.session.rollback()
+            if not committed_count:
+                return ImportResult(False, 0, [f"Import failed: {e}"])
+            errors.add(f"Import failed: {e}")
+            return ImportResult(
+                False,
+                committed_count,
+                errors.sample,
+                error_count=errors.count,
+                error_log=errors.log_path,
+            )
+        finally:
+            errors.close()
+            if loader is not None:
+                loader.end()
+
+    def _commit(self, *, changed: bool) -> None:
+        """Commit, bumping the data version if rows were written since the last one"""
+        if changed:
+            DataVersions(self.session).bump()
+        self.session.commit()
+
+    def _check_mode(self, mode: str, *, checkpoints: bool) -> None:
+        if mode not in self.MODES:
+            msg = f"Unknown import mode {mode!r}, expected one of {self.MODES}"
+            raise ValueError(msg)
+        if checkpoints and mode == "bulk":
+            msg = "Bulk loads are merged at the end and cannot be checkpointed"
+            raise ValueError(msg)
+
+    def resume_point(self, file_path: str) -> ResumePoint | None:
+        """Position of the last committed batch of an interrupted import
+
+        None if there is no checkpoint, or if the file changed since.
+        """
         if not os.path.exists(file_path):
-            return ImportResult(False, 0, [f"File not found: {file_path}"])
+            return None
+        checkpoint = ImportManifest(self.session).checkpoint(
+            self.manifest_name,
+            file_path,
+        )
+        if checkpoint is None or checkpoint.checksum != self.checksum(file_path):
+            return None
+        return ResumePoint(checkpoint.row_number, checkpoint.file_offset)
+
+    def _update_manifest(self, file_path: str, *, record: bool, row_count: int) -> None:
+        """Record a finished import, which leaves nothing to resume"""
+        manifest = ImportManifest(self.session)
+        if record:
+            manifest.record(
+                self.manifest_name,
+                file_path,
+                self.checksum(file_path),
+                row_count,
+            )
+        manifest.clear_checkpoint(self.manifest_name, file_path)
+
+    def _save_checkpoint(self, file_path: str, parsed: ParsedBatch) -> None:
+        ImportManifest(self.session).save_checkpoint(
+            self.manifest_name,
+            file_path,
+            self.checksum(file_path),
+            row_number=parsed.row_number,
+            file_offset=parsed.offset,
+        )
 
-        try:
-            with open(file_path, encoding="utf-8") as file:
-                reader = csv.DictReader(file)
-
-                # Validate required headers
-                required_headers = self.get_required_headers()
-                if not all(header in reader.fieldnames for header in required_headers):
-                    missing = [
-                        h for h in required_headers if h not in reader.fieldnames
-                    ]
-                    return ImportResult(
-                        False,
-                        0,
-                        [f"Missing required headers: {missing}"],
-                    )
-
-                # Process data in batches
-                batch = []
-                row_count = 0
-                seen_ids = set()  # Track IDs to detect duplicates within the file
+    def parse_file(
+        self,
+        file_path: str,
+        start: ResumePoint | None = None,
+    ) -> Iterator[ParsedBatch]:
+        """Read, transform and validate a CSV file into batches
+
+        Does not touch the database, so files can be parsed in worker threads
+        while another file is being written. The last batch is always yielded,
+        possibly empty, so that trailing row errors get reported. Reading
+        starts after the header, or at ``start`` when resuming.
+        """
+        if not os.path.exists(file_path):
+            msg = f"File not found: {file_path}"
+            raise ImportFileError(msg)
+
+        if self.engine == "pandas":
+            from .vectorized import parse_frames
 
+            yield from parse_frames(self, file_path, start)
+        else:
+            yield from self._parse_rows(file_path, start)
+
+    def _parse_rows(
+        self,
+        file_path: str,
+        start: ResumePoint | None = None,
+    ) -> Iterator[ParsedBatch]:
+        """``parse_file`` for the python engine, one row at a time"""
+        with open(file_path, "rb") as file:
+            lines = _OffsetLines(file)
+            reader = csv.DictReader(lines)
+
+            # Validate required headers
+            required_headers = self.get_required_headers()
+            if not all(header in reader.fieldnames for header in required_headers):
+                missing = [h for h in required_headers if h not in reader.fieldnames]
+                msg = f"Missing required headers: {missing}"
+                raise ImportFileError(msg)
+
+            # Process data in batches
+            batch = []
+            # (row number, transform error) for each row in the batch
+            batch_rows = []
+            # Errors are reported in row order once the batch is validated
+            pending_errors = []
+            row_count = _start_at(lines, reader, start)
+            # Track IDs to detect duplicates within the file
+            seen_ids = IdTracker(self.id_memory_limit)
+
+            try:
                 for row in reader:
                     row_count += 1
                     try:
@@ -62,51 +350,155 @@ class BaseBatchImporter:
                         transformed_row = self.transform_row(row)
                         validation_error = self.validate_row(transformed_row)
 
-                        # Check for validation errors from transform_row
-                        if "_validation_error" in transformed_row:
-                            errors.append(
-                                f"Row {row_count}: {transformed_row['_validation_error']}",
-                            )
-                            # Remove the error marker before processing
-                            del transformed_row["_validation_error"]
+                        # Validation errors from transform_row are reported
+                        # together with the reference checks of the batch
+                        transform_error = transformed_row.pop("_validation_error", None)
 
                         if validation_error:
-                            errors.append(f"Row {row_count}: {validation_error}")
+                            if transform_error:
+                                pending_errors.append((row_count, transform_error))
+                            pending_errors.append((row_count, validation_error))
                             continue
 
                         # Check for duplicate IDs within the same file
                         row_id = transformed_row.get("id")
-                        if row_id in seen_ids:
-                            errors.append(
-                                f"Row {row_count}: Duplicate ID {row_id} found in file",
+                        if not seen_ids.add(row_id):
+                            if transform_error:
+                                pending_errors.append((row_count, transform_error))
+                            pending_errors.append(
+                                (row_count, f"Duplicate ID {row_id} found in file"),
                             )
                             continue
-                        seen_ids.add(row_id)
 
                         batch.append(transformed_row)
+                        batch_rows.append((row_count, transform_error))
 
-                        # Process batch when it reaches the batch size
+                        # Hand the batch over when it reaches the batch size
                         if len(batch) >= self.batch_size:
-                            batch_imported = self._process_batch(batch)
-                            imported_count += batch_imported
-                            batch = []
+                            yield ParsedBatch(
+                                batch,
+                                batch_rows,
+                                pending_errors,
+                                row_count,
+                                lines.offset,
+                            )
+                            batch, batch_rows, pending_errors = [], [], []
 
                     except Exception as e:
-                        errors.append(f"Row {row_count}: {e}")
+                        pending_errors.append((row_count, str(e)))
                         continue
 
-                # Process remaining batch
-                if batch:
-                    batch_imported = self._process_batch(batch)
-                    imported_count += batch_imported
+                # Remaining batch
+                yield ParsedBatch(
+                    batch,
+                    batch_rows,
+                    pending_errors,
+                    row_count,
+                    lines.offset,
+                )
+            finally:
+                seen_ids.close()
 
-                self.session.commit()
-                success = imported_count > 0 or len(errors) == 0
-                return ImportResult(success, imported_count, errors)
+    def _flush_batch(
+        self,
+        batch: list[dict[str, Any]],
+        batch_rows: list[tuple[int, str | None]],
+        pending_errors: list[tuple[int, str]],
+        errors: ErrorSink,
+        *,
+        loader: BulkLoader | None = None,
+        changes: dict[str, int] | None = None,
+    ) -> int:
+        """Check references for a batch, report its errors and upsert (or stage) it
+
+        With ``changes`` (incremental mode), only rows that differ from the
+        database are written and the inserted/updated/unchanged rows counted.
+        """
+        reference_errors = check_references(self.session, self.references, batch)
+        for (row_number, transform_error), messages in zip(
+            batch_rows,
+            reference_errors,
+        ):
+            if transform_error:
+                messages.append(transform_error)
+            if messages:
+                pending_errors.append((row_number, "; ".join(messages)))
+
+        pending_errors.sort(key=lambda error: error[0])
+        errors.extend(
+            f"Row {row_number}: {error}" for row_number, error in pending_errors
+        )
 
-        except Exception as e:
-            self.session.rollback()
-            return ImportResult(False, 0, [f"Import failed: {e}"])
+        if changes is not None:
+            batch = self._changed_rows(batch, changes)
+        if not batch:
+            return 0
+        if loader is not None:
+            return loader.stage(batch)
+
+        self.before_batch(batch)
+        imported_count = self._process_batch(batch)
+        self.after_batch(batch)
+        return imported_count
+
+    def _changed_rows(
+        self,
+        batch: list[dict[str, Any]],
+        changes: dict[str, int],
+    ) -> list[dict[str, Any]]:
+        """Rows of the batch that are new or differ from the stored row"""
+        table = self.model_class.__table__
+        columns = list(batch[0])
+        ids = [row["id"] for row in batch if row.get("id") is not None]
+        stored = {
+            row.id: tuple(row)
+            for row in self.session.execute(
+                select(*[table.c[name] for name in columns]).where(
+                    table.c.id.in_(ids),
+                ),
+            )
+        }
+
+        changed = []
+        for row in batch:
+            current = stored.get(row.get("id"))
+            if current is None:
+                changes["inserted"] += 1
+            elif current != tuple(row[name] for name in columns):
+                changes["updated"] += 1
+            else:
+                changes["unchanged"] += 1
+                continue
+            changed.append(row)
+        return changed
+
+    @property
+    def manifest_name(self) -> str:
+        """Name the files imported by this importer are recorded under"""
+        return self.model_class.__tablename__
+
+    def checksum(self, file_path: str) -> str:
+        """Checksum of a file, computed once per importer"""
+        if file_path not in self._checksums:
+            self._checksums[file_path] = file_checksum(file_path)
+        return self._checksums[file_path]
+
+    def skip_unchanged(self, file_path: str) -> ImportResult | None:
+        """Result of skipping a file imported before with the same content, if it was"""
+        if not os.path.exists(file_path):
+            return None  # Reported when parsing
+
+        manifest = ImportManifest(self.session)
+        entry = manifest.find(self.manifest_name, file_path)
+        if entry is None or entry.checksum != self.checksum(file_path):
+            return None
+        return ImportResult(
+            True,
+            0,
+            [],
+            unchanged_count=entry.row_count,
+            skipped=True,
+        )
 
     def _process_batch(self, batch: list[dict[str, Any]]) -> int:
         """Process a batch of records using upsert"""
@@ -115,7 +507,7 @@ class BaseBatchImporter:
 
         try:
             # Use database-specific upsert for PostgreSQL and SQLite only
-            dialect_name = self.session.bind.dialect.name if self.session.bind else None
+            dialect_name = self._dialect_name()
 
             if dialect_name == "sqlite":
                 return self._upsert_sqlite(batch)
@@ -128,6 +520,12 @@ class BaseBatchImporter:
             # If batch fails, try simple upserts
             return self._upsert_simple(batch)
 
+    def _dialect_name(self) -> str | None:
+        """Name of the dialect the model's table is bound to"""
+        # Flask-SQLAlchemy sessions have no default bind, resolve it per mapper
+        bind = self.session.get_bind(mapper=self.model_class)
+        return bind.dialect.name if bind is not None else None
+
     def _upsert_sqlite(self, batch: list[dict[str, Any]]) -> int:
         """SQLite-specific upsert using INSERT OR REPLACE"""
         stmt = sqlite_insert(self.model_class.__table__)
@@ -136,7 +534,7 @@ class BaseBatchImporter:
             set_={
                 col.name: stmt.excluded[col.name]
                 for col in self.model_class.__table__.columns
-                if col.name != "id"
+                if col.name not in ("id", "created_at")
             },
         )
         self.session.execute(stmt, batch)
@@ -150,7 +548,7 @@ class BaseBatchImporter:
             set_={
                 col.name: stmt.excluded[col.name]
                 for col in self.model_class.__table__.columns
-                if col.name != "id"
+                if col.name not in ("id", "created_at")
             },
         )
         self.session.execute(stmt, batch)
@@ -195,3 +593,23 @@ class BaseBatchImporter:
     def validate_row(self, row: dict[str, Any]) -> str:
         """Validate transformed row, return error message if invalid"""
         return None  # Default: no validation errors
+
+    def transform_frame(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Vectorized transform_row and validate_row, for the pandas engine
+
+        ``frame`` holds a chunk of CSV rows as strings. Returns the model
+        columns plus ``_rejected``, the error rejecting a row (as raised by
+        transform_row or returned by validate_row), and ``_validation_error``,
+        the error reported for a row that is still imported.
+        """
+        raise NotImplementedError
+
+    # Optional hooks around the upsert of each batch
+    def before_batch(self, batch: list[dict[str, Any]]) -> None:
+        """Called with a validated batch right before it is upserted"""
+
+    def after_batch(self, batch: list[dict[str, Any]]) -> None:
+        """Called with a batch right after it was upserted"""
+
+    def after_bulk_load(self, staging: Table) -> None:
+        """Called in bulk mode once the staged rows were merged, instead of the batch hooks"""
@@ -2,16 +2,30 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
+import pandas as pd
+
 from app.models.bill import Bill
 from app.models.legislator import Legislator
 
 from .base_batch_importer import BaseBatchImporter
+from .reference import Reference
+from .vectorized import (
+    REJECTED,
+    VALIDATION_ERROR,
+    first_error,
+    int_column,
+    optional_int_column,
+)
 
 if TYPE_CHECKING:
     from sqlalchemy.orm import Session
 
 
 class BillImporter(BaseBatchImporter):
+    # Note: We don't prevent import for invalid sponsor_id, just log it
+    # The test expects bills to be imported even with invalid sponsor_id
+    references = [Reference("sponsor_id", Legislator, label="Sponsor")]
+
     def __init__(self, session: Session, batch_size: int = 1000) -> None:
         super().__init__(session, Bill, batch_size)
 
@@ -35,34 +49,23 @@ class BillImporter(BaseBatchImporter):
         """Validate transformed row, return error message if invalid"""
         if not row.get("title"):
             return "Title cannot be empty"
-
-        # Note: We don't prevent import for invalid sponsor_id, just log it
-        # The test expects bills to be imported even with invalid sponsor_id
         return None
 
-    def transform_row(self, row: dict[str, str]) -> dict[str, Any]:
-        """Transform CSV row to model format"""
-        sponsor_id = None
-        if row.get("sponsor_id") and row["sponsor_id"].strip():
-            sponsor_id = int(row["sponsor_id"])
-
-        # Check sponsor_id validity and collect error for reporting
-        sponsor_error = None
-        if sponsor_id:
-            sponsor_exists = (
-                self.session.query(Legislator).filter_by(id=sponsor_id).first()
-            )
-            if not sponsor_exists:
-                sponsor_error = f"Sponsor with ID {sponsor_id} does not exist"
-
-        transformed = {
-            "id": int(row["id"]),
-            "title": row["title"].strip(),
-            "sponsor_id": sponsor_id,
-        }
-
-        # Store validation error for later reporting
-        if sponsor_error:
-            transformed["_validation_error"] = sponsor_error
-
-        return transformed
+    def transform_frame(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Transform and validate a chunk of CSV rows at once"""
+        sponsor_ids, sponsor_errors = optional_int_column(frame["sponsor_id"])
+        ids, id_errors = int_column(frame["id"])
+        errors = first_error(sponsor_errors, id_errors)
+        titles = frame["title"].str.strip()
+        return pd.DataFrame(
+            {
+                "id": ids,
+                "title": titles,
+                "sponsor_id": sponsor_ids,
+                REJECTED: errors.mask(
+                    errors.isna() & (titles == ""),
+                    "Title cannot be empty",
+                ),
+                VALIDATION_ERROR: pd.NA,
+            },
+        )
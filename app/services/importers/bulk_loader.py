@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import csv
+from io import StringIO
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import Column, MetaData, Table, event, select, true
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
+
+    from .base_batch_importer import BaseBatchImporter
+
+# NULL marker of the CSV fed to COPY, so that empty strings stay strings
+COPY_NULL = r"\N"
+
+
+class BulkLoader:
+    """Loads the batches of one file into a staging table, then merges it
+
+    Batches go into a temporary table with the cheapest insert path of the
+    dialect (``COPY FROM STDIN`` on PostgreSQL, ``executemany`` on SQLite) and
+    the target table is updated by a single ``INSERT ... SELECT ... ON
+    CONFLICT`` at the end, instead of one upsert statement per batch.
+    """
+
+    # Applied on SQLite for the duration of the load, then restored. Durability
+    # (synchronous) is left to the engine profile, see app.lib.engine
+    SQLITE_LOAD_PRAGMAS = {
+        "temp_store": "MEMORY",
+        "cache_size": "-65536",  # KiB, i.e. 64 MiB
+    }
+
+    def __init__(self, importer: BaseBatchImporter) -> None:
+        self.importer = importer
+        self.table = importer.model_class.__table__
+        self.staging: Table | None = None
+        self._saved_pragmas: dict[str, Any] = {}
+        self._tuned: Any = None  # DBAPI connection holding the load pragmas
+
+    @property
+    def connection(self) -> Connection:
+        return self.importer.session.connection(
+            bind_arguments={"mapper": self.importer.model_class},
+        )
+
+    @property
+    def dialect_name(self) -> str:
+        return self.connection.dialect.name
+
+    def begin(self) -> None:
+        """Tune the database for loading, before any write of the import
+
+        SQLite refuses to change ``temp_store`` inside a transaction, so the
+        load runs with the engine settings when the session has pending writes:
+        committing them here would end the caller's transaction behind its back.
+        """
+        if self.dialect_name != "sqlite":
+            return
+
+        connection = self.connection
+        if connection.connection.dbapi_connection.in_transaction:
+            return
+        for name, value in self.SQLITE_LOAD_PRAGMAS.items():
+            self._saved_pragmas[name] = connection.exec_driver_sql(
+                f"PRAGMA {name}",
+            ).scalar()
+            connection.exec_driver_sql(f"PRAGMA {name} = {value}")
+        # Pragmas are per connection: restore them when this one is returned
+        # to the pool, rather than on whichever connection ``end`` checks out
+        self._tuned = connection.connection.dbapi_connection
+        event.listen(connection.engine, "checkin", self._restore)
+
+    def end(self) -> None:
+        """Restore the settings changed by ``begin``, after the commit"""
+        if not self._saved_pragmas:
+            return
+        connection = self.connection
+        event.remove(connection.engine, "checkin", self._restore)
+        # Not returned yet when the import left its transaction open
+        self._restore(connection.connection.dbapi_connection, None)
+        self._saved_pragmas = {}
+
+    def _restore(self, dbapi_connection: Any, _record: Any) -> None:
+        if dbapi_connection is not self._tuned:
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in self._saved_pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+        self._tuned = None
+
+    def stage(self, batch: list[dict[str, Any]]) -> int:
+        """Append validated rows to the staging table"""
+        if not batch:
+            return 0
+        if self.staging is None:
+            self.staging = self._create_staging(list(batch[0]))
+
+        if self.dialect_name == "postgresql":
+            self._copy(batch)
+        else:
+            self.connection.execute(self.staging.insert(), batch)
+        return len(batch)
+
+    def merge(self) -> None:
+        """Upsert the staged rows into the target table and drop the staging table"""
+        if self.staging is None:
+            return
+
+        columns = [column.name for column in self.staging.columns]
+        insert = (
+            postgresql_insert if self.dialect_name == "postgresql" else sqlite_insert
+        )
+        # WHERE true: SQLite cannot parse ON CONFLICT right after a bare SELECT
+        statement = insert(self.table).from_select(
+            columns,
+            select(*self.staging.columns).where(true()),
+        )
+        updated = [
+            column.name
+            for column in self.table.columns
+            if column.name not in ("id", "created_at")
+            and (column.name in columns or column.name == "updated_at")
+        ]
+        statement = statement.on_conflict_do_update(
+            index_elements=["id"],
+            set_={name: statement.excluded[name] for name in updated},
+        )
+        self.connection.execute(statement)
+
+    def drop(self) -> None:
+        if self.staging is not None:
+            self.staging.drop(self.connection, checkfirst=True)
+            self.staging = None
+
+    def _create_staging(self, columns: list[str]) -> Table:
+        """Temporary table with the imported columns of the target, no constraints"""
+        staging = Table(
+            f"staging_{self.table.name}",
+            MetaData(),
+            *[Column(name, self.table.c[name].type) for name in columns],
+            prefixes=["TEMPORARY"],
+        )
+        staging.drop(self.connection, checkfirst=True)
+        staging.create(self.connection)
+        return staging
+
+    def _copy(self, batch: list[dict[str, Any]]) -> None:
+        """Stream a batch into the staging table with COPY FROM STDIN"""
+        columns = [column.name for column in self.staging.columns]
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        for row in batch:
+            writer.writerow(
+                [COPY_NULL if row[name] is None else row[name] for name in columns],
+            )
+
+        sql = (
+            f"COPY {self.staging.name} ({', '.join(columns)}) "
+            f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+        )
+        cursor = self.connection.connection.dbapi_connection.cursor()
+        try:
+            if hasattr(cursor, "copy_expert"):  # psycopg2
+                buffer.seek(0)
+                cursor.copy_expert(sql, buffer)
+            else:  # psycopg 3
+                with cursor.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+        finally:
+            cursor.close()
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, TextIO
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+class ErrorSink:
+    """Collects the errors of an import within a fixed memory budget
+
+    Every error is counted and, with ``log_path``, written to that file as it
+    is reported; only the first ``max_errors`` are kept in memory as a sample
+    for ``ImportResult.errors``. With ``append``, the log keeps the errors of
+    an earlier run, e.g. those of the rows before a resumed import's checkpoint.
+    """
+
+    def __init__(
+        self,
+        max_errors: int = 1000,
+        log_path: str | None = None,
+        *,
+        append: bool = False,
+    ) -> None:
+        self.max_errors = max_errors
+        self.log_path = log_path
+        self.append = append
+        self.count = 0
+        self.sample: list[str] = []
+        self._log: TextIO | None = None
+
+    def add(self, message: str) -> None:
+        self.count += 1
+        if len(self.sample) < self.max_errors:
+            self.sample.append(message)
+        if self.log_path is not None:
+            if self._log is None:
+                self._log = open(  # noqa: SIM115
+                    self.log_path,
+                    "a" if self.append else "w",
+                    encoding="utf-8",
+                )
+            self._log.write(message + "\n")
+
+    def extend(self, messages: Iterable[str]) -> None:
+        for message in messages:
+            self.add(message)
+
+    def close(self) -> None:
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def __len__(self) -> int:
+        return self.count
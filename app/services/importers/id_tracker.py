@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import sqlite3
+from array import array
+from bisect import bisect_left
+from heapq import merge
+from typing import Any
+
+# Bytes per id held in the sorted runs
+ID_SIZE = array("q").itemsize
+
+
+def _contains(run: array, value: int) -> bool:
+    index = bisect_left(run, value)
+    return index < len(run) and run[index] == value
+
+
+class IdTracker:
+    """Set of the ids seen in a file, within a memory budget
+
+    New ids are collected in a small set, which is sorted into a compact
+    ``array`` run of 8 bytes per id once full; runs of similar size are merged
+    so that there are only ever a logarithmic number of them to binary-search.
+    Past ``memory_limit`` bytes, every id moves to a temporary on-disk SQLite
+    table and lookups go through its primary key.
+    """
+
+    BUFFER_SIZE = 4096
+
+    def __init__(self, memory_limit: int = 64 * 1024 * 1024) -> None:
+        self.max_ids = max(memory_limit // ID_SIZE, self.BUFFER_SIZE)
+        self.count = 0
+        self._buffer: set[int] = set()
+        self._runs: list[array] = []
+        # Ids that don't fit in an int64 array, e.g. None
+        self._others: set[Any] = set()
+        self._spill: sqlite3.Connection | None = None
+
+    @property
+    def spilled(self) -> bool:
+        return self._spill is not None
+
+    def add(self, value: Any) -> bool:
+        """Add an id, False if it was already seen"""
+        if not isinstance(value, int) or not -(2**63) <= value < 2**63:
+            if value in self._others:
+                return False
+            self._others.add(value)
+            return True
+
+        if self._spill is not None:
+            cursor = self._spill.execute(
+                "INSERT OR IGNORE INTO ids (id) VALUES (?)",
+                (value,),
+            )
+            self.count += cursor.rowcount
+            return cursor.rowcount == 1
+
+        if value in self._buffer or any(_contains(run, value) for run in self._runs):
+            return False
+
+        self._buffer.add(value)
+        self.count += 1
+        if len(self._buffer) >= self.BUFFER_SIZE:
+            self._flush_buffer()
+        if self.count > self.max_ids:
+            self._spill_to_disk()
+        return True
+
+    def close(self) -> None:
+        """Free the memory and the temporary table"""
+        self._buffer = set()
+        self._runs = []
+        self._others = set()
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+    def _flush_buffer(self) -> None:
+        self._runs.append(array("q", sorted(self._buffer)))
+        self._buffer = set()
+        # Keep run sizes decreasing geometrically, like a binary counter
+        while len(self._runs) > 1 and len(self._runs[-2]) <= 2 * len(self._runs[-1]):
+            last = self._runs.pop()
+            self._runs[-1] = array("q", merge(self._runs[-1], last))
+
+    def _spill_to_disk(self) -> None:
+        # An empty filename is a private temporary database, deleted on close
+        self._spill = sqlite3.connect("", check_same_thread=False)
+        self._spill.execute("PRAGMA journal_mode = OFF")
+        self._spill.execute("PRAGMA synchronous = OFF")
+        self._spill.execute("CREATE TABLE ids (id INTEGER PRIMARY KEY)")
+        for ids in (*self._runs, sorted(self._buffer)):
+            self._spill.executemany(
+                "INSERT INTO ids (id) VALUES (?)",
+                ((value,) for value in ids),
+            )
+        self._buffer = set()
+        self._runs = []
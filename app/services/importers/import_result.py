@@ -4,10 +4,31 @@ from __future__ import annotations
 class ImportResult:
     """Standard result object for import operations"""
 
-    def __init__(self, success: bool, imported_count: int, errors: list[str]) -> None:
+    def __init__(
+        self,
+        success: bool,
+        imported_count: int,
+        errors: list[str],
+        *,
+        error_count: int | None = None,
+        error_log: str | None = None,
+        inserted_count: int = 0,
+        updated_count: int = 0,
+        unchanged_count: int = 0,
+        skipped: bool = False,
+    ) -> None:
         self.success = success
         self.imported_count = imported_count
+        # A sample of the errors when there are many, see error_count/error_log
         self.errors = errors
+        self.error_count = len(errors) if error_count is None else error_count
+        self.error_log = error_log
+        # Only known for incremental imports, see BaseBatchImporter.import_batches
+        self.inserted_count = inserted_count
+        self.updated_count = updated_count
+        self.unchanged_count = unchanged_count
+        # The file was unchanged since its last import and was not read
+        self.skipped = skipped
 
     def __repr__(self) -> str:
-        return f"ImportResult(success={self.success}, imported_count={self.imported_count}, errors={len(self.errors)})"
+        return f"ImportResult(success={self.success}, imported_count={self.imported_count}, errors={self.error_count})"
@@ -2,9 +2,12 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
+import pandas as pd
+
 from app.models.legislator import Legislator
 
 from .base_batch_importer import BaseBatchImporter
+from .vectorized import REJECTED, VALIDATION_ERROR, int_column
 
 if TYPE_CHECKING:
     from sqlalchemy.orm import Session
@@ -27,3 +30,19 @@ class LegislatorImporter(BaseBatchImporter):
         if not row.get("name"):
             return "Name cannot be empty"
         return None
+
+    def transform_frame(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Transform and validate a chunk of CSV rows at once"""
+        ids, errors = int_column(frame["id"])
+        names = frame["name"].str.strip()
+        return pd.DataFrame(
+            {
+                "id": ids,
+                "name": names,
+                REJECTED: errors.mask(
+                    errors.isna() & (names == ""),
+                    "Name cannot be empty",
+                ),
+                VALIDATION_ERROR: pd.NA,
+            },
+        )
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import TYPE_CHECKING
+
+from sqlalchemy import select
+
+from app.models.import_checkpoint import ImportCheckpoint
+from app.models.import_file import ImportFile
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+# Bytes hashed per read when checksumming a file
+CHUNK_SIZE = 1024 * 1024
+
+
+def file_checksum(file_path: str) -> str:
+    """SHA-256 of a file's content, as hex"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ImportManifest:
+    """Checksums of the files last imported by each importer
+
+    Backed by the ``import_files`` table, so that incremental imports can skip
+    files that did not change since their last successful import, and by the
+    ``import_checkpoints`` table, so that interrupted imports can resume.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    def find(self, importer: str, file_path: str) -> ImportFile | None:
+        return self.session.scalar(
+            select(ImportFile).where(
+                ImportFile.importer == importer,
+                ImportFile.file_path == os.path.abspath(file_path),
+            ),
+        )
+
+    def record(
+        self,
+        importer: str,
+        file_path: str,
+        checksum: str,
+        row_count: int,
+    ) -> ImportFile:
+        """Remember a successful import, committed with the imported rows"""
+        entry = self.find(importer, file_path)
+        if entry is None:
+            entry = ImportFile(importer=importer, file_path=os.path.abspath(file_path))
+            self.session.add(entry)
+        entry.checksum = checksum
+        entry.row_count = row_count
+        return entry
+
+    def checkpoint(self, importer: str, file_path: str) -> ImportCheckpoint | None:
+        return self.session.scalar(
+            select(ImportCheckpoint).where(
+                ImportCheckpoint.importer == importer,
+                ImportCheckpoint.file_path == os.path.abspath(file_path),
+            ),
+        )
+
+    def save_checkpoint(
+        self,
+        importer: str,
+        file_path: str,
+        checksum: str,
+        *,
+        row_number: int,
+        file_offset: int,
+    ) -> ImportCheckpoint:
+        """Record the position of a batch, committed with the batch"""
+        entry = self.checkpoint(importer, file_path)
+        if entry is None:
+            entry = ImportCheckpoint(
+                importer=importer,
+                file_path=os.path.abspath(file_path),
+            )
+            self.session.add(entry)
+        entry.checksum = checksum
+        entry.row_number = row_number
+        entry.file_offset = file_offset
+        return entry
+
+    def clear_checkpoint(self, importer: str, file_path: str) -> None:
+        entry = self.checkpoint(importer, file_path)
+        if entry is not None:
+            self.session.delete(entry)
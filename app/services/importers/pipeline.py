@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from queue import Full, Queue
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from .base_batch_importer import BaseBatchImporter, ParsedBatch, ResumePoint
+    from .import_result import ImportResult
+
+# Marks the end of a file in its queue
+_DONE = object()
+
+
+class ImportPipeline:
+    """Import several CSV files, parsing ahead of the database writes
+
+    Files are written strictly one after the other, in the given order, by the
+    calling thread (so foreign keys of a file are checked against the rows of
+    the files before it). Meanwhile a pool of workers reads, transforms and
+    validates the files into bounded queues, so parsing ``vote_results.csv``
+    overlaps with writing votes.
+    """
+
+    # Parsed batches buffered per file before its worker blocks
+    QUEUE_SIZE = 4
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        queue_size: int | None = None,
+        mode: str = "upsert",
+        *,
+        commit_every: int | None = None,
+        resume: bool = False,
+    ) -> None:
+        self.workers = workers
+        self.queue_size = queue_size or self.QUEUE_SIZE
+        # Write mode and checkpointing of every file, as in import_batches
+        self.mode = mode
+        self.commit_every = commit_every
+        # Start each file at the checkpoint of its interrupted import, if any
+        self.resume = resume
+        self._stop = threading.Event()
+
+    def run(
+        self,
+        jobs: list[tuple[BaseBatchImporter, str]],
+    ) -> Iterator[ImportResult]:
+        """Import each ``(importer, file_path)`` job, yielding results in order"""
+        if not jobs:
+            return
+
+        workers = self.workers or min(len(jobs), os.cpu_count() or 1)
+        queues = [Queue(maxsize=self.queue_size) for _ in jobs]
+        self._stop.clear()
+
+        executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="import-parser",
+        )
+        futures = []
+        starts: list[ResumePoint | None] = []
+        try:
+            for (importer, file_path), queue in zip(jobs, queues):
+                if self.mode == "incremental" and importer.skip_unchanged(file_path):
+                    queue.put(_DONE)  # Unchanged since its last import, not parsed
+                    starts.append(None)
+                    continue
+                start = importer.resume_point(file_path) if self.resume else None
+                starts.append(start)
+                futures.append(
+                    executor.submit(self._parse, importer, file_path, queue, start),
+                )
+
+            for (importer, file_path), queue, start in zip(jobs, queues, starts):
+                yield importer.import_batches(
+                    self._batches(queue),
+                    self.mode,
+                    file_path,
+                    commit_every=self.commit_every,
+                    resumed=start is not None,
+                )
+                # Unblock the worker if the writer gave up before the end
+                self._discard(queue)
+        finally:
+            self._stop.set()
+            # Workers not started yet never run, shutdown(cancel_futures=) is 3.9+
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def _parse(
+        self,
+        importer: BaseBatchImporter,
+        file_path: str,
+        queue: Queue,
+        start: ResumePoint | None = None,
+    ) -> None:
+        """Worker: parse a file into its queue, ending with ``_DONE``"""
+        try:
+            for parsed in importer.parse_file(file_path, start):
+                if not self._put(queue, parsed):
+                    return
+        except Exception as e:  # Re-raised by the writer
+            self._put(queue, e)
+        self._put(queue, _DONE)
+
+    def _put(self, queue: Queue, item: object) -> bool:
+        """Put an item unless the pipeline is stopped, False if it was"""
+        while not self._stop.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+            except Full:
+                continue
+            return True
+        return False
+
+    @staticmethod
+    def _batches(queue: Queue) -> Iterator[ParsedBatch]:
+        """Writer side: the parsed batches of one file"""
+        while (item := queue.get()) is not _DONE:
+            if isinstance(item, Exception):
+                raise item
+            yield item
+        queue.put(_DONE)  # Lets _discard know the file is finished
+
+    @staticmethod
+    def _discard(queue: Queue) -> None:
+        """Drain a queue up to the end of its file"""
+        while queue.get() is not _DONE:
+            pass
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import literal, select, union_all
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import Session
+
+
+class Reference:
+    """Declares that an imported column must point at an existing row
+
+    Example: ``Reference("vote_id", Vote)`` reads as "vote_id references votes.id".
+    """
+
+    def __init__(self, column: str, model: type, label: str | None = None) -> None:
+        self.column = column
+        self.model = model
+        self.label = label or model.__name__
+
+    def error_message(self, value: Any) -> str:
+        return f"{self.label} with ID {value} does not exist"
+
+    def __repr__(self) -> str:
+        return f"Reference({self.column} -> {self.model.__tablename__}.id)"
+
+
+def check_references(
+    session: Session,
+    references: list[Reference],
+    batch: list[dict[str, Any]],
+) -> list[list[str]]:
+    """Validate every reference of a batch with a single query
+
+    Returns one list of error messages per row, in the order of the references.
+    """
+    messages: list[list[str]] = [[] for _ in batch]
+    if not references or not batch:
+        return messages
+
+    # One SELECT ... WHERE id IN (...) per referenced column, glued together
+    # with UNION ALL so the whole batch costs a single round trip.
+    lookups = []
+    for position, reference in enumerate(references):
+        values = {row[reference.column] for row in batch if row.get(reference.column)}
+        if not values:
+            continue
+        target = reference.model.__table__.c.id
+        lookups.append(
+            select(literal(position).label("position"), target.label("id")).where(
+                target.in_(values),
+            ),
+        )
+
+    if not lookups:
+        return messages
+
+    statement = lookups[0] if len(lookups) == 1 else union_all(*lookups)
+    existing: list[set[Any]] = [set() for _ in references]
+    for position, value in session.execute(statement):
+        existing[position].add(value)
+
+    for row, row_messages in zip(batch, messages):
+        for position, reference in enumerate(references):
+            value = row.get(reference.column)
+            if value and value not in existing[position]:
+                row_messages.append(reference.error_message(value))
+
+    return messages
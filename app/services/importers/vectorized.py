@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+from .id_tracker import IdTracker
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from .base_batch_importer import BaseBatchImporter, ParsedBatch, ResumePoint
+
+# What int() accepts, leaving aside underscores
+INTEGER = r"\s*[+-]?\d+\s*"
+
+# Columns of a transformed frame that are not model columns
+REJECTED = "_rejected"
+VALIDATION_ERROR = "_validation_error"
+
+
+def int_column(values: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """``int()`` of a string column: nullable integers and the error of each
+    value ``int()`` would reject, worded like ``int()``'s ``ValueError``"""
+    valid = values.str.fullmatch(INTEGER)
+    numbers = pd.to_numeric(values.where(valid), errors="coerce").astype("Int64")
+    errors = pd.Series(pd.NA, index=values.index, dtype=object)
+    errors[~valid] = "invalid literal for int() with base 10: " + values[~valid].map(
+        repr,
+    )
+    return numbers, errors
+
+
+def optional_int_column(values: pd.Series) -> tuple[pd.Series, pd.Series]:
+    """Like ``int_column``, blank values being NULL instead of errors"""
+    blank = values.str.strip() == ""
+    numbers, errors = int_column(values.mask(blank, "0"))
+    return numbers.mask(blank), errors.mask(blank)
+
+
+def first_error(*errors: pd.Series) -> pd.Series:
+    """First error of each row among several error columns, in order"""
+    result = errors[0]
+    for other in errors[1:]:
+        result = result.fillna(other)
+    return result
+
+
+def parse_frames(
+    importer: BaseBatchImporter,
+    file_path: str,
+    start: ResumePoint | None = None,
+) -> Iterator[ParsedBatch]:
+    """``parse_file`` for the pandas engine
+
+    The file is read in chunks of ``batch_size`` rows of strings, which the
+    importer's ``transform_frame`` converts and validates column by column.
+    Byte offsets are not known, so batches are positioned by row number only.
+    """
+    from .base_batch_importer import ImportFileError, ParsedBatch
+
+    columns = pd.read_csv(file_path, nrows=0, encoding="utf-8").columns
+    required_headers = importer.get_required_headers()
+    if not all(header in columns for header in required_headers):
+        missing = [h for h in required_headers if h not in columns]
+        msg = f"Missing required headers: {missing}"
+        raise ImportFileError(msg)
+
+    row_count = start.row_number if start is not None else 0
+    chunks = pd.read_csv(
+        file_path,
+        dtype=str,
+        keep_default_na=False,
+        encoding="utf-8",
+        chunksize=importer.batch_size,
+        skiprows=range(1, row_count + 1) if row_count else None,
+    )
+    # Track IDs to detect duplicates within the file
+    seen_ids = IdTracker(importer.id_memory_limit)
+    parsed = None
+    try:
+        for chunk in chunks:
+            chunk.index = pd.RangeIndex(row_count + 1, row_count + len(chunk) + 1)
+            row_count += len(chunk)
+            frame = importer.transform_frame(chunk.fillna(""))
+            parsed = ParsedBatch(*_split(frame, seen_ids), row_count, 0)
+            yield parsed
+    finally:
+        seen_ids.close()
+
+    if parsed is None:  # Always end with a batch, even for an empty file
+        yield ParsedBatch([], [], [], row_count, 0)
+
+
+def _split(
+    frame: pd.DataFrame,
+    seen_ids: IdTracker,
+) -> tuple[list[dict], list[tuple[int, str | None]], list[tuple[int, str]]]:
+    """Rows to write, their (row number, transform error) and rejected rows"""
+    rejected = frame.pop(REJECTED)
+    warnings = frame.pop(VALIDATION_ERROR)
+    is_rejected = rejected.notna()
+
+    # Reported like the row-by-row engine: transform error first, then rejection
+    pending_errors = [
+        (int(row_number), warning)
+        for row_number, warning in warnings[is_rejected].dropna().items()
+    ]
+    pending_errors.extend(
+        (int(row_number), error) for row_number, error in rejected[is_rejected].items()
+    )
+
+    kept = frame[~is_rejected]
+    rows = kept.astype(object).where(kept.notna(), None).to_dict("records")
+    batch, batch_rows = [], []
+    for row_number, row, warning in zip(
+        kept.index.tolist(),
+        rows,
+        warnings[~is_rejected],
+    ):
+        transform_error = None if pd.isna(warning) else warning
+        if not seen_ids.add(row["id"]):
+            if transform_error:
+                pending_errors.append((row_number, transform_error))
+            pending_errors.append(
+                (row_number, f"Duplicate ID {row['id']} found in file"),
+            )
+            continue
+        batch.append(row)
+        batch_rows.append((row_number, transform_error))
+    return batch, batch_rows, pending_errors
@@ -2,16 +2,33 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
+import pandas as pd
+from sqlalchemy import select
+
 from app.models.bill import Bill
 from app.models.vote import Vote
+from app.services.stats.vote_tallies import VoteTallies
 
 from .base_batch_importer import BaseBatchImporter
+from .reference import Reference
+from .vectorized import (
+    REJECTED,
+    VALIDATION_ERROR,
+    first_error,
+    int_column,
+    optional_int_column,
+)
 
 if TYPE_CHECKING:
+    from sqlalchemy import Table
     from sqlalchemy.orm import Session
 
 
 class VoteImporter(BaseBatchImporter):
+    # Note: We don't prevent import for invalid bill_id, just log it
+    # The test expects votes to be imported even with invalid bill_id
+    references = [Reference("bill_id", Bill)]
+
     def __init__(self, session: Session, batch_size: int = 1000) -> None:
         super().__init__(session, Vote, batch_size)
 
@@ -25,23 +42,26 @@ class VoteImporter(BaseBatchImporter):
         if row.get("bill_id") and row["bill_id"].strip():
             bill_id = int(row["bill_id"])
 
-        # Check bill_id validity and collect error for reporting
-        bill_error = None
-        if bill_id:
-            bill_exists = self.session.query(Bill).filter_by(id=bill_id).first()
-            if not bill_exists:
-                bill_error = f"Bill with ID {bill_id} does not exist"
-
-        transformed = {"id": int(row["id"]), "bill_id": bill_id}
+        return {"id": int(row["id"]), "bill_id": bill_id}
 
-        # Store validation error for later reporting
-        if bill_error:
-            transformed["_validation_error"] = bill_error
+    def transform_frame(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Transform a chunk of CSV rows at once"""
+        bill_ids, bill_errors = optional_int_column(frame["bill_id"])
+        ids, id_errors = int_column(frame["id"])
+        return pd.DataFrame(
+            {
+                "id": ids,
+                "bill_id": bill_ids,
+                REJECTED: first_error(bill_errors, id_errors),
+                VALIDATION_ERROR: pd.NA,
+            },
+        )
 
-        return transformed
+    def after_batch(self, batch: list[dict[str, Any]]) -> None:
+        """Keep the bill of existing vote tallies in sync"""
+        VoteTallies(self.session).refresh_bills(row["id"] for row in batch)
 
-    def validate_row(self, row: dict[str, Any]) -> str:
-        """Validate transformed row, return error message if invalid"""
-        # Note: We don't prevent import for invalid bill_id, just log it
-        # The test expects votes to be imported even with invalid bill_id
-        return None
+    def after_bulk_load(self, staging: Table) -> None:
+        """Keep the bill of existing vote tallies in sync with the loaded votes"""
+        vote_ids = self.session.scalars(select(staging.c.id))
+        VoteTallies(self.session).refresh_bills(vote_ids)
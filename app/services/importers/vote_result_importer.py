@@ -2,20 +2,39 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
+import pandas as pd
+from sqlalchemy import select
+
 from app.constants.vote_type import VoteType
 from app.models.legislator import Legislator
 from app.models.vote import Vote
 from app.models.vote_result import VoteResult
+from app.services.stats.vote_tallies import VoteTallies
 
 from .base_batch_importer import BaseBatchImporter
+from .reference import Reference
+from .vectorized import (
+    REJECTED,
+    VALIDATION_ERROR,
+    first_error,
+    int_column,
+    optional_int_column,
+)
 
 if TYPE_CHECKING:
+    from sqlalchemy import Table
     from sqlalchemy.orm import Session
 
 
 class VoteResultImporter(BaseBatchImporter):
+    # Note: We don't prevent import for invalid foreign keys, just log them
+    # The test expects vote results to be imported even with invalid foreign keys
+    references = [Reference("vote_id", Vote), Reference("legislator_id", Legislator)]
+
     def __init__(self, session: Session, batch_size: int = 1000) -> None:
         super().__init__(session, VoteResult, batch_size)
+        self.tallies = VoteTallies(session)
+        self._touched_vote_ids: set[int] = set()
 
     def get_required_headers(self) -> list[str]:
         """Return list of required CSV headers"""
@@ -27,28 +46,16 @@ class VoteResultImporter(BaseBatchImporter):
         legislator_id = int(row["legislator_id"])
         vote_type = int(row.get("vote_type", 0))
 
-        # Check foreign key validity and collect errors for reporting
+        # Foreign keys are checked per batch, see `references`
         errors = []
 
-        # Validate vote_id exists
-        if vote_id:
-            vote_exists = self.session.query(Vote).filter_by(id=vote_id).first()
-            if not vote_exists:
-                errors.append(f"Vote with ID {vote_id} does not exist")
-
-        # Validate legislator_id exists
-        if legislator_id:
-            legislator_exists = (
-                self.session.query(Legislator).filter_by(id=legislator_id).first()
-            )
-            if not legislator_exists:
-                errors.append(f"Legislator with ID {legislator_id} does not exist")
-
-        # Validate vote_type is valid
+        # Validate vote_type is valid, invalid values are stored as NULL
+        # just like the VoteResult.vote_type setter does
         if vote_type is not None and vote_type not in [VoteType.YEA, VoteType.NAY]:
             errors.append(
                 f"Invalid vote_type: {vote_type}. Valid values are {VoteType.YEA} (Yea) or {VoteType.NAY} (Nay)",
             )
+            vote_type = None
 
         transformed = {
             "id": int(row["id"]) if row.get("id") else None,
@@ -63,11 +70,55 @@ class VoteResultImporter(BaseBatchImporter):
 
         return transformed
 
-    def validate_row(self, row: dict[str, Any]) -> str:
-        """Validate transformed row, return error message if invalid"""
-        # Note: We don't prevent import for invalid foreign keys, just log them
-        # The test expects vote results to be imported even with invalid foreign keys
-        return None
+    def transform_frame(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Transform a chunk of CSV rows at once, like transform_row"""
+        vote_ids, vote_errors = int_column(frame["vote_id"])
+        legislator_ids, legislator_errors = int_column(frame["legislator_id"])
+        vote_types, vote_type_errors = int_column(frame["vote_type"])
+        ids, id_errors = optional_int_column(frame["id"])
+        errors = first_error(
+            vote_errors,
+            legislator_errors,
+            vote_type_errors,
+            id_errors,
+        )
+
+        # Invalid vote types are stored as NULL and reported, not rejected
+        invalid = ~vote_types.isin([VoteType.YEA, VoteType.NAY]) & vote_types.notna()
+        warnings = pd.Series(pd.NA, index=frame.index, dtype=object)
+        warnings[invalid & errors.isna()] = (
+            "Invalid vote_type: "
+            + vote_types[invalid].astype(str)
+            + f". Valid values are {VoteType.YEA} (Yea) or {VoteType.NAY} (Nay)"
+        )
+        return pd.DataFrame(
+            {
+                "id": ids,
+                "vote_id": vote_ids,
+                "legislator_id": legislator_ids,
+                "vote_type": vote_types.mask(invalid),
+                REJECTED: errors,
+                VALIDATION_ERROR: warnings,
+            },
+        )
+
+    def before_batch(self, batch: list[dict[str, Any]]) -> None:
+        """Remember the votes the batch's results currently belong to"""
+        ids = [row["id"] for row in batch if row.get("id") is not None]
+        previous = select(VoteResult.vote_id).where(VoteResult.id.in_(ids)).distinct()
+        self._touched_vote_ids = {
+            vote_id for (vote_id,) in self.session.execute(previous)
+        }
+
+    def after_batch(self, batch: list[dict[str, Any]]) -> None:
+        """Incrementally rebuild the tallies of every vote touched by the batch"""
+        self._touched_vote_ids.update(row["vote_id"] for row in batch)
+        self.tallies.refresh(self._touched_vote_ids)
+        self._touched_vote_ids = set()
+
+    def after_bulk_load(self, staging: Table) -> None:
+        """Bulk loads are full refreshes, rebuild every tally at once"""
+        self.tallies.rebuild()
 
     def _process_batch(self, batch: list[dict[str, Any]]) -> int:
         """Override to use standard ID-based upsert like other models"""
@@ -76,7 +127,7 @@ class VoteResultImporter(BaseBatchImporter):
 
         try:
             # Use database-specific upsert for PostgreSQL and SQLite only
-            dialect_name = self.session.bind.dialect.name if self.session.bind else None
+            dialect_name = self._dialect_name()
 
             if dialect_name == "sqlite":
                 return self._upsert_sqlite(batch)
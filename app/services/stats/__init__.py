@@ -0,0 +1,4 @@
+from .legislator_stats import LegislatorStats
+from .vote_tallies import VoteTallies
+
+__all__ = ["LegislatorStats", "VoteTallies"]
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import func, select
+
+from app import db
+from app.models.bill import Bill
+from app.models.legislator import Legislator
+from app.models.vote_result import NAY_COUNT, YEA_COUNT, VoteResult
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from sqlalchemy import Select
+
+
+class LegislatorStats:
+    """Sponsored/supported/opposed counts of a legislator
+
+    Counts are computed in the database with GROUP BY over ``bills`` and
+    ``vote_results`` for many legislators at once, instead of loading every
+    relationship of every legislator.
+    """
+
+    def __init__(
+        self,
+        legislator_id: int,
+        sponsored_bills_count: int = 0,
+        supported_bills_count: int = 0,
+        opposed_bills_count: int = 0,
+    ) -> None:
+        self.legislator_id = legislator_id
+        self.sponsored_bills_count = sponsored_bills_count
+        self.supported_bills_count = supported_bills_count
+        self.opposed_bills_count = opposed_bills_count
+
+    @staticmethod
+    def _aggregates(legislator_ids: list[int] | None = None) -> tuple[Any, Any]:
+        """Per-legislator GROUP BY subqueries over bills and vote_results"""
+        sponsored = select(
+            Bill.sponsor_id.label("legislator_id"),
+            func.count(Bill.id).label("sponsored"),
+        ).group_by(Bill.sponsor_id)
+
+        votes = select(
+            VoteResult.legislator_id.label("legislator_id"),
+            YEA_COUNT.label("supported"),
+            NAY_COUNT.label("opposed"),
+        ).group_by(VoteResult.legislator_id)
+
+        # Restrict the aggregation itself, not just the outer rows
+        if legislator_ids is not None:
+            sponsored = sponsored.where(Bill.sponsor_id.in_(legislator_ids))
+            votes = votes.where(VoteResult.legislator_id.in_(legislator_ids))
+
+        return sponsored.subquery("sponsored"), votes.subquery("votes")
+
+    @classmethod
+    def _with_counts(cls, statement: Any, legislator_ids: list[int] | None = None):
+        """Outer join the aggregates to a statement over legislators"""
+        sponsored, votes = cls._aggregates(legislator_ids)
+        counts = [
+            func.coalesce(sponsored.c.sponsored, 0).label("sponsored_bills_count"),
+            func.coalesce(votes.c.supported, 0).label("supported_bills_count"),
+            func.coalesce(votes.c.opposed, 0).label("opposed_bills_count"),
+        ]
+        statement = statement.outerjoin(
+            sponsored,
+            sponsored.c.legislator_id == Legislator.id,
+        ).outerjoin(votes, votes.c.legislator_id == Legislator.id)
+        return statement, counts
+
+    @classmethod
+    def for_legislators(
+        cls,
+        legislator_ids: Iterable[int],
+    ) -> dict[int, LegislatorStats]:
+        """Stats for the given legislators, keyed by legislator id"""
+        legislator_ids = [
+            legislator_id for legislator_id in legislator_ids if legislator_id
+        ]
+        if not legislator_ids:
+            return {}
+
+        statement, counts = cls._with_counts(select(Legislator.id), legislator_ids)
+        statement = statement.add_columns(*counts).where(
+            Legislator.id.in_(legislator_ids),
+        )
+        return {row[0]: cls(*row) for row in db.session.execute(statement)}
+
+    @classmethod
+    def attach(cls, legislators: list[Legislator]) -> list[Legislator]:
+        """Precompute the stats of loaded legislators with a single query"""
+        stats = cls.for_legislators(legislator.id for legislator in legislators)
+        for legislator in legislators:
+            legislator.precomputed_stats = stats.get(legislator.id, cls(legislator.id))
+        return legislators
+
+    @classmethod
+    def annotate(cls, statement: Select) -> Select:
+        """Add the stats columns to a SELECT over legislators"""
+        statement, counts = cls._with_counts(statement)
+        return statement.add_columns(*counts)
+
+    def __repr__(self) -> str:
+        return (
+            f"LegislatorStats(legislator_id={self.legislator_id}, "
+            f"sponsored={self.sponsored_bills_count}, "
+            f"supported={self.supported_bills_count}, "
+            f"opposed={self.opposed_bills_count})"
+        )
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import delete, except_, func, insert, select, update
+
+from app.models.bill_vote_tally import BillVoteTally
+from app.models.vote import Vote
+from app.models.vote_result import NAY_COUNT, YEA_COUNT, VoteResult
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from sqlalchemy.orm import Session
+
+
+class VoteTallies:
+    """Maintains the denormalized ``bill_vote_tallies`` table
+
+    Tallies are recomputed from ``vote_results`` for the votes touched by an
+    import batch, so reading the counts of a bill or vote never has to walk
+    its vote results.
+    """
+
+    COLUMNS = ["vote_id", "bill_id", "yea_count", "nay_count", "total_count"]
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+
+    @staticmethod
+    def _expected(vote_ids: list[int] | None = None) -> Any:
+        """Tallies computed from vote_results, one row per vote"""
+        statement = (
+            select(
+                VoteResult.vote_id,
+                Vote.bill_id,
+                YEA_COUNT,
+                NAY_COUNT,
+                func.count(VoteResult.id),
+            )
+            .outerjoin(Vote, Vote.id == VoteResult.vote_id)
+            .where(VoteResult.vote_id.is_not(None))
+            .group_by(VoteResult.vote_id, Vote.bill_id)
+        )
+        if vote_ids is not None:
+            statement = statement.where(VoteResult.vote_id.in_(vote_ids))
+        return statement
+
+    def refresh(self, vote_ids: Iterable[int]) -> None:
+        """Recompute the tallies of the given votes"""
+        vote_ids = sorted({vote_id for vote_id in vote_ids if vote_id is not None})
+        if not vote_ids:
+            return
+
+        table = BillVoteTally.__table__
+        self.session.execute(delete(table).where(table.c.vote_id.in_(vote_ids)))
+        self.session.execute(
+            insert(table).from_select(self.COLUMNS, self._expected(vote_ids)),
+        )
+
+    def refresh_bills(self, vote_ids: Iterable[int]) -> None:
+        """Follow votes that moved to another bill"""
+        vote_ids = sorted({vote_id for vote_id in vote_ids if vote_id is not None})
+        if not vote_ids:
+            return
+
+        table = BillVoteTally.__table__
+        self.session.execute(
+            update(table)
+            .where(table.c.vote_id.in_(vote_ids))
+            .values(
+                bill_id=select(Vote.bill_id)
+                .where(Vote.id == table.c.vote_id)
+                .scalar_subquery(),
+            ),
+        )
+
+    def rebuild(self) -> None:
+        """Recompute every tally from scratch"""
+        table = BillVoteTally.__table__
+        self.session.execute(delete(table))
+        self.session.execute(insert(table).from_select(self.COLUMNS, self._expected()))
+
+    def inconsistent_vote_ids(self) -> list[int]:
+        """Votes whose stored tally differs from their vote results"""
+        table = BillVoteTally.__table__
+        stored = select(*[table.c[column] for column in self.COLUMNS])
+        expected = self._expected()
+
+        missing_or_stale = except_(expected, stored).subquery()
+        orphaned = except_(stored, expected).subquery()
+        vote_ids = {
+            row[0]
+            for subquery in (missing_or_stale, orphaned)
+            for row in self.session.execute(select(subquery.c[0]))
+        }
+        return sorted(vote_ids)
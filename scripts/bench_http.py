@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+HTTP benchmark for Quorum App
+Measures every endpoint in every format MultiResponse serves
+
+A database is seeded with synthetic data (see bench_import.py), then each
+endpoint/format combination is requested by concurrent client threads going
+through the WSGI app in process, so no server or external service is needed.
+For each combination the report gives throughput, p50/p95/p99 latency, the
+SQL statements run per request and the bytes per response, and is written as
+JSON so that runs can be compared with --baseline. --without-indexes drops
+the secondary indexes after seeding, to measure what they bring:
+
+    python scripts/bench_http.py --without-indexes --output before.json
+    python scripts/bench_http.py --baseline before.json
+
+Usage:
+    python scripts/bench_http.py [--legislators N] [--bills N] [--votes N]
+                                 [--vote-results N] [--database URL]
+                                 [--endpoints NAME ...] [--formats FORMAT ...]
+                                 [--requests N] [--concurrency N] [--warmup N]
+                                 [--output FILE] [--baseline FILE] [--tolerance PCT]
+                                 [--without-indexes]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+# Add the project root directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import sqlalchemy
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import make_url
+
+from app import create_app, db
+from app.models import Bill, Legislator, Vote, VoteResult
+from scripts.bench_import import Scale, drop_indexes, generate_data
+from scripts.importer import IMPORT_CONFIGS, build_importer
+from settings import settings
+
+if TYPE_CHECKING:
+    from flask import Flask
+    from flask.testing import FlaskClient
+
+
+FORMATS = ["html", "json", "csv"]
+
+
+# Show pages render a single record, which has no CSV export
+SHOW_FORMATS = ["html", "json"]
+
+
+class Endpoint(NamedTuple):
+    """A URL to benchmark, ``{id}`` being replaced by ids of ``model``"""
+
+    name: str
+    url: str
+    model: type | None = None
+    formats: list[str] = FORMATS
+
+
+ENDPOINTS = [
+    Endpoint("legislators", "/legislators"),
+    Endpoint("legislator", "/legislators/{id}", Legislator, SHOW_FORMATS),
+    Endpoint("bills", "/bills"),
+    Endpoint("bill", "/bills/{id}", Bill, SHOW_FORMATS),
+    Endpoint("votes", "/votes"),
+    Endpoint("vote", "/votes/{id}", Vote, SHOW_FORMATS),
+    Endpoint("vote_results", "/vote_results"),
+    Endpoint("vote_result", "/vote_results/{id}", VoteResult, SHOW_FORMATS),
+]
+
+# Ids requested in turn by the show endpoints
+SAMPLE_IDS = 100
+
+
+class StatementCounter:
+    """SQL statements run by the current thread since its last ``reset``"""
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+
+    def record(self, *_args: Any) -> None:
+        self._local.count = getattr(self._local, "count", 0) + 1
+
+    def reset(self) -> int:
+        count = getattr(self._local, "count", 0)
+        self._local.count = 0
+        return count
+
+
+def seed(data_dir: Path, scale: Scale) -> None:
+    """Fill fresh tables with generated data, bulk loading every file"""
+    generate_data(data_dir, scale)
+    db.drop_all(bind_key=None)
+    db.create_all(bind_key=None)
+    for entity_name, filename, importer_class in IMPORT_CONFIGS:
+        importer = build_importer(importer_class, db.session, 10000)
+        result = importer.import_from_file(str(data_dir / filename), "bulk")
+        if not result.success:
+            msg = f"Seeding {entity_name} failed: {result.errors}"
+            raise RuntimeError(msg)
+    db.session.remove()
+
+
+def sample_urls(endpoint: Endpoint, format_type: str) -> list[str]:
+    """URLs requested in turn for an endpoint, spread over the table for shows"""
+    if endpoint.model is None:
+        return [f"{endpoint.url}?format={format_type}"]
+
+    model = endpoint.model
+    count = db.session.scalar(select(func.count()).select_from(model))
+    step = max(count // SAMPLE_IDS, 1)
+    ids = db.session.scalars(
+        select(model.id).order_by(model.id).offset(step // 2).limit(count),
+    ).all()[::step]
+    return [endpoint.url.format(id=id_) + f"?format={format_type}" for id_ in ids]
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    index = max(round(fraction * len(sorted_values)) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def bench_endpoint(
+    app: Flask,
+    counter: StatementCounter,
+    urls: list[str],
+    *,
+    requests: int,
+    concurrency: int,
+    warmup: int,
+) -> dict[str, Any]:
+    """Request ``urls`` round robin from ``concurrency`` client threads"""
+    clients = threading.local()
+
+    def fetch(index: int) -> tuple[float, int, int, int]:
+        if not hasattr(clients, "client"):
+            clients.client = app.test_client()
+        client: FlaskClient = clients.client
+
+        counter.reset()
+        started = time.perf_counter()
+        response = client.get(urls[index % len(urls)])
+        size = len(response.get_data())  # Consumes streamed bodies
+        latency = time.perf_counter() - started
+        response.close()
+        return latency, size, counter.reset(), response.status_code
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(fetch, range(warmup)))
+        started = time.perf_counter()
+        samples = list(executor.map(fetch, range(requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies = sorted(sample[0] for sample in samples)
+    sizes = [sample[1] for sample in samples]
+    statements = [sample[2] for sample in samples]
+    return {
+        "requests": requests,
+        "errors": sum(sample[3] >= 400 for sample in samples),
+        "throughput_rps": round(requests / elapsed, 1),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 2),
+            "p95": round(percentile(latencies, 0.95) * 1000, 2),
+            "p99": round(percentile(latencies, 0.99) * 1000, 2),
+            "max": round(latencies[-1] * 1000, 2),
+        },
+        "sql_per_request": round(sum(statements) / requests, 2),
+        "sql_max": max(statements),
+        "bytes_per_response": round(sum(sizes) / requests),
+    }
+
+
+def run(args: argparse.Namespace, work_dir: Path) -> dict[str, Any]:
+    """Seed the database and benchmark every endpoint/format combination"""
+    scale = Scale(args.legislators, args.bills, args.votes, args.vote_results)
+    url = args.database or f"sqlite:///{work_dir / 'bench.db'}"
+    combinations = [
+        (endpoint, format_type)
+        for endpoint in ENDPOINTS
+        if not args.endpoints or endpoint.name in args.endpoints
+        for format_type in args.formats
+        if format_type in endpoint.formats
+    ]
+
+    settings.database_url = url
+    app = create_app()
+    counter = StatementCounter()
+    results = []
+    with app.app_context():
+        print(f"Seeding {make_url(url).render_as_string(hide_password=True)}...")
+        started = time.perf_counter()
+        seed(Path(args.data_dir) if args.data_dir else work_dir / "data", scale)
+        print(f"   done in {time.perf_counter() - started:.1f}s")
+        if args.without_indexes:
+            print("Dropping the secondary indexes...")
+            drop_indexes()
+
+        urls = {
+            (endpoint.name, format_type): sample_urls(endpoint, format_type)
+            for endpoint, format_type in combinations
+        }
+        db.session.remove()
+        event.listen(db.engine, "before_cursor_execute", counter.record)
+
+        print(
+            f"\n{'endpoint':<14} {'format':<6} {'req/s':>9} {'p50 ms':>8} "
+            f"{'p95 ms':>8} {'p99 ms':>8} {'sql':>6} {'bytes':>10}",
+        )
+        for endpoint, format_type in combinations:
+            measurement = bench_endpoint(
+                app,
+                counter,
+                urls[endpoint.name, format_type],
+                requests=args.requests,
+                concurrency=args.concurrency,
+                warmup=args.warmup,
+            )
+            latency = measurement["latency_ms"]
+            print(
+                f"{endpoint.name:<14} {format_type:<6} "
+                f"{measurement['throughput_rps']:>9,.1f} {latency['p50']:>8} "
+                f"{latency['p95']:>8} {latency['p99']:>8} "
+                f"{measurement['sql_per_request']:>6} "
+                f"{measurement['bytes_per_response']:>10,}"
+                + (
+                    f"  ❌ {measurement['errors']} errors"
+                    if measurement["errors"]
+                    else ""
+                ),
+            )
+            results.append(
+                {"endpoint": endpoint.name, "format": format_type, **measurement},
+            )
+
+        event.remove(db.engine, "before_cursor_execute", counter.record)
+        db.engine.dispose()
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "platform": platform.platform(),
+        "database": make_url(url).get_backend_name(),
+        "scale": scale._asdict(),
+        "concurrency": args.concurrency,
+        "indexes": not args.without_indexes,
+        "results": results,
+    }
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> int:
+    """Print the p95 latency change against a baseline, the number of regressions"""
+    previous = {
+        (result["endpoint"], result["format"]): result for result in baseline["results"]
+    }
+    if (report["scale"], report["concurrency"]) != (
+        baseline["scale"],
+        baseline["concurrency"],
+    ):
+        print("⚠️  The baseline was measured at another scale or concurrency")
+
+    print(f"\nCompared with the baseline of {baseline['created_at']}:")
+    regressions = 0
+    for result in report["results"]:
+        before = previous.get((result["endpoint"], result["format"]))
+        if not before:
+            continue
+        change = result["latency_ms"]["p95"] / before["latency_ms"]["p95"] - 1
+        regressed = (
+            change > tolerance / 100
+            or result["sql_per_request"] > before["sql_per_request"]
+        )
+        regressions += regressed
+        print(
+            f"   {'❌' if regressed else '✅'} {result['endpoint']:<14} "
+            f"{result['format']:<6} p95 {change:+.1%}, sql "
+            f"{before['sql_per_request']} -> {result['sql_per_request']}",
+        )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Main CLI entry point, exits with 1 on regressions against --baseline"""
+    parser = argparse.ArgumentParser(description="Benchmark the HTTP endpoints")
+    parser.add_argument("--legislators", type=int, default=500)
+    parser.add_argument("--bills", type=int, default=5000)
+    parser.add_argument("--votes", type=int, default=1000)
+    parser.add_argument("--vote-results", type=int, default=100000)
+    parser.add_argument(
+        "--data-dir",
+        default=None,
+        help="Where to generate (and reuse) the CSV files (default: a temporary directory)",
+    )
+    parser.add_argument(
+        "--database",
+        default=None,
+        help="Database URL, its tables are dropped (default: a temporary SQLite file)",
+    )
+    parser.add_argument(
+        "--endpoints",
+        nargs="+",
+        choices=[endpoint.name for endpoint in ENDPOINTS],
+        default=None,
+        help="Endpoints to benchmark (default: all)",
+    )
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=FORMATS,
+        default=FORMATS,
+        help="Formats to benchmark (default: all)",
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=200,
+        help="Timed requests per endpoint and format (default: 200)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Client threads (default: 4)",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=10,
+        help="Untimed requests before each measurement (default: 10)",
+    )
+    parser.add_argument(
+        "--output",
+        default="bench_http.json",
+        help="JSON report file (default: bench_http.json)",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=None,
+        help="Previous JSON report to compare p95 latency and SQL counts with",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=10.0,
+        help="p95 slowdown in percent reported as a regression (default: 10)",
+    )
+    parser.add_argument(
+        "--without-indexes",
+        action="store_true",
+        help="Drop the secondary indexes after seeding, for a before/after comparison",
+    )
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="quorum-bench-") as work_dir:
+        report = run(args, Path(work_dir))
+    Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\n📄 Report written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if compare(report, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+Import benchmark for Quorum App
+Generates synthetic CSV files and times each importer against each database
+
+Every run starts from empty tables (all tables are dropped and recreated, so
+only point it at dedicated databases) and imports the four files in foreign
+key order. For each importer the report gives rows/sec, the peak resident
+memory of the process while it ran and the number of SQL statements sent,
+and is written as JSON so that runs can be compared with --baseline.
+
+Generated files are kept in --data-dir and reused as long as the scale is
+unchanged, since the larger scales take a while to write. --without-indexes
+imports into tables without their secondary indexes, to measure what
+maintaining them costs:
+
+    python scripts/bench_import.py --without-indexes --output before.json
+    python scripts/bench_import.py --baseline before.json
+
+Usage:
+    python scripts/bench_import.py [--legislators N] [--bills N] [--votes N]
+                                   [--vote-results N] [--data-dir DIR]
+                                   [--database {sqlite,postgresql,URL} ...]
+                                   [--batch-size N ...] [--mode MODE] [--engine ENGINE]
+                                   [--output FILE] [--baseline FILE] [--tolerance PCT]
+                                   [--without-indexes]
+
+    # The scale of a large congress: 10k legislators, 1M bills, 100M results
+    python scripts/bench_import.py --legislators 10000 --bills 1000000 \\
+        --votes 250000 --vote-results 100000000 --data-dir /data/bench
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+# Add the project root directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import sqlalchemy
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+from app import create_app, db
+from scripts.database import get_tables_to_process
+from scripts.importer import (
+    DEFAULT_COMMIT_EVERY,
+    IMPORT_CONFIGS,
+    build_importer,
+    use_import_profile,
+)
+from settings import settings
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from sqlalchemy.engine import Engine
+
+
+# Shorthands accepted by --database
+DATABASES = {
+    "sqlite": None,  # A file in a temporary directory
+    "postgresql": "postgresql://localhost/quorum_bench",
+}
+
+# Seconds between two samples of the resident memory
+RSS_SAMPLE_INTERVAL = 0.005
+
+PARTIES = ["D", "R", "I"]
+STATES = ["AL", "CA", "FL", "IL", "MI", "NE", "NY", "OH", "PA", "TX", "WA"]
+
+
+class Scale(NamedTuple):
+    """Number of rows generated per file"""
+
+    legislators: int
+    bills: int
+    votes: int
+    vote_results: int
+
+
+def generate_data(data_dir: Path, scale: Scale, seed: int = 0) -> dict[str, int]:
+    """Write the four CSV files, returning the number of rows of each
+
+    Files already generated at the same scale are reused.
+    """
+    data_dir.mkdir(parents=True, exist_ok=True)
+    marker = data_dir / "scale.json"
+    if marker.exists() and json.loads(marker.read_text()) == scale._asdict():
+        return _row_counts(scale)
+
+    # Benchmark data, no need for a cryptographic generator
+    rng = random.Random(seed)  # noqa: S311
+    _write_csv(
+        data_dir / "legislators.csv",
+        ["id", "name"],
+        ((i, _legislator_name(i, rng)) for i in range(1, scale.legislators + 1)),
+    )
+    _write_csv(
+        data_dir / "bills.csv",
+        ["id", "title", "sponsor_id"],
+        (
+            (
+                i,
+                f"H.R. {i}: Synthetic Bill Act",
+                # A few bills have no sponsor
+                "" if rng.random() < 0.05 else rng.randint(1, scale.legislators),
+            )
+            for i in range(1, scale.bills + 1)
+        ),
+    )
+    _write_csv(
+        data_dir / "votes.csv",
+        ["id", "bill_id"],
+        ((i, rng.randint(1, scale.bills)) for i in range(1, scale.votes + 1)),
+    )
+    _write_csv(
+        data_dir / "vote_results.csv",
+        ["id", "legislator_id", "vote_id", "vote_type"],
+        _vote_results(scale, rng),
+    )
+
+    marker.write_text(json.dumps(scale._asdict()))
+    return _row_counts(scale)
+
+
+def _legislator_name(legislator_id: int, rng: random.Random) -> str:
+    party, state = rng.choice(PARTIES), rng.choice(STATES)
+    return f"Rep. Legislator {legislator_id} ({party}-{state}-{rng.randint(1, 53)})"
+
+
+def _row_counts(scale: Scale) -> dict[str, int]:
+    return {
+        "legislators.csv": scale.legislators,
+        "bills.csv": scale.bills,
+        "votes.csv": scale.votes,
+        "vote_results.csv": min(scale.vote_results, scale.votes * scale.legislators),
+    }
+
+
+def _vote_results(scale: Scale, rng: random.Random) -> Iterator[tuple]:
+    """Results spread evenly over the votes, each legislator voting once per vote"""
+    total = min(scale.vote_results, scale.votes * scale.legislators)
+    per_vote, extra = divmod(total, scale.votes)
+    result_id = 0
+    for vote_id in range(1, scale.votes + 1):
+        first = rng.randrange(scale.legislators)
+        for k in range(per_vote + (vote_id <= extra)):
+            result_id += 1
+            legislator_id = (first + k) % scale.legislators + 1
+            yield result_id, legislator_id, vote_id, rng.choice((1, 2))
+
+
+def _write_csv(path: Path, headers: list[str], rows: Iterator[tuple]) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(headers)
+        writer.writerows(rows)
+
+
+def _resident_bytes() -> int | None:
+    """Current resident set size, None where /proc is not available"""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return None
+
+
+def _max_resident_bytes() -> int:
+    """Peak resident set size of the whole process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # KiB on Linux
+
+
+@contextmanager
+def peak_rss() -> Iterator[list[int]]:
+    """Peak resident memory in bytes while a block runs, in a one-item list
+
+    Sampled by a thread from /proc, or the process-wide peak (``ru_maxrss``)
+    where /proc is not available.
+    """
+    peak = [0]
+    if _resident_bytes() is None:
+        yield peak
+        peak[0] = _max_resident_bytes()
+        return
+
+    stop = threading.Event()
+
+    def sample() -> None:
+        while True:
+            peak[0] = max(peak[0], _resident_bytes() or 0)
+            if stop.wait(RSS_SAMPLE_INTERVAL):
+                break
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        yield peak
+    finally:
+        stop.set()
+        sampler.join()
+
+
+@contextmanager
+def count_queries(engine: Engine) -> Iterator[list[int]]:
+    """Count the statements sent through an engine, in a one-item list
+
+    COPY in bulk mode goes through the raw DBAPI cursor and is not counted.
+    """
+    count = [0]
+
+    def record(*_args: Any) -> None:
+        count[0] += 1
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield count
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def resolve_database(name: str, work_dir: Path) -> str:
+    """URL of a --database value"""
+    if name not in DATABASES:
+        return name
+    return DATABASES[name] or f"sqlite:///{work_dir / 'bench.db'}"
+
+
+def drop_indexes() -> None:
+    """Drop the indexes declared on the models, keeping unique constraints"""
+    for model in get_tables_to_process(None):
+        for index in model.__table__.indexes:
+            index.drop(db.engine, checkfirst=True)
+
+
+def bench_database(
+    url: str,
+    data_dir: Path,
+    row_counts: dict[str, int],
+    *,
+    batch_size: int,
+    mode: str,
+    engine: str,
+    indexes: bool = True,
+) -> list[dict[str, Any]]:
+    """Import every file into fresh tables, measuring each importer"""
+    settings.database_url = url
+    use_import_profile()
+    app = create_app()
+    measurements = []
+    with app.app_context():
+        db.drop_all(bind_key=None)
+        db.create_all(bind_key=None)
+        if not indexes:
+            drop_indexes()
+        try:
+            for _, filename, importer_class in IMPORT_CONFIGS:
+                importer = build_importer(
+                    importer_class,
+                    db.session,
+                    batch_size,
+                    {"engine": engine},
+                )
+                with count_queries(db.engine) as queries, peak_rss() as rss:
+                    started = time.perf_counter()
+                    result = importer.import_from_file(
+                        str(data_dir / filename),
+                        mode,
+                        commit_every=None if mode == "bulk" else DEFAULT_COMMIT_EVERY,
+                    )
+                    seconds = time.perf_counter() - started
+
+                rows = row_counts[filename]
+                measurements.append(
+                    {
+                        "importer": importer_class.__name__,
+                        "file": filename,
+                        "rows": rows,
+                        "imported": result.imported_count,
+                        "errors": result.error_count,
+                        "success": result.success,
+                        "seconds": round(seconds, 3),
+                        "rows_per_sec": round(rows / seconds, 1) if seconds else None,
+                        "peak_rss_mb": round(rss[0] / 1024 / 1024, 1),
+                        "queries": queries[0],
+                    },
+                )
+                print(
+                    f"   {importer_class.__name__:<20} {rows:>12,} rows "
+                    f"{seconds:>9.2f}s {measurements[-1]['rows_per_sec'] or 0:>12,.0f} rows/s "
+                    f"{measurements[-1]['peak_rss_mb']:>8} MB {queries[0]:>9,} queries",
+                )
+        finally:
+            db.session.remove()
+            db.engine.dispose()
+    return measurements
+
+
+def run(args: argparse.Namespace, work_dir: Path) -> dict[str, Any]:
+    """Generate the data and benchmark every database and batch size
+
+    ``work_dir`` holds the SQLite database and, without --data-dir, the data.
+    """
+    scale = Scale(args.legislators, args.bills, args.votes, args.vote_results)
+    data_dir = Path(args.data_dir) if args.data_dir else work_dir / "data"
+
+    print(f"Generating data in {data_dir}...")
+    started = time.perf_counter()
+    row_counts = generate_data(data_dir, scale, args.seed)
+    print(f"   done in {time.perf_counter() - started:.1f}s: {row_counts}")
+
+    runs = []
+    for name in args.database:
+        url = resolve_database(name, work_dir)
+        shown_url = make_url(url).render_as_string(hide_password=True)
+        for batch_size in args.batch_size:
+            print(
+                f"\n{shown_url} (batch size {batch_size}, {args.mode}, {args.engine}"
+                f"{', without indexes' if args.without_indexes else ''})",
+            )
+            run_info = {
+                "database": make_url(url).get_backend_name(),
+                "url": shown_url,
+                "batch_size": batch_size,
+                "mode": args.mode,
+                "engine": args.engine,
+                "indexes": not args.without_indexes,
+            }
+            try:
+                run_info["importers"] = bench_database(
+                    url,
+                    data_dir,
+                    row_counts,
+                    batch_size=batch_size,
+                    mode=args.mode,
+                    engine=args.engine,
+                    indexes=not args.without_indexes,
+                )
+            except Exception as e:  # e.g. no local PostgreSQL, reported as skipped
+                print(f"❌ Skipped: {e}")
+                run_info["importers"] = []
+                run_info["error"] = str(e)
+            runs.append(run_info)
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "platform": platform.platform(),
+        "scale": scale._asdict(),
+        "runs": runs,
+    }
+
+
+def _run_key(run_info: dict[str, Any], measurement: dict[str, Any]) -> tuple:
+    return (
+        run_info["database"],
+        run_info["batch_size"],
+        run_info["mode"],
+        run_info["engine"],
+        measurement["importer"],
+    )
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> int:
+    """Print the throughput change against a baseline, the number of regressions"""
+    previous = {
+        _run_key(run_info, measurement): measurement
+        for run_info in baseline["runs"]
+        for measurement in run_info["importers"]
+    }
+    if report["scale"] != baseline["scale"]:
+        print("⚠️  The baseline was measured at another scale")
+
+    print(f"\nCompared with the baseline of {baseline['created_at']}:")
+    regressions = 0
+    for run_info in report["runs"]:
+        for measurement in run_info["importers"]:
+            before = previous.get(_run_key(run_info, measurement))
+            if (
+                not before
+                or not before["rows_per_sec"]
+                or not measurement["rows_per_sec"]
+            ):
+                continue
+            change = measurement["rows_per_sec"] / before["rows_per_sec"] - 1
+            regressed = change < -tolerance / 100
+            regressions += regressed
+            print(
+                f"   {'❌' if regressed else '✅'} {run_info['database']:<10} "
+                f"batch {run_info['batch_size']:<6} {measurement['importer']:<20} "
+                f"{change:+.1%} rows/s, queries {before['queries']:,} -> "
+                f"{measurement['queries']:,}",
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Main CLI entry point, exits with 1 on regressions against --baseline"""
+    parser = argparse.ArgumentParser(description="Benchmark the CSV importers")
+    parser.add_argument("--legislators", type=int, default=1000)
+    parser.add_argument("--bills", type=int, default=20000)
+    parser.add_argument("--votes", type=int, default=5000)
+    parser.add_argument("--vote-results", type=int, default=200000)
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed of the data generator (default: 0)",
+    )
+    parser.add_argument(
+        "--data-dir",
+        default=None,
+        help="Where to generate (and reuse) the CSV files (default: a temporary directory)",
+    )
+    parser.add_argument(
+        "--database",
+        nargs="+",
+        default=list(DATABASES),
+        help=(
+            "Databases to benchmark, 'sqlite' (a temporary file), 'postgresql' "
+            f"({DATABASES['postgresql']}) or URLs; their tables are dropped "
+            "(default: sqlite postgresql)"
+        ),
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        nargs="+",
+        default=[1000],
+        help="Batch sizes to compare (default: 1000)",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=IMPORT_CONFIGS[0][2].MODES,
+        default="upsert",
+        help="Import mode, see importer.py (default: upsert)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=IMPORT_CONFIGS[0][2].ENGINES,
+        default="python",
+        help="Parsing engine, see importer.py (default: python)",
+    )
+    parser.add_argument(
+        "--output",
+        default="bench_import.json",
+        help="JSON report file (default: bench_import.json)",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=None,
+        help="Previous JSON report to compare rows/sec with",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=10.0,
+        help="Slowdown in percent reported as a regression (default: 10)",
+    )
+    parser.add_argument(
+        "--without-indexes",
+        action="store_true",
+        help="Drop the secondary indexes before importing, for a before/after comparison",
+    )
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="quorum-bench-") as work_dir:
+        report = run(args, Path(work_dir))
+    Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\n📄 Report written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        if compare(report, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
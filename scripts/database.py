@@ -9,9 +9,12 @@ Commands:
     create      Create database tables
     drop        Drop database tables
     reset       Drop and recreate tables
+    index       Create the declared indexes missing from existing tables
+    check-tallies  Compare bill_vote_tallies with vote_results (--fix rebuilds)
 
 Table Names:
-    legislators, bills, votes, vote_results
+    legislators, bills, votes, vote_results, bill_vote_tallies, import_files,
+    import_checkpoints, data_versions
     (if no table names provided, all tables are affected)
 
 Examples:
@@ -19,6 +22,8 @@ Examples:
     python scripts/database.py create legislators bills
     python scripts/database.py drop legislators --confirm
     python scripts/database.py reset --with-data
+    python scripts/database.py index vote_results
+    python scripts/database.py check-tallies --fix
 """
 
 import argparse
@@ -28,8 +33,21 @@ from pathlib import Path
 # Add the project root directory to the Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from sqlalchemy import inspect
+
 from app import create_app, db
-from app.models import Bill, Legislator, Vote, VoteResult
+from app.models import (
+    Bill,
+    BillVoteTally,
+    DataVersion,
+    ImportCheckpoint,
+    ImportFile,
+    Legislator,
+    Vote,
+    VoteResult,
+)
+from app.services.data_versions import DataVersions
+from app.services.stats import VoteTallies
 
 # TODO: Discover models dynamically
 TABLE_MODELS = {
@@ -37,6 +55,10 @@ TABLE_MODELS = {
     "bills": Bill,
     "votes": Vote,
     "vote_results": VoteResult,
+    "bill_vote_tallies": BillVoteTally,
+    "import_files": ImportFile,
+    "import_checkpoints": ImportCheckpoint,
+    "data_versions": DataVersion,
 }
 
 
@@ -44,7 +66,16 @@ def get_tables_to_process(table_names):
     """Get list of table models to process."""
     if not table_names:
         # Return all tables in dependency order (for safe operations)
-        return [VoteResult, Vote, Bill, Legislator]
+        return [
+            DataVersion,
+            ImportCheckpoint,
+            ImportFile,
+            BillVoteTally,
+            VoteResult,
+            Vote,
+            Bill,
+            Legislator,
+        ]
 
     tables = []
     for name in table_names:
@@ -67,7 +98,7 @@ def create_tables(table_names=None):
         print("✅ Selected tables created successfully!")
     else:
         print("Creating all database tables...")
-        db.create_all()
+        db.create_all(bind_key=None)
         print("✅ All database tables created successfully!")
 
 
@@ -82,10 +113,39 @@ def drop_tables(table_names=None):
         print("✅ Selected tables dropped successfully!")
     else:
         print("Dropping all database tables...")
-        db.drop_all()
+        db.drop_all(bind_key=None)
         print("✅ All database tables dropped successfully!")
 
 
+def missing_indexes(table_names=None):
+    """Indexes declared on the models but absent from the database."""
+    inspector = inspect(db.engine)
+    missing = []
+    for model in get_tables_to_process(table_names):
+        table = model.__table__
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        missing += sorted(
+            (index for index in table.indexes if index.name not in existing),
+            key=lambda index: index.name,
+        )
+    return missing
+
+
+def create_indexes(table_names=None):
+    """Create the declared indexes of tables created before them."""
+    indexes = missing_indexes(table_names)
+    if not indexes:
+        print("✅ All indexes already exist!")
+        return
+
+    for index in indexes:
+        print(f"Creating index {index.name} on {index.table.name}...")
+        index.create(db.engine)
+    print(f"✅ {len(indexes)} indexes created successfully!")
+
+
 def reset_tables(table_names=None, *, with_data=None):
     """Drop and recreate tables."""
     if with_data is None:
@@ -106,7 +166,7 @@ def reset_tables(table_names=None, *, with_data=None):
         try:
             from scripts.importer import main as import_data_main
 
-            import_data_main()
+            import_data_main([])
             print("✅ Data imported successfully!")
         except Exception as e:
             print(f"❌ Error importing data: {e}")
@@ -115,6 +175,39 @@ def reset_tables(table_names=None, *, with_data=None):
     return True
 
 
+def bump_data_version():
+    """Invalidate cached responses after tables were dropped or reset."""
+    if inspect(db.engine).has_table(DataVersion.__tablename__):
+        DataVersions(db.session).bump()
+        db.session.commit()
+
+
+def check_tallies(*, fix=False):
+    """Check bill_vote_tallies against vote_results, optionally rebuilding it."""
+    tallies = VoteTallies(db.session)
+    vote_ids = tallies.inconsistent_vote_ids()
+
+    if not vote_ids:
+        print("✅ Vote tallies are consistent!")
+        return True
+
+    print(f"⚠️  {len(vote_ids)} inconsistent vote tallies")
+    for vote_id in vote_ids[:5]:
+        print(f"   - vote {vote_id}")
+    if len(vote_ids) > 5:
+        print(f"   ... and {len(vote_ids) - 5} more")
+
+    if not fix:
+        print("Run with --fix to rebuild the tallies.")
+        return False
+
+    tallies.rebuild()
+    DataVersions(db.session).bump()
+    db.session.commit()
+    print("✅ Vote tallies rebuilt successfully!")
+    return True
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -125,14 +218,14 @@ def main():
 
     parser.add_argument(
         "command",
-        choices=["create", "drop", "reset"],
+        choices=["create", "drop", "reset", "index", "check-tallies"],
         help="Database command to execute",
     )
 
     parser.add_argument(
         "table_names",
         nargs="*",
-        help="Table names to operate on (legislators, bills, votes, vote_results)",
+        help="Table names to operate on (legislators, bills, votes, vote_results, bill_vote_tallies, import_files, import_checkpoints, data_versions)",
     )
 
     parser.add_argument(
@@ -141,6 +234,12 @@ def main():
         help="Skip confirmation prompts for destructive operations",
     )
 
+    parser.add_argument(
+        "--fix",
+        action="store_true",
+        help="Rebuild inconsistent vote tallies (only for check-tallies)",
+    )
+
     parser.add_argument(
         "--with-data",
         action="store_true",
@@ -180,8 +279,14 @@ def main():
                 create_tables(args.table_names)
             elif args.command == "drop":
                 drop_tables(args.table_names)
+                bump_data_version()
             elif args.command == "reset":
                 reset_tables(args.table_names, with_data=args.with_data)
+                bump_data_version()
+            elif args.command == "index":
+                create_indexes(args.table_names)
+            elif args.command == "check-tallies" and not check_tallies(fix=args.fix):
+                sys.exit(1)
         except Exception as e:
             print(f"❌ Error: {e}")
             sys.exit(1)
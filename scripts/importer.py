@@ -2,13 +2,25 @@
 """
 Data importer script for Quorum App
 Imports CSV data into the database using batch processing
+
+CSV files are read, transformed and validated by a pool of parser threads
+while a single writer imports them in foreign key order, see ImportPipeline.
+Imports commit every few batches with a checkpoint, so that an interrupted
+import can be continued with --resume.
+
+Usage:
+    python scripts/importer.py [--batch-size N] [--workers N] [--sequential]
+                               [--mode {upsert,bulk,incremental}]
+                               [--commit-every N] [--resume]
+                               [--id-memory-mb N] [--max-errors N] [--error-log-dir DIR]
 """
 
 from __future__ import annotations
 
+import argparse
 import sys
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 # Add the project root directory to the Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -17,14 +29,74 @@ from sqlalchemy.orm import Session
 
 from app import create_app, db
 from app.services.importers import (
+    BaseBatchImporter,
     BillImporter,
+    ImportPipeline,
     LegislatorImporter,
     VoteImporter,
     VoteResultImporter,
 )
+from settings import settings
 
 if TYPE_CHECKING:
-    from app.services.importers.base_batch_importer import BaseBatchImporter
+    from app.services.importers import ImportResult
+
+
+# Batches written between commits (and checkpoints) unless --commit-every
+DEFAULT_COMMIT_EVERY = 10
+
+# Import order matters due to foreign keys
+IMPORT_CONFIGS = [
+    ("legislators", "legislators.csv", LegislatorImporter),
+    ("bills", "bills.csv", BillImporter),
+    ("votes", "votes.csv", VoteImporter),
+    ("vote results", "vote_results.csv", VoteResultImporter),
+]
+
+
+def report(entity_name: str, result: ImportResult) -> None:
+    """Print the outcome of importing one entity type"""
+    if result.skipped:
+        print(f"⏭️  {entity_name} unchanged since the last import, skipped")
+        return
+
+    print(f"✅ Imported {result.imported_count} {entity_name}")
+    if result.inserted_count or result.updated_count or result.unchanged_count:
+        print(
+            f"   {result.inserted_count} inserted, {result.updated_count} updated, "
+            f"{result.unchanged_count} unchanged",
+        )
+
+    if result.error_count:
+        print(f"⚠️  {result.error_count} errors occurred")
+        for error in result.errors[:5]:  # Show first 5 errors
+            print(f"   - {error}")
+        if result.error_count > 5:
+            print(f"   ... and {result.error_count - 5} more errors")
+        if result.error_log:
+            print(f"   All errors were written to {result.error_log}")
+
+
+def build_importer(
+    importer_class: type[BaseBatchImporter],
+    session: Session,
+    batch_size: int,
+    tuning: dict[str, Any] | None = None,
+) -> BaseBatchImporter:
+    """Create an importer with the engine and limits given on the command line"""
+    importer = importer_class(session, batch_size)
+    tuning = tuning or {}
+    if tuning.get("engine"):
+        importer.engine = tuning["engine"]
+    if tuning.get("id_memory_limit"):
+        importer.id_memory_limit = tuning["id_memory_limit"]
+    if tuning.get("max_errors") is not None:
+        importer.max_errors = tuning["max_errors"]
+    if tuning.get("error_log_dir"):
+        importer.error_log = str(
+            Path(tuning["error_log_dir"]) / f"{importer.manifest_name}.errors.log",
+        )
+    return importer
 
 
 def import_entity(
@@ -34,6 +106,9 @@ def import_entity(
     entity_name: str,
     filename: str,
     importer_class: type[BaseBatchImporter],
+    *,
+    tuning: dict[str, Any] | None = None,
+    **options: Any,
 ) -> bool:
     """Import a single entity type from CSV file"""
     file_path = data_dir / filename
@@ -43,23 +118,62 @@ def import_entity(
         return False
 
     print(f"Importing {entity_name}...")
-    importer = importer_class(session, batch_size)
-    result = importer.import_from_file(str(file_path))
+    importer = build_importer(importer_class, session, batch_size, tuning)
+    report(entity_name, importer.import_from_file(str(file_path), **options))
+    return True
 
-    print(f"✅ Imported {result.imported_count} {entity_name}")
 
-    if result.errors:
-        print(f"⚠️  {len(result.errors)} errors occurred")
-        for error in result.errors[:5]:  # Show first 5 errors
-            print(f"   - {error}")
-        if len(result.errors) > 5:
-            print(f"   ... and {len(result.errors) - 5} more errors")
+def import_pipelined(
+    data_dir: Path,
+    session: Session,
+    batch_size: int,
+    workers: int | None = None,
+    *,
+    tuning: dict[str, Any] | None = None,
+    **options: Any,
+) -> None:
+    """Import all entity types, parsing the next files while writing one"""
+    jobs = []
+    entity_names = []
+    for entity_name, filename, importer_class in IMPORT_CONFIGS:
+        file_path = data_dir / filename
+        if not file_path.exists():
+            print(f"❌ {filename} not found, skipping...")
+            continue
+        importer = build_importer(importer_class, session, batch_size, tuning)
+        jobs.append((importer, str(file_path)))
+        entity_names.append(entity_name)
 
-    return True
+    results = ImportPipeline(workers=workers, **options).run(jobs)
+    for entity_name, result in zip(entity_names, results):
+        report(entity_name, result)
 
 
-def import_data() -> None:
-    """Import all CSV data into the database using batch processing"""
+def use_import_profile() -> None:
+    """Tune the engine for bulk loads, unless DB_PROFILE says otherwise
+
+    The "import" profile of app.lib.engine gives SQLite a larger cache and a
+    longer busy timeout for the import's long transactions. Call before
+    create_app.
+    """
+    if "db_profile" not in settings.model_fields_set:
+        settings.db_profile = "import"
+
+
+def import_data(
+    batch_size: int = 1000,
+    workers: int | None = None,
+    *,
+    sequential: bool = False,
+    tuning: dict[str, Any] | None = None,
+    **options: Any,
+) -> None:
+    """Import all CSV data into the database using batch processing
+
+    ``options`` (``mode``, ``commit_every``, ``resume``) are passed on to
+    the importers, see BaseBatchImporter.import_from_file, and ``tuning``
+    to build_importer.
+    """
     print("Starting batch data import...")
 
     # Ensure data directory exists
@@ -67,6 +181,7 @@ def import_data() -> None:
     data_dir.mkdir(exist_ok=True)
 
     # Create Flask app
+    use_import_profile()
     app = create_app()
 
     with app.app_context():
@@ -80,27 +195,29 @@ def import_data() -> None:
             return
 
         try:
-            # Use a single session for all imports with larger batch sizes
+            # Use a single session for all writes
             session = db.session
-            batch_size = 1000  # Adjust based on memory and performance needs
-
-            # Define import order and configurations (order matters due to foreign keys)
-            import_configs = [
-                ("legislators", "legislators.csv", LegislatorImporter),
-                ("bills", "bills.csv", BillImporter),
-                ("votes", "votes.csv", VoteImporter),
-                ("vote results", "vote_results.csv", VoteResultImporter),
-            ]
-
-            # Import entities in order
-            for entity_name, filename, importer_class in import_configs:
-                import_entity(
+
+            if sequential:
+                for entity_name, filename, importer_class in IMPORT_CONFIGS:
+                    import_entity(
+                        data_dir,
+                        session,
+                        batch_size,
+                        entity_name,
+                        filename,
+                        importer_class,
+                        tuning=tuning,
+                        **options,
+                    )
+            else:
+                import_pipelined(
                     data_dir,
                     session,
                     batch_size,
-                    entity_name,
-                    filename,
-                    importer_class,
+                    workers,
+                    tuning=tuning,
+                    **options,
                 )
 
             print("🎉 Batch data import completed successfully!")
@@ -111,5 +228,100 @@ def import_data() -> None:
             raise
 
 
+def main(argv: list[str] | None = None) -> None:
+    """Main CLI entry point."""
+    parser = argparse.ArgumentParser(description="Import CSV data from data/")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Rows written per statement (default: 1000)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Parser threads (default: one per file, up to the CPU count)",
+    )
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="Parse and write each file in turn on a single thread",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=BaseBatchImporter.MODES,
+        default="upsert",
+        help=(
+            "upsert: write each batch as it is parsed; bulk: stage each file "
+            "(COPY on PostgreSQL) and merge it at once, for initial loads; "
+            "incremental: skip unchanged files and only write changed rows"
+        ),
+    )
+    parser.add_argument(
+        "--engine",
+        choices=BaseBatchImporter.ENGINES,
+        default="python",
+        help=(
+            "python: parse rows one at a time; pandas: parse and validate "
+            "chunks of batch-size rows column by column, faster on large files"
+        ),
+    )
+    parser.add_argument(
+        "--commit-every",
+        type=int,
+        default=None,
+        help=(
+            "Commit and checkpoint every N batches, 0 to commit once per file "
+            "(default: 10, bulk loads always commit once per file)"
+        ),
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue interrupted imports from their last checkpoint",
+    )
+    parser.add_argument(
+        "--id-memory-mb",
+        type=int,
+        default=None,
+        help="Memory for duplicate id detection per file before using disk (default: 64)",
+    )
+    parser.add_argument(
+        "--max-errors",
+        type=int,
+        default=None,
+        help="Errors kept in memory and reported per file (default: 1000)",
+    )
+    parser.add_argument(
+        "--error-log-dir",
+        default=None,
+        help=(
+            "Write every error of each file to <dir>/<table>.errors.log, "
+            "appended to when --resume continues an interrupted import"
+        ),
+    )
+    args = parser.parse_args(argv)
+
+    commit_every = args.commit_every
+    if commit_every is None:
+        commit_every = None if args.mode == "bulk" else DEFAULT_COMMIT_EVERY
+
+    import_data(
+        args.batch_size,
+        args.workers,
+        sequential=args.sequential,
+        mode=args.mode,
+        commit_every=commit_every or None,
+        tuning={
+            "engine": args.engine,
+            "id_memory_limit": args.id_memory_mb and args.id_memory_mb * 1024 * 1024,
+            "max_errors": args.max_errors,
+            "error_log_dir": args.error_log_dir,
+        },
+        resume=args.resume,
+    )
+
+
 if __name__ == "__main__":
-    import_data()
+    main()
@@ -1,8 +1,17 @@
 #!/usr/bin/env python3
 """
 Run script for Quorum App
+
+Development runs Flask's reloading server (or uvicorn with ASYNC_MODE=true).
+With ENVIRONMENT=production the app is served by gunicorn, configured from
+ProductionSettings: worker processes, threads, keep-alive, max requests and
+graceful timeout. gunicorn stays in the foreground as the master process:
+`kill -HUP $(cat data/server.pid)` reloads the code with new workers while
+the old ones finish their requests, `kill -TERM` shuts down gracefully.
 """
 
+from __future__ import annotations
+
 import os
 import sys
 from pathlib import Path
@@ -10,21 +19,102 @@ from pathlib import Path
 # Add the project root directory to the Python path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app import create_app
+from settings import Settings, settings
 
 environment = os.environ.get("ENVIRONMENT", "development")
 host = os.environ.get("HOST", "0.0.0.0")
 port = int(os.environ.get("PORT", "8000"))
 
+
+def gunicorn_command(config: Settings, bind: str) -> list[str]:
+    """Command line of gunicorn serving the app with the server settings"""
+    if config.async_mode:
+        application = "app:create_asgi_app()"
+        worker_options = ["--worker-class", "uvicorn.workers.UvicornWorker"]
+    else:
+        application = "app:create_app()"
+        worker_options = ["--worker-class", "gthread", "--threads", str(config.threads)]
+
+    command = [
+        sys.executable,
+        "-m",
+        "gunicorn",
+        "--bind",
+        bind,
+        "--workers",
+        str(config.workers),
+        *worker_options,
+        "--keep-alive",
+        str(config.keepalive),
+        "--max-requests",
+        str(config.max_requests),
+        "--max-requests-jitter",
+        str(config.max_requests_jitter),
+        "--graceful-timeout",
+        str(config.graceful_timeout),
+        "--timeout",
+        str(config.timeout),
+        "--log-level",
+        config.log_level.lower(),
+        "--access-logfile",
+        "-",
+    ]
+    if config.pidfile:
+        command += ["--pid", config.pidfile]
+    # Without --preload each worker creates the app, so no connection pool
+    # is shared across a fork
+    return [*command, application]
+
+
+def check_pool(config: Settings) -> None:
+    """Warn when the workers' pools may open more connections than allowed"""
+    options = config.engine_options()
+    if "pool_size" not in options:
+        return
+    connections = config.workers * (options["pool_size"] + options["max_overflow"])
+    if connections > config.db_max_connections:
+        print(
+            f"⚠️  {config.workers} workers may open {connections} database "
+            f"connections, DB_MAX_CONNECTIONS is {config.db_max_connections}",
+        )
+
+
+def serve_production() -> None:
+    """Replace this process with the gunicorn master"""
+    check_pool(settings)
+    if settings.pidfile:
+        Path(settings.pidfile).parent.mkdir(parents=True, exist_ok=True)
+    command = gunicorn_command(settings, f"{host}:{port}")
+    print(
+        f"Starting gunicorn on {host}:{port} with {settings.workers} workers "
+        f"x {1 if settings.async_mode else settings.threads} threads",
+    )
+    sys.stdout.flush()
+    os.execv(command[0], command)  # noqa: S606
+
+
+def serve_development() -> None:
+    if settings.async_mode:
+        import uvicorn
+
+        uvicorn.run(
+            "app:create_asgi_app",
+            factory=True,
+            host=host,
+            port=port,
+            reload=True,
+            log_level=settings.log_level.lower(),
+        )
+    else:
+        from app import create_app
+
+        app = create_app()
+        app.run(host=host, port=port, debug=True, use_reloader=True)
+
+
 if __name__ == "__main__":
     if environment == "production":
-        # Disable reloader in production mode
-        use_reloader = False
-        debug = False
+        serve_production()
     else:
         # Default to development settings if environment is not recognized
-        use_reloader = True
-        debug = True
-
-    app = create_app()
-    app.run(host=host, port=port, debug=debug, use_reloader=use_reloader)
+        serve_development()
@@ -1,5 +1,5 @@
 import os
-from typing import Optional
+from typing import List, Optional
 
 from pydantic import ConfigDict
 from pydantic_settings import BaseSettings
@@ -11,6 +11,13 @@ class Settings(BaseSettings):
     # Database settings
     database_url: str = "sqlite+aiosqlite:///./data/quorum_app.db"
 
+    # Read replicas of database_url: the reads of replica_blueprints go to
+    # one of them, unless it fails or lags behind the primary's data version
+    # (checked every replica_check_seconds); imports always use the primary
+    database_replica_urls: List[str] = []
+    replica_blueprints: List[str] = ["legislators", "bills", "votes", "vote_results"]
+    replica_check_seconds: float = 5.0
+
     # Application settings
     app_name: str = "Quorum App"
     app_version: str = "1.0.0"
@@ -26,5 +33,88 @@ class Settings(BaseSettings):
     # External services (can be disabled in tests)
     external_api_enabled: bool = True
 
+    # Production server (scripts/server.py with ENVIRONMENT=production):
+    # worker processes and threads per worker, seconds idle keep-alive
+    # connections are kept, requests after which a worker is replaced (0 for
+    # never, plus a random jitter so workers do not restart together) and
+    # seconds workers get to finish requests on reload (SIGHUP) or shutdown
+    workers: int = 1
+    threads: int = 1
+    keepalive: int = 5
+    max_requests: int = 0
+    max_requests_jitter: int = 0
+    graceful_timeout: int = 30
+    timeout: int = 30
+    pidfile: Optional[str] = None
+
+    # Connection pool of each process. Unset sizes follow the server: one
+    # connection per thread, and overflow within db_max_connections, the
+    # connections the database accepts from all workers together
+    db_pool_size: Optional[int] = None
+    db_max_overflow: Optional[int] = None
+    db_pool_recycle: int = -1
+    db_pool_timeout: int = 30
+    db_max_connections: int = 100
+
+    # Engine tuning (see app.lib.engine): pre-ping tests pooled connections
+    # before use, the statement cache keeps compiled SQL per engine and the
+    # profile picks the SQLite pragmas, "serving" for read-heavy processes or
+    # "import" for bulk loads (the import scripts select it). sqlite_pragmas
+    # overrides single pragmas of the profile, e.g. {"mmap_size": 0}
+    db_profile: str = "serving"
+    db_pool_pre_ping: bool = False
+    db_statement_cache_size: int = 500
+    sqlite_pragmas: dict = {}
+
+    # Serve through an ASGI server on an async engine of database_url, so a
+    # worker overlaps requests waiting on the database (see app.lib.asgi)
+    async_mode: bool = False
+
     # Logging
     log_level: str = "INFO"
+
+    # Per-request SQL and timing metrics: Server-Timing header, one log line
+    # per request and /metrics for Prometheus
+    instrumentation: bool = False
+
+    # Whole-response cache of the read endpoints, invalidated by imports:
+    # "none", "memory" (per process) or "filesystem" (shared by the workers)
+    response_cache: str = "none"
+    response_cache_dir: str = os.path.abspath("data/cache")
+    response_cache_max_mb: int = 64
+
+    # ETag and Last-Modified of the read endpoints from the data version,
+    # matching If-None-Match / If-Modified-Since are answered with 304
+    conditional_requests: bool = False
+
+    # gzip/brotli/zstd compression of text and JSON responses from this size,
+    # streamed CSV exports are always compressed and can be kept precompressed
+    compression: bool = True
+    compression_min_bytes: int = 1024
+    precompressed_exports: bool = False
+    precompressed_exports_dir: str = os.path.abspath("data/exports")
+    precompressed_exports_max_mb: int = 256
+
+    def engine_options(self) -> dict:
+        """Keyword arguments of ``create_engine`` for ``database_url``"""
+        options = {
+            "pool_pre_ping": self.db_pool_pre_ping,
+            "query_cache_size": self.db_statement_cache_size,
+        }
+        if self.database_url.startswith("sqlite"):
+            # No server connection limit, and :memory: uses a single connection
+            return options
+
+        # This worker's share of the connections the database accepts
+        share = max(self.db_max_connections // max(self.workers, 1), 1)
+        pool_size = self.db_pool_size or min(self.threads, share)
+        max_overflow = self.db_max_overflow
+        if max_overflow is None:
+            max_overflow = max(min(share - pool_size, pool_size), 0)
+        return {
+            **options,
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_recycle": self.db_pool_recycle,
+            "pool_timeout": self.db_pool_timeout,
+        }
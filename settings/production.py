@@ -1,3 +1,5 @@
+import os
+
 from pydantic import ConfigDict
 
 from .base import Settings
@@ -20,6 +22,24 @@ class ProductionSettings(Settings):
 
     # Production-specific settings
     reload: bool = False
+    # gunicorn: two workers per CPU plus one, each with a few threads
+    workers: int = (os.cpu_count() or 1) * 2 + 1
+    threads: int = 4
+    max_requests: int = 1000
+    max_requests_jitter: int = 100
+    pidfile: str = os.path.abspath("data/server.pid")
+    # Under PostgreSQL's default max_connections (100), leaving room for
+    # imports and administration; recycle before idle connections are cut
+    db_max_connections: int = 80
+    db_pool_recycle: int = 1800
+    # Connections dropped by failovers or proxies are replaced, not failed
+    db_pool_pre_ping: bool = True
+    # Workers share cached responses, reads outnumber imports by far
+    response_cache: str = "filesystem"
+    # API clients poll the endpoints, let them revalidate instead of download
+    conditional_requests: bool = True
+    # Bulk consumers download the same full-table exports after each import
+    precompressed_exports: bool = True
     log_level: str = "info"
 
     # CORS settings for production
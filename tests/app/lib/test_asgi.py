@@ -0,0 +1,160 @@
+import asyncio
+
+import pytest
+
+from app.lib.asgi import async_url, wsgi_environ
+
+
+def http_scope(path, query_string=b"", headers=()):
+    return {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "root_path": "",
+        "query_string": query_string,
+        "headers": list(headers),
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 50000),
+    }
+
+
+async def call(asgi_app, path, query_string=b"", headers=()):
+    """Status, headers and body of a GET request to an ASGI application"""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await asgi_app(http_scope(path, query_string, headers), receive, send)
+    start, *bodies = messages
+    return (
+        start["status"],
+        dict(start["headers"]),
+        b"".join(message["body"] for message in bodies),
+    )
+
+
+class TestAsyncUrl:
+    @pytest.mark.parametrize(
+        ("url", "expected"),
+        [
+            ("sqlite:///data/app.db", "sqlite+aiosqlite:///data/app.db"),
+            ("sqlite+aiosqlite:///data/app.db", "sqlite+aiosqlite:///data/app.db"),
+            (
+                "postgresql://user:secret@db/quorum",
+                "postgresql+asyncpg://user:secret@db/quorum",
+            ),
+            ("postgresql+psycopg://db/quorum", "postgresql+psycopg://db/quorum"),
+        ],
+    )
+    def test_async_driver(self, url, expected):
+        """Test blocking drivers are swapped for their asyncio counterpart"""
+        assert async_url(url) == expected
+
+
+class TestWsgiEnviron:
+    def test_request_fields(self):
+        """Test the ASGI scope is translated to PEP 3333 keys"""
+        environ = wsgi_environ(
+            http_scope(
+                "/legislators/é",
+                b"format=json",
+                [
+                    (b"accept", b"application/json"),
+                    (b"content-type", b"text/plain"),
+                    (b"x-forwarded-for", b"10.0.0.1"),
+                    (b"x-forwarded-for", b"10.0.0.2"),
+                ],
+            ),
+            b"body",
+        )
+
+        assert environ["REQUEST_METHOD"] == "GET"
+        assert environ["PATH_INFO"] == "/legislators/é".encode().decode("latin-1")
+        assert environ["QUERY_STRING"] == "format=json"
+        assert environ["HTTP_ACCEPT"] == "application/json"
+        assert environ["CONTENT_TYPE"] == "text/plain"
+        assert environ["HTTP_X_FORWARDED_FOR"] == "10.0.0.1,10.0.0.2"
+        assert environ["REMOTE_ADDR"] == "127.0.0.1"
+        assert environ["wsgi.input"].read() == b"body"
+
+
+class TestAsyncApp:
+    @pytest.fixture
+    def asgi_app(self, monkeypatch, tmp_path):
+        pytest.importorskip("aiosqlite")
+        pytest.importorskip("greenlet")
+        from app import create_asgi_app, db
+        from app.models import Legislator
+        from settings import settings
+
+        monkeypatch.setattr(
+            settings,
+            "database_url",
+            f"sqlite+aiosqlite:///{tmp_path / 'async.db'}",
+        )
+        asgi_app = create_asgi_app()
+        with asgi_app.app.app_context():
+            db.session.add_all(
+                Legislator(id=id_, name=f"Legislator {id_}") for id_ in range(1, 31)
+            )
+            db.session.commit()
+            db.session.remove()
+            db.engine.dispose()
+
+        yield asgi_app
+
+        asyncio.run(asgi_app.engine.dispose())
+
+    def test_same_responses_as_wsgi(self, asgi_app):
+        """Test views run unchanged on the async session"""
+        expected = asgi_app.app.test_client().get("/legislators?format=json")
+
+        status, headers, body = asyncio.run(
+            call(asgi_app, "/legislators", b"format=json"),
+        )
+
+        assert status == 200
+        assert headers[b"content-type"] == b"application/json"
+        assert body == expected.get_data()
+
+    def test_streamed_csv(self, asgi_app, monkeypatch):
+        """Test CSV exports are streamed chunk by chunk"""
+        from app.lib.multi_response import MultiResponse
+
+        monkeypatch.setattr(MultiResponse, "CSV_CHUNK_SIZE", 7)
+
+        status, _, body = asyncio.run(call(asgi_app, "/legislators", b"format=csv"))
+
+        assert status == 200
+        assert body.count(b"\n") == 31  # Header and every legislator
+
+    def test_concurrent_requests(self, asgi_app):
+        """Test requests overlap on one event loop, each with its own session"""
+
+        async def many():
+            return await asyncio.gather(
+                *(
+                    call(asgi_app, f"/legislators/{id_}", b"format=json")
+                    for id_ in range(1, 11)
+                ),
+            )
+
+        responses = asyncio.run(many())
+
+        assert [status for status, _, _ in responses] == [200] * 10
+        assert all(
+            f'"id":{id_},'.encode() in body
+            for id_, (_, _, body) in enumerate(responses, start=1)
+        )
+
+    def test_not_found(self, asgi_app):
+        """Test errors are rendered by Flask as usual"""
+        status, _, _ = asyncio.run(call(asgi_app, "/legislators/999"))
+
+        assert status == 404
@@ -0,0 +1,129 @@
+import pytest
+
+from app import db
+from app.services.data_versions import DataVersions
+from tests.factories import create_legislator
+
+
+@pytest.fixture
+def conditional_client(make_app):
+    app = make_app(conditional_requests=True)
+    create_legislator(name="Alice")
+    DataVersions(db.session).bump()
+    db.session.commit()
+    return app.test_client()
+
+
+class TestConditionalRequests:
+    def test_validators(self, conditional_client):
+        """Test read responses carry a strong ETag, Last-Modified and Vary"""
+        response = conditional_client.get("/legislators?format=json")
+
+        assert response.status_code == 200
+        etag, weak = response.get_etag()
+        assert etag
+        assert not weak
+        assert response.last_modified is not None
+        assert "Accept" in response.vary
+
+    def test_if_none_match(self, conditional_client, max_queries):
+        """Test a matching ETag is answered with 304 after one lookup"""
+        etag = conditional_client.get("/legislators?format=json").headers["ETag"]
+
+        with max_queries(1):
+            response = conditional_client.get(
+                "/legislators?format=json",
+                headers={"If-None-Match": etag},
+            )
+
+        assert response.status_code == 304
+        assert response.get_data() == b""
+        assert response.headers["ETag"] == etag
+
+    def test_if_modified_since(self, conditional_client):
+        """Test a date at or after the last import is answered with 304"""
+        first = conditional_client.get("/legislators")
+
+        response = conditional_client.get(
+            "/legislators",
+            headers={"If-Modified-Since": first.headers["Last-Modified"]},
+        )
+
+        assert response.status_code == 304
+
+    def test_if_none_match_takes_precedence(self, conditional_client):
+        """Test If-Modified-Since is ignored when If-None-Match is sent"""
+        first = conditional_client.get("/legislators")
+
+        response = conditional_client.get(
+            "/legislators",
+            headers={
+                "If-None-Match": '"stale"',
+                "If-Modified-Since": first.headers["Last-Modified"],
+            },
+        )
+
+        assert response.status_code == 200
+
+    def test_etag_depends_on_format_and_args(self, conditional_client):
+        """Test each representation of the data has its own ETag"""
+        legislator = create_legislator()
+        etags = {
+            conditional_client.get(url).headers["ETag"]
+            for url in (
+                "/legislators",
+                "/legislators?format=json",
+                "/legislators?format=json&limit=1",
+                f"/legislators/{legislator.id}?format=json",
+            )
+        }
+
+        assert len(etags) == 4
+
+    def test_etag_depends_on_content_coding(self, conditional_client):
+        """Test compressed and identity bodies have distinct ETags"""
+        plain = conditional_client.get("/legislators")
+        compressed = conditional_client.get(
+            "/legislators",
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+        assert compressed.headers["ETag"] != plain.headers["ETag"]
+
+    def test_import_changes_etag(self, conditional_client):
+        """Test a bumped data version invalidates previous ETags"""
+        etag = conditional_client.get("/legislators").headers["ETag"]
+        DataVersions(db.session).bump()
+        db.session.commit()
+
+        response = conditional_client.get(
+            "/legislators",
+            headers={"If-None-Match": etag},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_errors_have_no_validators(self, conditional_client):
+        """Test only successful responses get an ETag"""
+        response = conditional_client.get("/legislators/999")
+
+        assert response.status_code == 404
+        assert "ETag" not in response.headers
+
+    def test_cache_hits_are_validated(self, make_app):
+        """Test responses replayed by the response cache keep their ETag"""
+        client = make_app(
+            conditional_requests=True,
+            response_cache="memory",
+        ).test_client()
+        first = client.get("/legislators?format=json")
+
+        second = client.get("/legislators?format=json")
+
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.headers["ETag"] == first.headers["ETag"]
+
+    def test_disabled_by_default(self, client, db_session):
+        """Test the default settings add no validators"""
+        assert "ETag" not in client.get("/legislators").headers
@@ -0,0 +1,214 @@
+import gzip
+import zlib
+
+import pytest
+
+from app import db
+from app.lib.content_encoding import CODECS, brotli, compress, zstd
+from app.lib.multi_response import MultiResponse
+from app.services.data_versions import DataVersions
+from tests.factories import create_bill, create_legislator, create_legislators
+
+
+def decompress(body, coding):
+    if coding == "gzip":
+        return gzip.decompress(body)
+    if coding == "br":
+        return brotli.decompress(body)
+    if zstd.__name__ == "zstandard":
+        return zstd.ZstdDecompressor().decompressobj().decompress(body)
+    return zstd.decompress(body)
+
+
+@pytest.fixture
+def exports_app(make_app, tmp_path):
+    app = make_app(
+        precompressed_exports=True,
+        precompressed_exports_dir=str(tmp_path / "exports"),
+    )
+    create_legislators(50)
+    DataVersions(db.session).bump()
+    db.session.commit()
+    return app
+
+
+class TestCompression:
+    def test_json_is_compressed(self, client, db_session):
+        """Test bodies above the threshold use the accepted coding"""
+        create_legislators(50)
+
+        plain = client.get("/legislators?format=json")
+        response = client.get(
+            "/legislators?format=json",
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.vary
+        assert len(response.get_data()) < len(plain.get_data())
+        assert gzip.decompress(response.get_data()) == plain.get_data()
+
+    @pytest.mark.parametrize("coding", list(CODECS))
+    def test_codecs(self, client, db_session, coding):
+        """Test each available codec round trips"""
+        create_legislators(50)
+
+        plain = client.get("/legislators?format=json").get_data()
+        response = client.get(
+            "/legislators?format=json",
+            headers={"Accept-Encoding": coding},
+        )
+
+        assert response.headers["Content-Encoding"] == coding
+        assert decompress(response.get_data(), coding) == plain
+
+    def test_client_preference(self, client, db_session):
+        """Test qualities decide, ties going to the preferred codec"""
+        create_legislators(50)
+
+        weighted = client.get(
+            "/legislators?format=json",
+            headers={"Accept-Encoding": "br;q=0.5, gzip"},
+        )
+        tied = client.get(
+            "/legislators?format=json",
+            headers={"Accept-Encoding": "gzip, " + ", ".join(CODECS)},
+        )
+
+        assert weighted.headers["Content-Encoding"] == "gzip"
+        assert tied.headers["Content-Encoding"] == next(iter(CODECS))
+
+    def test_small_bodies_are_sent_as_is(self, client, db_session):
+        """Test bodies below the threshold are not worth compressing"""
+        legislator = create_legislator()
+
+        response = client.get(
+            f"/legislators/{legislator.id}?format=json",
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+        assert "Content-Encoding" not in response.headers
+        assert response.is_json
+
+    def test_streamed_csv(self, client, db_session):
+        """Test CSV exports are compressed chunk by chunk"""
+        create_legislators(3)
+
+        plain = client.get("/legislators?format=csv")
+        response = client.get(
+            "/legislators?format=csv",
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+        assert response.is_streamed
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Content-Length" not in response.headers
+        assert gzip.decompress(response.get_data()) == plain.get_data()
+
+
+class TestPrecompressedExports:
+    def test_export_is_sent_from_disk(self, exports_app, max_queries):
+        """Test a complete export is reused until the next import"""
+        client = exports_app.test_client()
+        headers = {"Accept-Encoding": "gzip"}
+        first = client.get("/legislators?format=csv", headers=headers)
+        body = first.get_data()
+
+        with max_queries(1):
+            second = client.get("/legislators?format=csv", headers=headers)
+
+        assert second.headers["X-Precompressed"] == "HIT"
+        assert second.get_data() == body
+        assert second.headers["Content-Encoding"] == "gzip"
+        disposition = first.headers["Content-Disposition"]
+        assert second.headers["Content-Disposition"] == disposition
+        assert second.content_length == len(body)
+
+    def test_import_replaces_export(self, exports_app, tmp_path):
+        """Test a new data version is exported again and the old file deleted"""
+        client = exports_app.test_client()
+        headers = {"Accept-Encoding": "gzip"}
+        client.get("/legislators?format=csv", headers=headers).get_data()
+        create_legislator(name="Newcomer")
+        DataVersions(db.session).bump()
+        db.session.commit()
+
+        response = client.get("/legislators?format=csv", headers=headers)
+        body = response.get_data()
+
+        assert "X-Precompressed" not in response.headers
+        assert b"Newcomer" in gzip.decompress(body)
+        assert len(list((tmp_path / "exports").iterdir())) == 1
+
+    def test_unfinished_export_is_not_kept(self, exports_app, tmp_path, monkeypatch):
+        """Test an export closed before its end leaves no file"""
+        monkeypatch.setattr(MultiResponse, "CSV_CHUNK_SIZE", 10)
+        client = exports_app.test_client()
+        response = client.get(
+            "/legislators?format=csv",
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+        next(iter(response.response))
+        assert list((tmp_path / "exports").glob("*.tmp"))
+        response.close()
+
+        assert list((tmp_path / "exports").iterdir()) == []
+
+    def test_only_whole_tables_are_kept(self, exports_app, tmp_path):
+        """Test paged or filtered exports are streamed, never stored"""
+        client = exports_app.test_client()
+        headers = {"Accept-Encoding": "gzip"}
+        for _ in range(2):
+            for query in ["junk=0", "junk=1", "limit=10"]:
+                response = client.get(
+                    f"/legislators?format=csv&{query}",
+                    headers=headers,
+                )
+                response.get_data()
+                assert "X-Precompressed" not in response.headers
+
+        assert list((tmp_path / "exports").iterdir()) == []
+        assert 'rel="next"' in response.headers["Link"]
+
+    def test_stored_headers_are_replayed(self, exports_app):
+        """Test a hit sends the headers of the export it was stored from"""
+        client = exports_app.test_client()
+        headers = {"Accept-Encoding": "gzip"}
+
+        @exports_app.after_request
+        def add_link(response):
+            if "X-Precompressed" not in response.headers:
+                response.headers["Link"] = "<https://example.com>; rel=next"
+            return response
+
+        client.get("/legislators?format=csv", headers=headers).get_data()
+        response = client.get("/legislators?format=csv", headers=headers)
+
+        assert response.headers["X-Precompressed"] == "HIT"
+        assert response.headers["Link"] == "<https://example.com>; rel=next"
+
+    def test_exports_are_pruned_to_budget(self, exports_app, tmp_path):
+        """Test the least recently used exports go beyond the byte budget"""
+        create_bill()
+        DataVersions(db.session).bump()
+        db.session.commit()
+        client = exports_app.test_client()
+        headers = {"Accept-Encoding": "gzip"}
+        client.get("/legislators?format=csv", headers=headers).get_data()
+        (legislators,) = (tmp_path / "exports").iterdir()
+        exports = exports_app.extensions["compression"].exports
+        exports.max_bytes = legislators.stat().st_size
+
+        client.get("/bills?format=csv", headers=headers).get_data()
+
+        assert [path.name for path in (tmp_path / "exports").iterdir()] == [
+            f"bills.list_bills.1.0.0.gzip-{DataVersions(db.session).current()}",
+        ]
+
+
+def test_compress():
+    """Test whole bodies are complete streams of the coding"""
+    body = compress(b"a" * 100, "gzip")
+
+    assert zlib.decompress(body, 16 + zlib.MAX_WBITS) == b"a" * 100
@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import text
+
+from app import db
+from app.lib.engine import sqlite_pragmas
+
+
+def pragma(name):
+    return db.session.execute(text(f"PRAGMA {name}")).scalar()
+
+
+class TestSqlitePragmas:
+    def test_serving_profile(self, make_app, tmp_path):
+        """Test new connections of file databases use WAL and the profile"""
+        make_app(database_url=f"sqlite:///{tmp_path / 'serving.db'}")
+
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("temp_store") == 2  # MEMORY
+        assert pragma("cache_size") == -64 * 1024
+        assert pragma("busy_timeout") == 5000
+
+    def test_import_profile_and_overrides(self, make_app, tmp_path):
+        """Test the import profile and single pragmas from the settings"""
+        make_app(
+            database_url=f"sqlite:///{tmp_path / 'import.db'}",
+            db_profile="import",
+            sqlite_pragmas={"cache_size": -1000},
+        )
+
+        assert pragma("synchronous") == 1  # NORMAL, the file survives a crash
+        assert pragma("busy_timeout") == 30000
+        assert pragma("cache_size") == -1000
+
+    def test_unsynced_writes_are_opt_in(self, make_app, tmp_path):
+        """Test synchronous = off is only set when asked for"""
+        make_app(
+            database_url=f"sqlite:///{tmp_path / 'scratch.db'}",
+            db_profile="import",
+            sqlite_pragmas={"synchronous": "off"},
+        )
+
+        assert pragma("synchronous") == 0  # OFF
+
+    def test_unknown_profile(self):
+        """Test a misspelled profile is reported"""
+        with pytest.raises(ValueError, match="Unknown database profile"):
+            sqlite_pragmas("reading")
+
+    def test_values_are_checked(self):
+        """Test pragmas are interpolated only when they are words or numbers"""
+        with pytest.raises(ValueError, match="Invalid SQLite pragma"):
+            sqlite_pragmas("serving", {"cache_size": "0; DROP TABLE bills"})
@@ -0,0 +1,119 @@
+import copy
+import json
+import logging
+import re
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.lib.instrumentation import MetricsRegistry, RequestMetrics
+from tests.factories import create_bill, create_legislator
+
+
+@pytest.fixture
+def instrumented_client(make_app):
+    return make_app(instrumentation=True).test_client()
+
+
+def server_timing(response):
+    return dict(
+        re.findall(r"(\w+);dur=([\d.]+)", response.headers["Server-Timing"]),
+    )
+
+
+class TestInstrumentation:
+    def test_disabled_by_default(self, client):
+        """Test the default settings add no header and no metrics endpoint"""
+        assert "Server-Timing" not in client.get("/bills").headers
+        assert client.get("/metrics").status_code == 404
+
+    def test_server_timing_header(self, instrumented_client):
+        """Test responses report their SQL count and the time of each phase"""
+        create_bill(sponsor=create_legislator())
+
+        response = instrumented_client.get("/bills?format=json")
+
+        assert response.status_code == 200
+        timings = server_timing(response)
+        assert set(timings) == {"db", "tpl", "ser", "total"}
+        assert float(timings["ser"]) > 0
+        assert float(timings["tpl"]) == 0
+        queries = re.search(r'desc="(\d+) queries"', response.headers["Server-Timing"])
+        assert int(queries.group(1)) >= 1
+
+    def test_template_time(self, instrumented_client):
+        """Test HTML responses measure template rendering"""
+        create_bill()
+
+        timings = server_timing(instrumented_client.get("/bills"))
+
+        assert float(timings["tpl"]) > 0
+        assert float(timings["ser"]) == 0
+
+    def test_request_log(self, instrumented_client, caplog):
+        """Test each request is logged as one JSON line"""
+        with caplog.at_level(logging.INFO, logger="app.lib.instrumentation"):
+            instrumented_client.get("/bills?format=json")
+
+        (record,) = caplog.records
+        fields = json.loads(record.getMessage())
+        assert fields["endpoint"] == "bills.list_bills"
+        assert fields["status"] == 200
+        assert fields["queries"] >= 1
+        assert {"duration_ms", "db_ms", "template_ms", "serialize_ms"} <= set(fields)
+
+    def test_metrics_endpoint(self, instrumented_client):
+        """Test /metrics aggregates requests per endpoint for Prometheus"""
+        instrumented_client.get("/bills?format=json")
+        instrumented_client.get("/bills/999")
+
+        response = instrumented_client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.content_type.startswith("text/plain; version=0.0.4")
+        body = response.get_data(as_text=True)
+        assert (
+            'quorum_http_requests_total{endpoint="bills.list_bills",'
+            'method="GET",status="200"} 1'
+        ) in body
+        assert (
+            'quorum_http_requests_total{endpoint="bills.show_bill",'
+            'method="GET",status="404"} 1'
+        ) in body
+        assert "# TYPE quorum_db_queries_per_request histogram" in body
+
+    def test_failed_statements_leave_no_state(self, make_app):
+        """Test statements that raise keep nothing on their pooled connection"""
+        from app import db
+
+        make_app(instrumentation=True)
+        with db.engine.connect() as connection:
+            info = copy.deepcopy(connection.info)
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    connection.exec_driver_sql("SELECT * FROM missing_table")
+
+            assert connection.info == info
+
+
+class TestMetricsRegistry:
+    def test_histogram_buckets_are_cumulative(self):
+        """Test bucket counts include every smaller bucket"""
+        registry = MetricsRegistry()
+        for queries in (1, 3, 3, 1000):
+            metrics = RequestMetrics()
+            metrics.queries = queries
+            metrics.status = 200
+            registry.observe("bills.list_bills", "GET", metrics)
+
+        body = registry.render()
+
+        prefix = 'quorum_db_queries_per_request_bucket{endpoint="bills.list_bills"'
+        assert f'{prefix},le="1"}} 1' in body
+        assert f'{prefix},le="2"}} 1' in body
+        assert f'{prefix},le="5"}} 3' in body
+        assert f'{prefix},le="+Inf"}} 4' in body
+        assert (
+            'quorum_db_queries_per_request_sum{endpoint="bills.list_bills"} 1007'
+            in body
+        )
@@ -0,0 +1,116 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app import db
+from app.models import Legislator
+from app.models.data_version import DataVersion
+
+
+def write(url, *names, version=1):
+    """Add legislators to a database outside of the app, at a data version"""
+    engine = create_engine(url)
+    db.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add_all(Legislator(name=name) for name in names)
+        session.merge(DataVersion(id=1, version=version))
+        session.commit()
+    engine.dispose()
+
+
+def names(client):
+    response = client.get("/legislators?format=json")
+    return {legislator["name"] for legislator in response.get_json()["legislators"]}
+
+
+@pytest.fixture
+def urls(tmp_path):
+    return (
+        f"sqlite:///{tmp_path / 'primary.db'}",
+        f"sqlite:///{tmp_path / 'replica.db'}",
+    )
+
+
+@pytest.fixture
+def replicated_app(make_app, urls):
+    primary, replica = urls
+    # Same data version on both, rows told apart by their names
+    write(primary, "Primary Alice")
+    write(replica, "Replica Alice")
+    return make_app(
+        database_url=primary,
+        database_replica_urls=[replica],
+        replica_check_seconds=0,
+    )
+
+
+class TestReplicas:
+    def test_reads_go_to_the_replica(self, replicated_app):
+        """Test read blueprints are served by an up to date replica"""
+        assert names(replicated_app.test_client()) == {"Replica Alice"}
+
+    def test_lagging_replica(self, replicated_app, urls):
+        """Test the primary serves reads while a replica misses an import"""
+        client = replicated_app.test_client()
+        write(urls[0], "Primary Bob", version=2)
+
+        assert names(client) == {"Primary Alice", "Primary Bob"}
+
+        write(urls[1], "Replica Bob", version=2)
+        assert names(client) == {"Replica Alice", "Replica Bob"}
+
+    def test_failed_replica(self, make_app, urls, tmp_path):
+        """Test the primary serves reads when no replica answers"""
+        write(urls[0], "Primary Alice")
+        app = make_app(
+            database_url=urls[0],
+            database_replica_urls=[f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"],
+        )
+
+        assert names(app.test_client()) == {"Primary Alice"}
+
+    def test_replica_failing_after_its_check(self, make_app, urls, tmp_path):
+        """Test a replica failing mid-request has its reads retried on the primary"""
+        replica_dir = tmp_path / "replica"
+        replica_dir.mkdir()
+        replica = f"sqlite:///{replica_dir / 'replica.db'}"
+        write(urls[0], "Primary Alice")
+        write(replica, "Replica Alice")
+        app = make_app(
+            database_url=urls[0],
+            database_replica_urls=[replica],
+            replica_check_seconds=60,
+        )
+        client = app.test_client()
+        assert names(client) == {"Replica Alice"}
+
+        db.session.remove()  # As the app context of a server request would
+        db.engines["replica_1"].dispose()
+        replica_dir.rename(tmp_path / "gone")
+        response = client.get("/legislators?format=json")
+
+        assert response.status_code == 200
+        assert {item["name"] for item in response.get_json()["legislators"]} == {
+            "Primary Alice",
+        }
+        assert names(client) == {"Primary Alice"}
+
+    def test_writes_go_to_the_primary(self, replicated_app, urls):
+        """Test sessions outside of read requests write to the primary"""
+        db.session.add(Legislator(name="Written"))
+        db.session.commit()
+
+        with Session(create_engine(urls[0])) as primary:
+            assert primary.query(Legislator).filter_by(name="Written").count() == 1
+
+    def test_other_blueprints_use_the_primary(self, make_app, urls):
+        """Test only the configured blueprints are routed"""
+        write(urls[0], "Primary Alice")
+        write(urls[1], "Replica Alice")
+        app = make_app(
+            database_url=urls[0],
+            database_replica_urls=[urls[1]],
+            replica_blueprints=["bills"],
+        )
+
+        assert names(app.test_client()) == {"Primary Alice"}
@@ -0,0 +1,110 @@
+import pytest
+
+from app import db
+from app.lib.response_cache import CachedResponse, FileSystemBackend, MemoryBackend
+from app.services.importers import LegislatorImporter
+from tests.factories import create_legislator
+
+
+def entry(size):
+    return CachedResponse(200, [("Content-Type", "text/plain")], b"x" * size)
+
+
+@pytest.fixture(params=["memory", "filesystem"])
+def cached_client(request, make_app, tmp_path):
+    app = make_app(
+        response_cache=request.param,
+        response_cache_dir=str(tmp_path / "cache"),
+    )
+    return app.test_client()
+
+
+class TestResponseCache:
+    def test_second_request_is_a_hit(self, cached_client, max_queries):
+        """Test cached responses only cost the data version lookup"""
+        create_legislator(name="Alice")
+
+        first = cached_client.get("/legislators?format=json")
+        with max_queries(1):
+            second = cached_client.get("/legislators?format=json")
+
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.get_data() == first.get_data()
+        assert second.content_type == first.content_type
+
+    def test_key_includes_format_and_args(self, cached_client):
+        """Test other formats and query arguments are cached separately"""
+        create_legislator()
+        cached_client.get("/legislators?format=json")
+
+        assert cached_client.get("/legislators").headers["X-Cache"] == "MISS"
+        response = cached_client.get("/legislators?format=json&limit=1")
+        assert response.headers["X-Cache"] == "MISS"
+        # Same URL as the HTML page, negotiated to JSON
+        response = cached_client.get(
+            "/legislators",
+            headers={"Accept": "application/json"},
+        )
+        assert response.headers["X-Cache"] == "MISS"
+        assert response.is_json
+
+    def test_import_invalidates(self, cached_client, tmp_path):
+        """Test an import bumps the data version, so responses are recomputed"""
+        cached_client.get("/legislators?format=json")
+        csv_path = tmp_path / "legislators.csv"
+        csv_path.write_text("id,name\n1,Imported Legislator\n")
+
+        LegislatorImporter(db.session).import_from_file(str(csv_path))
+        response = cached_client.get("/legislators?format=json")
+
+        assert response.headers["X-Cache"] == "MISS"
+        assert "Imported Legislator" in response.get_data(as_text=True)
+
+    def test_errors_are_not_cached(self, cached_client):
+        """Test only successful responses are cached"""
+        cached_client.get("/legislators/999")
+
+        assert cached_client.get("/legislators/999").headers["X-Cache"] == "MISS"
+
+    def test_disabled_by_default(self, client, db_session):
+        """Test the default settings do not cache"""
+        assert "X-Cache" not in client.get("/legislators").headers
+
+
+class TestMemoryBackend:
+    def test_least_recently_used_is_evicted(self):
+        """Test entries are evicted in LRU order to stay within the budget"""
+        backend = MemoryBackend(max_bytes=30)
+        backend.set("a", entry(10))
+        backend.set("b", entry(10))
+        backend.set("c", entry(10))
+        backend.get("a")
+
+        backend.set("d", entry(10))
+
+        assert backend.get("b") is None
+        assert backend.get("a") is not None
+        assert backend.size == 30
+
+
+class TestFileSystemBackend:
+    def test_round_trip(self, tmp_path):
+        """Test entries are shared through the directory"""
+        FileSystemBackend(tmp_path, max_bytes=1000).set("key", entry(5))
+
+        cached = FileSystemBackend(tmp_path, max_bytes=1000).get("key")
+
+        assert cached == entry(5)
+        assert FileSystemBackend(tmp_path, max_bytes=1000).get("other") is None
+
+    def test_prune_to_budget(self, tmp_path):
+        """Test pruning deletes the oldest entries beyond the budget"""
+        backend = FileSystemBackend(tmp_path, max_bytes=10**6)
+        for key in ("a", "b", "c"):
+            backend.set(key, entry(1000))
+        backend.max_bytes = 2500
+
+        backend.prune()
+
+        assert len(list(tmp_path.iterdir())) == 2
@@ -0,0 +1,85 @@
+import json
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import pytest
+
+from app.lib.serializers import ModelSerializer, dumps, serializer_for
+from app.models.bill import Bill
+from app.models.vote_result import VoteResult
+from tests.factories import create_bill, create_vote_result
+
+
+class TestModelSerializer:
+    def test_introspects_columns_and_properties(self):
+        """Test columns and public properties are collected once per class"""
+        serializer = ModelSerializer(VoteResult)
+
+        assert "id" in serializer.columns
+        assert "vote_type" in serializer.columns
+        assert {"is_yea", "is_nay", "vote_type_label"} <= set(serializer.properties)
+        assert not [name for name in serializer.properties if name.startswith("_")]
+
+    def test_registry_reuses_serializers(self):
+        """Test the registry builds one serializer per model class"""
+        assert serializer_for(Bill) is serializer_for(Bill)
+
+    def test_serialize_matches_to_json(self, db_session):
+        """Test serialization includes columns and computed properties"""
+        vote_result = create_vote_result(_vote_type=1)
+
+        data = serializer_for(VoteResult).serialize(vote_result)
+
+        assert data == vote_result.to_json()
+        assert data["vote_id"] == vote_result.vote_id
+        assert data["is_yea"] is True
+        assert data["vote_type_label"] == "Yea"
+
+    def test_serialize_included_properties_only(self, db_session):
+        """Test routes can choose which computed properties to include"""
+        bill = create_bill()
+
+        data = serializer_for(Bill).serialize(bill, ["sponsor_name"])
+
+        assert data["title"] == bill.title
+        assert data["sponsor_name"] == bill.sponsor_name
+        assert "vote_results_count" not in data
+
+    def test_serialize_unknown_property(self, db_session):
+        """Test including an unknown property is an error"""
+        bill = create_bill()
+
+        with pytest.raises(ValueError, match="Unknown properties for Bill"):
+            serializer_for(Bill).serialize(bill, ["missing"])
+
+    def test_serialize_for_json_include_by_context_key(self, db_session):
+        """Test context-level includes apply to the matching key only"""
+        bills = [create_bill(), create_bill()]
+
+        data = Bill.serialize_for_json(
+            {"bills": bills, "bill": bills[0]},
+            {"bills": ["sponsor_name"]},
+        )
+
+        assert [
+            set(item) - set(serializer_for(Bill).columns) for item in data["bills"]
+        ] == [
+            {"sponsor_name"},
+            {"sponsor_name"},
+        ]
+        assert "vote_results_count" in data["bill"]
+
+
+class TestDumps:
+    def test_encodes_dates_and_decimals(self):
+        """Test dates are encoded like Flask's JSON provider"""
+        data = json.loads(
+            dumps(
+                {
+                    "at": datetime(2024, 1, 2, 3, 4, 5, tzinfo=UTC),
+                    "amount": Decimal("1.5"),
+                },
+            ),
+        )
+
+        assert data == {"at": "Tue, 02 Jan 2024 03:04:05 GMT", "amount": "1.5"}
@@ -1,3 +1,5 @@
+from sqlalchemy import text
+
 from tests.factories import (
     create_bill,
     create_bills,
@@ -65,3 +67,22 @@ class TestBill:
         assert len(bills) == 3
         assert all(bill.id is not None for bill in bills)
         assert len(set(bill.id for bill in bills)) == 3  # All IDs are unique
+
+    def test_bills_by_sponsor_use_an_index(self, db_session):
+        """Test the sponsor's bills are looked up without scanning bills"""
+        plan = db_session.execute(
+            text("EXPLAIN QUERY PLAN SELECT id FROM bills WHERE sponsor_id = 1"),
+        ).all()
+
+        assert "INDEX ix_bills_sponsor_id" in plan[-1].detail
+
+    def test_vote_tallies_by_bill_use_an_index(self, db_session):
+        """Test the tallies of bills are looked up without scanning the table"""
+        plan = db_session.execute(
+            text(
+                "EXPLAIN QUERY PLAN "
+                "SELECT id FROM bill_vote_tallies WHERE bill_id IN (1, 2)",
+            ),
+        ).all()
+
+        assert "INDEX ix_bill_vote_tallies_bill_id" in plan[-1].detail
@@ -1,3 +1,5 @@
+from sqlalchemy import text
+
 from tests.factories import (
     create_bill,
     create_legislator,
@@ -49,3 +51,11 @@ class TestVote:
         assert len(votes) == 3
         assert all(vote.id is not None for vote in votes)
         assert len(set(vote.id for vote in votes)) == 3
+
+    def test_votes_by_bill_use_an_index(self, db_session):
+        """Test the votes of a bill are looked up without scanning votes"""
+        plan = db_session.execute(
+            text("EXPLAIN QUERY PLAN SELECT id FROM votes WHERE bill_id = 1"),
+        ).all()
+
+        assert "INDEX ix_votes_bill_id" in plan[-1].detail
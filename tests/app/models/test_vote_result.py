@@ -1,3 +1,6 @@
+from sqlalchemy import text
+
+from app.models.vote_result import VoteResult
 from tests.factories import (
     create_bill,
     create_legislator,
@@ -52,3 +55,41 @@ class TestVoteResult:
         assert len(vote_results) == 5
         assert all(vote_result.id is not None for vote_result in vote_results)
         assert len(set(vote_result.id for vote_result in vote_results)) == 5
+
+    def test_vote_result_csv(self, db_session):
+        """Test CSV headers are computed once and rows follow them"""
+        vote_result = create_vote_result(_vote_type=1)
+
+        headers = VoteResult.csv_headers()
+        assert headers[0] == "id"
+        assert VoteResult.csv_headers() is headers
+        assert vote_result.to_csv() == [
+            getattr(vote_result, column_name) for column_name in headers
+        ]
+
+    def test_vote_result_csv_select(self, db_session):
+        """Test the CSV export is a Core SELECT returning plain tuples"""
+        vote_result = create_vote_result(_vote_type=2)
+
+        statement = VoteResult.csv_select(
+            VoteResult.query.filter(VoteResult.id == vote_result.id),
+        )
+        rows = db_session.execute(statement).all()
+
+        assert list(statement.selected_columns.keys()) == list(VoteResult.csv_headers())
+        assert [tuple(row) for row in rows] == [tuple(vote_result.to_csv())]
+
+    def test_vote_types_are_read_from_covering_indexes(self, db_session):
+        """Test vote types by vote or legislator never read the table"""
+        queries = {
+            "ix_vote_results_vote_id_vote_type": (
+                "SELECT vote_type FROM vote_results WHERE vote_id = 1"
+            ),
+            "ix_vote_results_legislator_id_vote_type": (
+                "SELECT vote_type FROM vote_results WHERE legislator_id = 1"
+            ),
+        }
+        for index_name, query in queries.items():
+            plan = db_session.execute(text(f"EXPLAIN QUERY PLAN {query}")).all()
+
+            assert f"COVERING INDEX {index_name}" in plan[-1].detail
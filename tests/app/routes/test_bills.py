@@ -1,4 +1,4 @@
-from tests.factories import create_bill, create_legislator
+from tests.factories import create_bill, create_bills, create_legislator
 
 
 class TestBills:
@@ -25,6 +25,18 @@ class TestBills:
         assert data["bills"][0]["title"] == "Test Bill"
         assert data["bills"][0]["id"] == bill.id
 
+    def test_list_bills_json_fields(self, client, db_session):
+        """Test the bills list serializes the fields it renders, a bill all of them"""
+        bill = create_bill(sponsor=create_legislator(name="Test Legislator"))
+
+        listed = client.get("/bills?format=json").get_json()["bills"][0]
+        shown = client.get(f"/bills/{bill.id}?format=json").get_json()["bill"]
+
+        assert listed["sponsor_name"] == "Test Legislator"
+        assert listed["votes_count"] == 0
+        assert "yea_count" not in listed
+        assert shown["yea_count"] == 0
+
     def test_list_bills_json_accept_header(self, client, db_session):
         """Test bills list with Accept: application/json header"""
         legislator = create_legislator(name="Test Legislator")
@@ -152,3 +164,58 @@ class TestBills:
         data = response.get_json()
         assert data["bill"]["title"] == "Test Bill"
         assert data["bill"]["id"] == bill.id
+
+    def test_list_bills_json_keyset_pagination(self, client, db_session):
+        """Test bills list pages with limit/after cursors"""
+        bills = create_bills(count=5)
+        ids = [bill.id for bill in bills]
+
+        response = client.get("/bills?format=json&limit=2")
+        assert response.status_code == 200
+        data = response.get_json()
+        assert [bill["id"] for bill in data["bills"]] == ids[:2]
+        assert data["pagination"]["limit"] == 2
+        assert data["pagination"]["next_cursor"] == ids[1]
+        assert f"after={ids[1]}" in response.headers["Link"]
+        assert 'rel="next"' in response.headers["Link"]
+
+        response = client.get(f"/bills?format=json&limit=2&after={ids[3]}")
+        data = response.get_json()
+        assert [bill["id"] for bill in data["bills"]] == ids[4:]
+        assert data["pagination"]["next_cursor"] is None
+        assert "Link" not in response.headers
+
+    def test_list_bills_csv_keyset_pagination(self, client, db_session):
+        """Test bills CSV export is only windowed when explicitly paged"""
+        bills = create_bills(count=3)
+        ids = [bill.id for bill in bills]
+
+        response = client.get("/bills?format=csv")
+        assert len(response.get_data(as_text=True).splitlines()) == 4
+        assert "Link" not in response.headers
+
+        response = client.get(f"/bills?format=csv&limit=1&after={ids[0]}")
+        lines = response.get_data(as_text=True).splitlines()
+        assert [int(line.split(",")[0]) for line in lines[1:]] == [ids[1]]
+        assert f"after={ids[1]}" in response.headers["Link"]
+
+    def test_list_bills_html_pagination_links(self, client, db_session):
+        """Test bills list HTML renders paged navigation"""
+        bills = create_bills(count=3)
+
+        response = client.get("/bills?limit=2")
+        html = response.get_data(as_text=True)
+        assert "Next »" in html
+        assert f"after={bills[1].id}" in html
+        assert "« First" not in html
+
+    def test_bills_query_count(self, client, db_session, max_queries):
+        """Test bill pages load relationships with a fixed number of queries"""
+        first_id = create_bills(count=3)[0].id
+
+        with max_queries(2):
+            assert client.get("/bills").status_code == 200
+        with max_queries(3):
+            assert client.get("/bills?format=json").status_code == 200
+        with max_queries(3):
+            assert client.get(f"/bills/{first_id}").status_code == 200
@@ -1,5 +1,7 @@
 from tests.factories import (
+    create_bill,
     create_legislator,
+    create_vote_result,
 )
 
 
@@ -68,3 +70,37 @@ class TestLegislatorsAPI:
         """Test invalid legislator ID format"""
         response = client.get("/legislators/invalid")
         assert response.status_code == 404
+
+    def test_list_legislators_counts(self, client, db_session):
+        """Test legislators list JSON and CSV include aggregated counts"""
+        legislator = create_legislator(name="Test Legislator")
+        create_bill(sponsor=legislator)
+        create_vote_result(legislator=legislator, _vote_type=1)
+
+        response = client.get("/legislators?format=json")
+        data = response.get_json()
+        row = next(row for row in data["legislators"] if row["id"] == legislator.id)
+        assert row["sponsored_bills_count"] == 1
+        assert row["supported_bills_count"] == 1
+        assert row["opposed_bills_count"] == 0
+
+        response = client.get("/legislators?format=csv")
+        lines = response.get_data(as_text=True).splitlines()
+        assert lines[0].endswith(
+            "sponsored_bills_count,supported_bills_count,opposed_bills_count",
+        )
+        row = next(line for line in lines if line.startswith(f"{legislator.id},"))
+        assert row.endswith(",1,1,0")
+
+    def test_legislators_query_count(self, client, db_session, max_queries):
+        """Test legislator pages compute stats without lazy loads"""
+        legislators = [create_legislator() for _ in range(3)]
+        for legislator in legislators:
+            create_vote_result(legislator=legislator)
+        first_id = legislators[0].id
+
+        for url in ["/legislators", "/legislators?format=json"]:
+            with max_queries(2):
+                assert client.get(url).status_code == 200
+        with max_queries(4):
+            assert client.get(f"/legislators/{first_id}").status_code == 200
@@ -1,3 +1,4 @@
+from app.lib.multi_response import MultiResponse
 from tests.factories import (
     create_bill,
     create_legislator,
@@ -53,6 +54,35 @@ class TestVoteResultsAPI:
         assert "vote_id,legislator_id,vote_type" in csv_content
         assert f"{vote.id},{legislator.id},{vote_result.vote_type}" in csv_content
 
+    def test_list_vote_results_csv_streamed_in_chunks(
+        self,
+        client,
+        db_session,
+        monkeypatch,
+    ):
+        """Test vote results CSV export is streamed chunk by chunk"""
+        monkeypatch.setattr(MultiResponse, "CSV_CHUNK_SIZE", 2)
+        legislator = create_legislator(name="Test Legislator")
+        vote = create_vote(bill=create_bill(sponsor=legislator))
+        vote_results = [
+            create_vote_result(legislator=legislator, vote=vote) for _ in range(5)
+        ]
+
+        response = client.get("/vote_results?format=csv")
+        assert response.status_code == 200
+        assert response.is_streamed
+        lines = response.get_data(as_text=True).splitlines()
+        assert lines[0] == "id,vote_id,legislator_id,vote_type,created_at,updated_at"
+        assert [int(line.split(",")[0]) for line in lines[1:]] == [
+            vote_result.id for vote_result in vote_results
+        ]
+
+    def test_list_vote_results_csv_empty(self, client, db_session):
+        """Test vote results CSV export without data"""
+        response = client.get("/vote_results?format=csv")
+        assert response.status_code == 400
+        assert "No data to export" in response.get_data(as_text=True)
+
     def test_get_vote_result_json(self, client, db_session):
         """Test single vote result JSON endpoint"""
         legislator = create_legislator(name="Test Legislator")
@@ -88,3 +118,14 @@ class TestVoteResultsAPI:
         """Test invalid vote result ID format"""
         response = client.get("/vote_results/invalid")
         assert response.status_code == 404
+
+    def test_list_vote_results_query_count(self, client, db_session, max_queries):
+        """Test listing vote results does not lazy load per row"""
+        legislator = create_legislator()
+        vote = create_vote(bill=create_bill(sponsor=legislator))
+        for _ in range(5):
+            create_vote_result(vote=vote)
+
+        for url in ["/vote_results", "/vote_results?format=json"]:
+            with max_queries(1):
+                assert client.get(url).status_code == 200
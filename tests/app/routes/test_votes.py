@@ -77,3 +77,15 @@ class TestVotesAPI:
         """Test invalid vote ID format"""
         response = client.get("/votes/invalid")
         assert response.status_code == 404
+
+    def test_votes_query_count(self, client, db_session, max_queries):
+        """Test vote pages load relationships with a fixed number of queries"""
+        first_id = create_vote().id
+        create_vote()
+        create_vote()
+
+        for url in ["/votes", "/votes?format=json"]:
+            with max_queries(1):
+                assert client.get(url).status_code == 200
+        with max_queries(2):
+            assert client.get(f"/votes/{first_id}").status_code == 200
@@ -0,0 +1,17 @@
+import pytest
+
+
+@pytest.fixture
+def write_csv(tmp_path):
+    """Factory of CSV files in the test's temporary directory.
+
+    Usage:
+        file_path = write_csv("legislators.csv", "id,name\\n1,Alice\\n")
+    """
+
+    def write(name, content):
+        path = tmp_path / name
+        path.write_text(content)
+        return str(path)
+
+    return write
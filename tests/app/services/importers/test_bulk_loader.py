@@ -0,0 +1,124 @@
+import pytest
+from sqlalchemy import text
+
+from app.models.bill import Bill
+from app.models.bill_vote_tally import BillVoteTally
+from app.models.vote_result import VoteResult
+from app.services.importers import BillImporter, VoteResultImporter
+from app.services.importers.bulk_loader import BulkLoader
+from tests.factories import create_bill, create_legislator, create_vote
+
+
+class TestBulkLoad:
+    def test_bulk_insert_and_update(self, db_session, write_csv):
+        """Test bulk mode inserts new rows and updates existing ones"""
+        sponsor = create_legislator(id=1)
+        existing = create_bill(id=10, title="Old title", sponsor=sponsor)
+        created_at = existing.created_at
+        file_path = write_csv(
+            "bills.csv",
+            "id,title,sponsor_id\n10,New title,1\n11,Other bill,1\n12,Orphan,99\n",
+        )
+
+        result = BillImporter(db_session, batch_size=2).import_from_file(
+            file_path,
+            mode="bulk",
+        )
+
+        assert result.imported_count == 3
+        assert result.errors == ["Row 3: Sponsor with ID 99 does not exist"]
+        db_session.expire_all()
+        bills = {bill.id: bill for bill in db_session.query(Bill)}
+        assert sorted(bills) == [10, 11, 12]
+        assert bills[10].title == "New title"
+        assert bills[10].created_at == created_at
+
+    def test_bulk_vote_results_rebuild_tallies(self, db_session, write_csv):
+        """Test vote result tallies are rebuilt after a bulk load"""
+        vote = create_vote()
+        yea, nay = create_legislator(), create_legislator()
+        file_path = write_csv(
+            "vote_results.csv",
+            "id,legislator_id,vote_id,vote_type\n"
+            f"1,{yea.id},{vote.id},1\n2,{nay.id},{vote.id},2\n",
+        )
+
+        result = VoteResultImporter(db_session).import_from_file(
+            file_path,
+            mode="bulk",
+        )
+
+        assert result.imported_count == 2
+        assert db_session.query(VoteResult).count() == 2
+        tally = db_session.query(BillVoteTally).filter_by(vote_id=vote.id).one()
+        assert (tally.yea_count, tally.nay_count) == (1, 1)
+
+    def test_sqlite_pragmas_are_restored(self, db_session, write_csv):
+        """Test load pragmas only apply during the bulk load"""
+        create_legislator(id=1)
+        file_path = write_csv("bills.csv", "id,title,sponsor_id\n1,A,1\n")
+        before = db_session.execute(text("PRAGMA cache_size")).scalar()
+        db_session.commit()
+
+        BillImporter(db_session).import_from_file(file_path, mode="bulk")
+
+        assert db_session.execute(text("PRAGMA cache_size")).scalar() == before
+
+    def test_sqlite_pragmas_wait_for_no_open_transaction(self, db_session):
+        """Test the load leaves pending writes of the caller uncommitted"""
+        from app.models.legislator import Legislator
+
+        db_session.add(Legislator(id=1, name="Pending"))
+        db_session.flush()
+        before = db_session.execute(text("PRAGMA cache_size")).scalar()
+
+        loader = BulkLoader(BillImporter(db_session))
+        loader.begin()
+        tuned = db_session.execute(text("PRAGMA cache_size")).scalar()
+        loader.end()
+        db_session.rollback()
+
+        assert tuned == before
+        assert db_session.query(Legislator).count() == 0
+
+    def test_sqlite_pragmas_are_restored_on_the_loading_connection(
+        self,
+        make_app,
+        tmp_path,
+        write_csv,
+    ):
+        """Test no pooled connection keeps the load pragmas"""
+        from app import db
+
+        make_app(
+            database_url=f"sqlite:///{tmp_path / 'bulk.db'}",
+            sqlite_pragmas={"cache_size": -1000},
+        )
+        create_legislator(id=1)
+        db.session.commit()
+        file_path = write_csv("bills.csv", "id,title,sponsor_id\n1,A,1\n")
+        # Several idle connections, so the load may not get the same one twice
+        idle = [db.engine.connect() for _ in range(3)]
+        for connection in idle:
+            connection.close()
+
+        BillImporter(db.session).import_from_file(file_path, mode="bulk")
+        db.session.remove()
+
+        connections = [db.engine.connect() for _ in range(3)]
+        try:
+            cache_sizes = [
+                connection.exec_driver_sql("PRAGMA cache_size").scalar()
+                for connection in connections
+            ]
+        finally:
+            for connection in connections:
+                connection.close()
+        assert cache_sizes == [-1000, -1000, -1000]  # From the engine settings
+
+    def test_unknown_mode(self, db_session, write_csv):
+        """Test unknown import modes are rejected"""
+        file_path = write_csv("bills.csv", "id,title,sponsor_id\n")
+
+        with pytest.raises(ValueError, match="Unknown import mode"):
+            BillImporter(db_session).import_from_file(file_path, mode="fast")
@@ -0,0 +1,87 @@
+from app.models.import_checkpoint import ImportCheckpoint
+from app.models.legislator import Legislator
+from app.services.importers import LegislatorImporter, ResumePoint
+
+LEGISLATORS = "id,name\n" + "".join(f"{i},Legislator {i}\n" for i in range(1, 7))
+
+
+class FailingLegislatorImporter(LegislatorImporter):
+    """Fails right after writing the batch containing ``fail_on``"""
+
+    fail_on = 5
+
+    def after_batch(self, batch):
+        if any(row["id"] == self.fail_on for row in batch):
+            msg = "connection lost"
+            raise RuntimeError(msg)
+
+
+class TestCheckpoints:
+    def test_failure_keeps_committed_batches(self, db_session, write_csv):
+        """Test a failed import keeps its committed batches and a checkpoint"""
+        file_path = write_csv("legislators.csv", LEGISLATORS)
+
+        result = FailingLegislatorImporter(db_session, batch_size=2).import_from_file(
+            file_path,
+            commit_every=1,
+        )
+
+        assert result.success is False
+        assert result.imported_count == 4
+        assert result.errors == ["Import failed: connection lost"]
+        assert db_session.query(Legislator).count() == 4
+        checkpoint = db_session.query(ImportCheckpoint).one()
+        assert checkpoint.importer == "legislators"
+        assert checkpoint.row_number == 4
+        # Right after the 4th row: header plus 4 rows of 15 bytes
+        assert checkpoint.file_offset == 68
+
+    def test_resume_from_checkpoint(self, db_session, write_csv):
+        """Test a resumed import only reads the rows after the checkpoint"""
+        file_path = write_csv("legislators.csv", LEGISLATORS)
+        FailingLegislatorImporter(db_session, batch_size=2).import_from_file(
+            file_path,
+            commit_every=1,
+        )
+
+        importer = LegislatorImporter(db_session, batch_size=2)
+        assert importer.resume_point(file_path) == ResumePoint(4, 68)
+        result = importer.import_from_file(file_path, commit_every=1, resume=True)
+
+        assert result.success is True
+        assert result.imported_count == 2
+        assert db_session.query(Legislator).count() == 6
+        assert db_session.query(ImportCheckpoint).count() == 0
+
+    def test_resume_keeps_the_error_log(self, db_session, write_csv, tmp_path):
+        """Test a resumed import appends to the errors of the interrupted one"""
+        file_path = write_csv(
+            "legislators.csv",
+            "id,name\n1,A\n2,\n3,C\n4,D\n5,E\n6,\n",
+        )
+        error_log = str(tmp_path / "legislators.errors.log")
+        failing = FailingLegislatorImporter(db_session, batch_size=2)
+        failing.fail_on = 4
+        failing.error_log = error_log
+        failing.import_from_file(file_path, commit_every=1)
+
+        importer = LegislatorImporter(db_session, batch_size=2)
+        importer.error_log = error_log
+        result = importer.import_from_file(file_path, commit_every=1, resume=True)
+
+        assert result.error_count == 1
+        lines = (tmp_path / "legislators.errors.log").read_text().splitlines()
+        assert lines[0].startswith("Row 2:")
+        assert lines[-1].startswith("Row 6:")
+
+    def test_changed_file_is_not_resumed(self, db_session, write_csv):
+        """Test checkpoints of another version of the file are ignored"""
+        file_path = write_csv("legislators.csv", LEGISLATORS)
+        FailingLegislatorImporter(db_session, batch_size=2).import_from_file(
+            file_path,
+            commit_every=1,
+        )
+
+        write_csv("legislators.csv", LEGISLATORS + "7,Legislator 7\n")
+
+        assert LegislatorImporter(db_session).resume_point(file_path) is None
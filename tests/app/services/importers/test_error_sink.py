@@ -0,0 +1,34 @@
+from app.services.importers import LegislatorImporter
+from app.services.importers.error_sink import ErrorSink
+
+
+class TestErrorSink:
+    def test_keeps_a_sample_and_counts_all(self, tmp_path):
+        """Test only the first errors are kept, all are written to the log"""
+        log_path = tmp_path / "errors.log"
+        sink = ErrorSink(max_errors=2, log_path=str(log_path))
+
+        sink.extend(f"Row {number}: bad" for number in range(1, 6))
+        sink.close()
+
+        assert sink.count == 5
+        assert sink.sample == ["Row 1: bad", "Row 2: bad"]
+        assert log_path.read_text().splitlines() == [
+            f"Row {number}: bad" for number in range(1, 6)
+        ]
+
+    def test_importer_result_is_capped(self, db_session, tmp_path):
+        """Test import results keep a sample of the errors and their count"""
+        file_path = tmp_path / "legislators.csv"
+        file_path.write_text("id,name\n1,Alice\n1,Alice\n1,Alice\n2,\n3,Carol\n")
+        importer = LegislatorImporter(db_session)
+        importer.max_errors = 1
+        importer.error_log = str(tmp_path / "legislators.errors.log")
+
+        result = importer.import_from_file(str(file_path))
+
+        assert result.imported_count == 2
+        assert result.error_count == 3
+        assert result.errors == ["Row 2: Duplicate ID 1 found in file"]
+        assert result.error_log == importer.error_log
+        assert len((tmp_path / "legislators.errors.log").read_text().splitlines()) == 3
@@ -0,0 +1,44 @@
+from app.services.importers.id_tracker import IdTracker
+
+
+class SmallIdTracker(IdTracker):
+    BUFFER_SIZE = 4
+
+
+class TestIdTracker:
+    def test_detects_duplicates(self):
+        """Test ids are reported new only the first time they are added"""
+        tracker = IdTracker()
+
+        assert tracker.add(1) is True
+        assert tracker.add(2) is True
+        assert tracker.add(1) is False
+        assert tracker.add(None) is True
+        assert tracker.add(None) is False
+        assert tracker.count == 2
+
+    def test_sorted_runs(self):
+        """Test ids flushed to sorted runs are still found"""
+        tracker = SmallIdTracker()
+        # Distinct ids in scrambled order
+        ids = [(value * 7919) % 1_000_003 for value in range(500)]
+
+        assert all(tracker.add(value) for value in ids)
+        assert not any(tracker.add(value) for value in ids)
+        # Runs are merged, logarithmically many remain
+        assert len(tracker._runs) <= 10  # noqa: SLF001
+        assert tracker.spilled is False
+
+    def test_spills_to_disk_over_memory_limit(self):
+        """Test ids move to a temporary table past the memory budget"""
+        tracker = SmallIdTracker(memory_limit=8 * 10)
+        ids = list(range(100, 0, -1))
+
+        assert all(tracker.add(value) for value in ids)
+        assert tracker.spilled is True
+        assert not any(tracker.add(value) for value in ids)
+        assert tracker.add(1000) is True
+        assert tracker.count == 101
+
+        tracker.close()
+        assert tracker.spilled is False
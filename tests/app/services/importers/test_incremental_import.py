@@ -0,0 +1,98 @@
+from app.models.import_file import ImportFile
+from app.models.legislator import Legislator
+from app.services.importers import ImportPipeline, LegislatorImporter
+from app.services.importers.manifest import file_checksum
+
+LEGISLATORS = "id,name\n1,Alice (D-CA)\n2,Bob (R-TX)\n3,Carol (D-NY)\n"
+
+
+class TestIncrementalImport:
+    def test_first_import_records_checksum(self, db_session, write_csv):
+        """Test a first incremental import inserts rows and records the file"""
+        file_path = write_csv("legislators.csv", LEGISLATORS)
+
+        result = LegislatorImporter(db_session).import_from_file(
+            file_path,
+            mode="incremental",
+        )
+
+        assert (result.inserted_count, result.updated_count) == (3, 0)
+        assert result.imported_count == 3
+        entry = db_session.query(ImportFile).one()
+        assert entry.importer == "legislators"
+        assert entry.checksum == file_checksum(file_path)
+        assert entry.row_count == 3
+
+    def test_unchanged_file_is_skipped(self, db_session, write_csv):
+        """Test a file imported before with the same content is not read again"""
+        file_path = write_csv("legislators.csv", LEGISLATORS)
+        LegislatorImporter(db_session).import_from_file(file_path, mode="incremental")
+
+        result = LegislatorImporter(db_session).import_from_file(
+            file_path,
+            mode="incremental",
+        )
+
+        assert result.skipped is True
+        assert result.success is True
+        assert result.imported_count == 0
+        assert result.unchanged_count == 3
+
+    def test_unchanged_file_with_row_errors_is_recorded(self, db_session, write_csv):
+        """Test a re-import writing nothing but rejecting rows still records the file"""
+        file_path = write_csv("legislators.csv", LEGISLATORS + "x,Invalid id\n")
+        LegislatorImporter(db_session).import_from_file(file_path, mode="upsert")
+
+        result = LegislatorImporter(db_session).import_from_file(
+            file_path,
+            mode="incremental",
+        )
+
+        assert (result.imported_count, result.unchanged_count) == (0, 3)
+        assert result.error_count == 1
+        assert db_session.query(ImportFile).one().checksum == file_checksum(file_path)
+        assert (
+            LegislatorImporter(db_session)
+            .import_from_file(file_path, mode="incremental")
+            .skipped
+        )
+
+    def test_only_changed_rows_are_written(self, db_session, write_csv):
+        """Test unchanged rows keep their updated_at, changed and new rows are written"""
+        file_path = write_csv("legislators.csv", LEGISLATORS)
+        LegislatorImporter(db_session).import_from_file(file_path, mode="incremental")
+        db_session.query(Legislator).update({"updated_at": None})
+        db_session.commit()
+
+        write_csv(
+            "legislators.csv",
+            LEGISLATORS.replace("Bob", "Robert") + "4,Dan (R-FL)\n",
+        )
+        result = LegislatorImporter(db_session).import_from_file(
+            file_path,
+            mode="incremental",
+        )
+
+        assert result.skipped is False
+        assert (result.inserted_count, result.updated_count) == (1, 1)
+        assert result.unchanged_count == 2
+        assert result.imported_count == 2
+        db_session.expire_all()
+        written = {
+            legislator.id
+            for legislator in db_session.query(Legislator)
+            if legislator.updated_at is not None
+        }
+        assert written == {2, 4}
+        assert db_session.query(ImportFile).one().row_count == 4
+
+    def test_pipeline_skips_unchanged_files(self, db_session, write_csv):
+        """Test the pipeline does not parse files imported before"""
+        file_path = write_csv("legislators.csv", LEGISLATORS)
+        LegislatorImporter(db_session).import_from_file(file_path, mode="incremental")
+
+        (result,) = ImportPipeline(mode="incremental").run(
+            [(LegislatorImporter(db_session), file_path)],
+        )
+
+        assert result.skipped is True
@@ -0,0 +1,80 @@
+import pytest
+
+from app.models.bill import Bill
+from app.models.legislator import Legislator
+from app.models.vote import Vote
+from app.services.importers import (
+    BillImporter,
+    ImportPipeline,
+    LegislatorImporter,
+    VoteImporter,
+)
+
+
+@pytest.fixture
+def csv_files(tmp_path):
+    """Write CSV files for legislators, bills and votes"""
+    files = {
+        "legislators": "id,name\n1,Alice (D-CA)\n2,Bob (R-TX)\n3,Carol (D-NY)\n",
+        "bills": "id,title,sponsor_id\n10,Bill A,1\n11,Bill B,2\n12,Bill C,3\n",
+        "votes": "id,bill_id\n100,10\n101,11\n102,99\n",
+    }
+    paths = {}
+    for name, content in files.items():
+        path = tmp_path / f"{name}.csv"
+        path.write_text(content)
+        paths[name] = str(path)
+    return paths
+
+
+class TestImportPipeline:
+    def test_imports_files_in_order(self, db_session, csv_files):
+        """Test later files reference rows written from earlier files"""
+        jobs = [
+            (LegislatorImporter(db_session, batch_size=1), csv_files["legislators"]),
+            (BillImporter(db_session, batch_size=1), csv_files["bills"]),
+            (VoteImporter(db_session, batch_size=1), csv_files["votes"]),
+        ]
+
+        results = list(ImportPipeline(workers=3, queue_size=1).run(jobs))
+
+        assert [result.imported_count for result in results] == [3, 3, 3]
+        assert results[1].errors == []
+        assert results[2].errors == ["Row 3: Bill with ID 99 does not exist"]
+        assert db_session.query(Legislator).count() == 3
+        assert db_session.query(Bill).count() == 3
+        assert db_session.query(Vote).count() == 3
+
+    def test_single_worker(self, db_session, csv_files):
+        """Test a single parser thread still parses every file"""
+        jobs = [
+            (LegislatorImporter(db_session), csv_files["legislators"]),
+            (BillImporter(db_session), csv_files["bills"]),
+        ]
+
+        results = list(ImportPipeline(workers=1, queue_size=1).run(jobs))
+
+        assert [result.imported_count for result in results] == [3, 3]
+
+    def test_file_errors_do_not_stop_the_pipeline(
+        self,
+        db_session,
+        csv_files,
+        tmp_path,
+    ):
+        """Test missing files and bad headers are reported per file"""
+        bad_headers = tmp_path / "bad.csv"
+        bad_headers.write_text("id,title\n1,Bill\n")
+        jobs = [
+            (LegislatorImporter(db_session), str(tmp_path / "missing.csv")),
+            (BillImporter(db_session), str(bad_headers)),
+            (LegislatorImporter(db_session), csv_files["legislators"]),
+        ]
+
+        results = list(ImportPipeline(workers=1).run(jobs))
+
+        assert results[0].success is False
+        assert results[0].errors[0].startswith("File not found")
+        assert results[1].success is False
+        assert results[1].errors == ["Missing required headers: ['sponsor_id']"]
+        assert results[2].imported_count == 3
@@ -0,0 +1,86 @@
+import os
+import tempfile
+
+from sqlalchemy import event
+
+from app import db
+from app.models.legislator import Legislator
+from app.models.vote import Vote
+from app.services.importers.reference import Reference, check_references
+from app.services.importers.vote_result_importer import VoteResultImporter
+from tests.factories import create_bill, create_legislator, create_vote
+
+
+class TestReference:
+    def test_error_message_uses_label(self):
+        """Test reference error messages"""
+        assert (
+            Reference("sponsor_id", Legislator, label="Sponsor").error_message(7)
+            == "Sponsor with ID 7 does not exist"
+        )
+        assert Reference("vote_id", Vote).error_message(3) == (
+            "Vote with ID 3 does not exist"
+        )
+
+    def test_check_references(self, db_session):
+        """Test batch reference validation"""
+        create_legislator(id=1, name="Test Legislator")
+        create_bill(id=1, title="Test Bill", sponsor_id=1)
+        create_vote(id=1, bill_id=1)
+
+        references = [
+            Reference("vote_id", Vote),
+            Reference("legislator_id", Legislator),
+        ]
+        batch = [
+            {"vote_id": 1, "legislator_id": 1},
+            {"vote_id": 999, "legislator_id": 1},
+            {"vote_id": 999, "legislator_id": 998},
+            {"vote_id": None, "legislator_id": 1},
+        ]
+
+        assert check_references(db_session, references, batch) == [
+            [],
+            ["Vote with ID 999 does not exist"],
+            [
+                "Vote with ID 999 does not exist",
+                "Legislator with ID 998 does not exist",
+            ],
+            [],
+        ]
+
+    def test_import_checks_references_once_per_batch(self, db_session):
+        """Test that foreign keys are not looked up row by row"""
+        create_legislator(id=1, name="Test Legislator")
+        create_bill(id=1, title="Test Bill", sponsor_id=1)
+        create_vote(id=1, bill_id=1)
+
+        rows = "\n".join(f"{i},1,1,1" for i in range(1, 51))
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+            f.write(f"id,legislator_id,vote_id,vote_type\n{rows}\n51,999,1,3")
+            temp_file = f.name
+
+        statements = []
+
+        def count_selects(conn, cursor, statement, *args):
+            if statement.lstrip().upper().startswith("SELECT") and (
+                "FROM votes" in statement or "FROM legislators" in statement
+            ):
+                statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", count_selects)
+        try:
+            importer = VoteResultImporter(db_session, batch_size=100)
+            result = importer.import_from_file(temp_file)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", count_selects)
+            os.unlink(temp_file)
+
+        assert result.imported_count == 51
+        assert len(statements) == 1
+        assert result.errors == [
+            (
+                "Row 51: Legislator with ID 999 does not exist; "
+                "Invalid vote_type: 3. Valid values are 1 (Yea) or 2 (Nay)"
+            ),
+        ]
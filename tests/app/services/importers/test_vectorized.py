@@ -0,0 +1,112 @@
+import pytest
+
+from app.models.legislator import Legislator
+from app.models.vote_result import VoteResult
+from app.services.importers import (
+    BillImporter,
+    LegislatorImporter,
+    ResumePoint,
+    VoteResultImporter,
+)
+from tests.factories import create_bill, create_legislator, create_vote
+
+LEGISLATORS = "id,name\n1,Alice\nabc,Bob\n3,\n1,Carol\n 4 ,  Dave  \n"
+
+
+def import_with(engine, importer_class, session, file_path, **kwargs):
+    importer = importer_class(session, batch_size=2)
+    importer.engine = engine
+    return importer.import_from_file(file_path, **kwargs)
+
+
+class TestVectorizedEngine:
+    def test_legislators_match_python_engine(self, db_session, write_csv):
+        """Test both engines report the same rows and errors"""
+        file_path = write_csv("legislators.csv", LEGISLATORS)
+
+        expected = import_with("python", LegislatorImporter, db_session, file_path)
+        db_session.query(Legislator).delete()
+        result = import_with("pandas", LegislatorImporter, db_session, file_path)
+
+        assert result.imported_count == expected.imported_count == 2
+        assert result.errors == expected.errors
+        assert result.errors == [
+            "Row 2: invalid literal for int() with base 10: 'abc'",
+            "Row 3: Name cannot be empty",
+            "Row 4: Duplicate ID 1 found in file",
+        ]
+        names = {legislator.id: legislator.name for legislator in Legislator.query}
+        assert names == {1: "Alice", 4: "Dave"}
+
+    def test_bills_with_optional_sponsor(self, db_session, write_csv):
+        """Test blank foreign keys are NULL and unknown ones are reported"""
+        legislator = create_legislator()
+        file_path = write_csv(
+            "bills.csv",
+            f"id,title,sponsor_id\n1,Bill 1,{legislator.id}\n2,Bill 2,\n"
+            "3,Bill 3,999999\n4,Bill 4,x\n",
+        )
+
+        expected = import_with("python", BillImporter, db_session, file_path)
+        result = import_with("pandas", BillImporter, db_session, file_path)
+
+        assert result.imported_count == expected.imported_count == 3
+        assert result.errors == expected.errors
+        assert result.errors[-1] == (
+            "Row 4: invalid literal for int() with base 10: 'x'"
+        )
+
+    def test_vote_results_match_python_engine(self, db_session, write_csv):
+        """Test invalid vote types are stored as NULL and reported the same way"""
+        create_bill()
+        vote = create_vote()
+        legislators = [create_legislator() for _ in range(3)]
+        rows = [
+            f"1,{legislators[0].id},{vote.id},1",
+            f"2,{legislators[1].id},{vote.id},7",
+            f"3,{legislators[2].id},{vote.id},",
+            f"4,{legislators[2].id},999999,2",
+        ]
+        file_path = write_csv(
+            "vote_results.csv",
+            "id,legislator_id,vote_id,vote_type\n" + "\n".join(rows) + "\n",
+        )
+
+        expected = import_with("python", VoteResultImporter, db_session, file_path)
+        python_rows = {
+            result.id: (result.legislator_id, result.vote_id, result.vote_type)
+            for result in VoteResult.query
+        }
+        db_session.query(VoteResult).delete()
+        result = import_with("pandas", VoteResultImporter, db_session, file_path)
+
+        assert result.imported_count == expected.imported_count
+        assert result.errors == expected.errors
+        assert "Row 2: Invalid vote_type: 7" in result.errors[0]
+        pandas_rows = {
+            result.id: (result.legislator_id, result.vote_id, result.vote_type)
+            for result in VoteResult.query
+        }
+        assert pandas_rows == python_rows
+        assert pandas_rows[2][2] is None
+
+    @pytest.mark.parametrize("engine", ["python", "pandas"])
+    def test_resume_by_row_number(self, db_session, write_csv, engine):
+        """Test checkpoints without a byte offset resume by skipping rows"""
+        content = "id,name\n" + "".join(f"{i},Name {i}\n" for i in range(1, 6))
+        file_path = write_csv("legislators.csv", content)
+        importer = LegislatorImporter(db_session)
+        importer.engine = engine
+
+        batches = list(importer.parse_file(file_path, ResumePoint(3, 0)))
+
+        assert [row["id"] for batch in batches for row in batch.rows] == [4, 5]
+        assert batches[-1].row_number == 5
+
+    def test_empty_file(self, db_session, write_csv):
+        """Test a file without rows still yields a final batch"""
+        file_path = write_csv("legislators.csv", "id,name\n")
+        importer = LegislatorImporter(db_session)
+        importer.engine = "pandas"
+
+        assert list(importer.parse_file(file_path)) == [([], [], [], 0, 0)]
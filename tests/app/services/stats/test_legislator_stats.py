@@ -0,0 +1,48 @@
+from app.services.stats import LegislatorStats
+from tests.factories import (
+    create_bill,
+    create_legislator,
+    create_vote,
+    create_vote_result,
+)
+
+
+class TestLegislatorStats:
+    def test_for_legislators(self, db_session):
+        """Test counts are aggregated per legislator"""
+        sponsor = create_legislator()
+        voter = create_legislator()
+        idle = create_legislator()
+        bill = create_bill(sponsor=sponsor)
+        create_bill(sponsor=sponsor)
+        vote = create_vote(bill=bill)
+        create_vote_result(legislator=voter, vote=vote, _vote_type=1)
+        create_vote_result(legislator=voter, vote=vote, _vote_type=1)
+        create_vote_result(legislator=voter, vote=vote, _vote_type=2)
+        create_vote_result(legislator=sponsor, vote=vote, _vote_type=2)
+
+        stats = LegislatorStats.for_legislators([sponsor.id, voter.id, idle.id])
+
+        assert stats[sponsor.id].sponsored_bills_count == 2
+        assert stats[sponsor.id].supported_bills_count == 0
+        assert stats[sponsor.id].opposed_bills_count == 1
+        assert stats[voter.id].sponsored_bills_count == 0
+        assert stats[voter.id].supported_bills_count == 2
+        assert stats[voter.id].opposed_bills_count == 1
+        assert stats[idle.id].sponsored_bills_count == 0
+        assert stats[idle.id].supported_bills_count == 0
+
+    def test_for_legislators_empty(self, db_session):
+        """Test no query is needed without legislators"""
+        assert LegislatorStats.for_legislators([]) == {}
+
+    def test_attach(self, db_session):
+        """Test attached stats are used by the model properties"""
+        legislator = create_legislator()
+        create_vote_result(legislator=legislator, _vote_type=1)
+
+        LegislatorStats.attach([legislator])
+
+        assert legislator.precomputed_stats.supported_bills_count == 1
+        assert legislator.supported_bills_count == 1
+        assert legislator.opposed_bills_count == 0
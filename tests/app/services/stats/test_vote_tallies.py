@@ -0,0 +1,83 @@
+import os
+import tempfile
+
+from app.models.bill_vote_tally import BillVoteTally
+from app.services.importers.vote_result_importer import VoteResultImporter
+from app.services.stats import VoteTallies
+from tests.factories import (
+    create_bill,
+    create_legislator,
+    create_vote,
+    create_vote_result,
+)
+
+
+def import_vote_results(db_session, content):
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".csv", delete=False) as f:
+        f.write(content)
+        temp_file = f.name
+
+    try:
+        return VoteResultImporter(db_session).import_from_file(temp_file)
+    finally:
+        os.unlink(temp_file)
+
+
+class TestVoteTallies:
+    def test_refresh(self, db_session):
+        """Test tallies are computed from vote results"""
+        vote = create_vote()
+        create_vote_result(vote=vote, _vote_type=1)
+        create_vote_result(vote=vote, _vote_type=1)
+        create_vote_result(vote=vote, _vote_type=2)
+
+        VoteTallies(db_session).refresh([vote.id])
+
+        tally = db_session.query(BillVoteTally).filter_by(vote_id=vote.id).one()
+        assert tally.bill_id == vote.bill_id
+        assert (tally.yea_count, tally.nay_count, tally.total_count) == (2, 1, 3)
+        assert tally.is_supported is True
+        assert vote.bill.is_supported is True
+        assert vote.bill.is_opposed is False
+        assert vote.bill.vote_results_count == 3
+        assert vote.vote_results_count == 3
+
+    def test_inconsistent_vote_ids_and_rebuild(self, db_session):
+        """Test the consistency check detects and fixes stale tallies"""
+        vote = create_vote()
+        create_vote_result(vote=vote, _vote_type=1)
+        tallies = VoteTallies(db_session)
+
+        assert tallies.inconsistent_vote_ids() == [vote.id]
+
+        tallies.rebuild()
+        assert tallies.inconsistent_vote_ids() == []
+
+        create_vote_result(vote=vote, _vote_type=2)
+        assert tallies.inconsistent_vote_ids() == [vote.id]
+
+    def test_importer_maintains_tallies(self, db_session):
+        """Test vote result imports refresh the tallies of touched votes"""
+        create_legislator(id=1, name="Test Legislator")
+        create_bill(id=1, title="Test Bill", sponsor_id=1)
+        create_vote(id=1, bill_id=1)
+        create_vote(id=2, bill_id=1)
+
+        import_vote_results(
+            db_session,
+            "id,legislator_id,vote_id,vote_type\n1,1,1,1\n2,1,1,2\n3,1,2,2",
+        )
+        tallies = {
+            tally.vote_id: (tally.yea_count, tally.nay_count, tally.total_count)
+            for tally in db_session.query(BillVoteTally).all()
+        }
+        assert tallies == {1: (1, 1, 2), 2: (0, 1, 1)}
+
+        # Moving a result to another vote updates both tallies
+        import_vote_results(db_session, "id,legislator_id,vote_id,vote_type\n1,1,2,1")
+        tallies = {
+            tally.vote_id: (tally.yea_count, tally.nay_count, tally.total_count)
+            for tally in db_session.query(BillVoteTally).all()
+        }
+        assert tallies == {1: (0, 1, 1), 2: (1, 1, 2)}
+        assert VoteTallies(db_session).inconsistent_vote_ids() == []
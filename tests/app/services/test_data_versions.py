@@ -0,0 +1,15 @@
+from app.services.data_versions import DataVersions
+
+
+class TestDataVersions:
+    def test_bump_increases_the_version(self, db_session):
+        """Test versions start from the clock and only ever increase"""
+        versions = DataVersions(db_session)
+        assert versions.current() == 0
+
+        versions.bump()
+        first = versions.current()
+        versions.bump()
+
+        assert first > 0
+        assert versions.current() == first + 1
@@ -5,8 +5,10 @@ Pytest configuration for the Quorum app tests
 import importlib
 import os
 import pkgutil
+from contextlib import contextmanager
 
 import pytest
+from sqlalchemy import event
 
 # Set test environment BEFORE any other imports
 os.environ["ENVIRONMENT"] = "test"
@@ -51,7 +53,7 @@ def app():
     )
 
     with app.app_context():
-        db.create_all()
+        db.create_all(bind_key=None)
         yield app
         # Properly close all connections
         db.session.remove()
@@ -88,3 +90,70 @@ def db_session(app):
             # Properly close the session and remove it
             session.close()
             db.session.remove()
+
+
+@pytest.fixture
+def max_queries(app):
+    """Context manager asserting the number of SQL statements run in its block.
+
+    Usage:
+        with max_queries(2):
+            client.get("/bills")
+    """
+    from app import db
+
+    @contextmanager
+    def assert_max_queries(limit):
+        statements = []
+        # Start from an empty identity map, like a fresh request would
+        db.session.expunge_all()
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
+
+        assert len(statements) <= limit, (
+            f"Expected at most {limit} queries, got {len(statements)}:\n"
+            + "\n".join(statements)
+        )
+
+    return assert_max_queries
+
+
+@pytest.fixture
+def make_app(monkeypatch):
+    """Factory of apps created with some settings overridden.
+
+    Usage:
+        app = make_app(response_cache="memory")
+        client = app.test_client()
+    """
+    from app import create_app, db
+    from settings import settings
+
+    contexts = []
+
+    def create(**overrides):
+        for name, value in overrides.items():
+            monkeypatch.setattr(settings, name, value)
+        app = create_app()
+        app.config["TESTING"] = True
+
+        context = app.app_context()
+        context.push()
+        contexts.append(context)
+        db.create_all(bind_key=None)
+        setup_factory_sessions(db.session())
+        return app
+
+    yield create
+
+    for context in reversed(contexts):
+        db.session.remove()
+        db.engine.dispose()
+        context.pop()